@@ -4,7 +4,8 @@ from datetime import datetime, timezone
 
 from app.core.config import Settings
 import app.core.memory_data as memory
-from app.schemas.session import Session
+from app.core.memory_data import SessionState
+from app.core.profiling import begin_span, end_span
 
 _settings: Optional[Settings] = None
 
@@ -15,7 +16,9 @@ def get_settings() -> Settings:
     return _settings
 
 
+# The auth Server-Timing entry covers the whole chain, from here to the last check that ran
 def extract_bearer_token(authorization: Optional[str] = Header(None, alias="Authorization")) -> str:
+    begin_span("auth")
     if not authorization:
         raise HTTPException(
             status_code=401,
@@ -52,33 +55,65 @@ def validate_secret_token(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+    end_span("auth")
+    return token
+
+
+# Operator endpoints (profiling) take a separate ADMIN_TOKEN, they are off while it is unset
+def validate_admin_token(
+    token: str = Depends(extract_bearer_token),
+    settings: Settings = Depends(get_settings)
+) -> str:
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them."
+        )
+
+    if token != settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
     return token
 
 
 def validate_active_session(
-    token: str = Depends(validate_secret_token)
-) -> Session:
-    if memory.current_session is None:
+    token: str = Depends(validate_secret_token),
+    session_id: Optional[str] = Header(None, alias="X-Session-ID")
+) -> SessionState:
+    if not session_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing X-Session-ID header"
+        )
+
+    state = memory.sessions.get(session_id)
+    if state is None:
         raise HTTPException(
             status_code=404,
             detail="No active session. Please establish a connection first."
         )
 
-    if not memory.current_session.isActive:
+    if not state.session.isActive:
         raise HTTPException(
             status_code=403,
             detail="Session is inactive. Please establish a new connection."
         )
 
-    if memory.current_session.token != token:
+    if state.session.token != token:
         raise HTTPException(
             status_code=401,
             detail="Token does not match the active session"
         )
 
-    memory.current_session.last_activity = datetime.now(timezone.utc)
+    state.session.last_activity = datetime.now(timezone.utc)
 
-    return memory.current_session
+    end_span("auth")
+    return state
 
 RequireToken = Depends(validate_secret_token)
 RequireSession = Depends(validate_active_session)
+RequireAdmin = Depends(validate_admin_token)
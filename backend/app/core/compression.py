@@ -0,0 +1,144 @@
+from typing import List, Tuple
+import json
+import zlib
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Request Content-Encodings the backend can decode, in order of preference
+SUPPORTED_ENCODINGS: List[str] = (["zstd"] if zstandard is not None else []) + ["gzip", "deflate"]
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class InvalidBody(Exception):
+    pass
+
+
+def _inflate(data: bytes, wbits: int, max_bytes: int) -> bytes:
+    decompressor = zlib.decompressobj(wbits)
+    try:
+        # max_length bounds the output, so a small bomb can't expand past the cap in memory
+        body = decompressor.decompress(data, max_bytes + 1)
+    except zlib.error as e:
+        raise InvalidBody(str(e))
+    if len(body) > max_bytes:
+        raise BodyTooLarge()
+    if not decompressor.eof:
+        raise InvalidBody("Truncated compressed body")
+    return body
+
+
+def _unzstd(data: bytes, max_bytes: int) -> bytes:
+    chunks = []
+    size = 0
+    try:
+        # Single frame bodies only. expected is -1 when the frame header doesn't carry
+        # the size (streaming compressors)
+        expected = zstandard.frame_content_size(data)
+        if expected > max_bytes:
+            raise BodyTooLarge()
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while True:
+                chunk = reader.read(min(65536, max_bytes + 1 - size))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    raise BodyTooLarge()
+    except zstandard.ZstdError as e:
+        raise InvalidBody(str(e))
+    if expected >= 0 and size != expected:
+        raise InvalidBody("Truncated compressed body")
+    return b"".join(chunks)
+
+
+def decompress_body(encoding: str, data: bytes, max_bytes: int) -> bytes:
+    if encoding == "gzip":
+        return _inflate(data, 16 + zlib.MAX_WBITS, max_bytes)
+    if encoding == "deflate":
+        return _inflate(data, zlib.MAX_WBITS, max_bytes)
+    if encoding == "zstd" and zstandard is not None:
+        return _unzstd(data, max_bytes)
+    raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+async def _error(send: Send, status: int, detail: str):
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# Transparently decodes compressed request bodies (Content-Encoding: gzip, deflate, zstd).
+# Both the compressed and the decompressed size are capped at max_body_bytes, anything
+# larger is rejected with 413 before it reaches a route.
+class RequestDecompressionMiddleware:
+    def __init__(self, app: ASGIApp, max_body_bytes: int = 8 * 1024 * 1024):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if not encoding or encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        if encoding not in SUPPORTED_ENCODINGS:
+            await _error(send, 415, f"Unsupported Content-Encoding: {encoding}. Supported: {', '.join(SUPPORTED_ENCODINGS)}")
+            return
+
+        compressed = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            compressed += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if len(compressed) > self.max_body_bytes:
+                await _error(send, 413, "Request body too large")
+                return
+
+        try:
+            body = decompress_body(encoding, bytes(compressed), self.max_body_bytes)
+        except BodyTooLarge:
+            await _error(send, 413, "Decompressed request body too large")
+            return
+        except InvalidBody as e:
+            await _error(send, 400, f"Invalid {encoding} body: {str(e)}")
+            return
+
+        headers: List[Tuple[bytes, bytes]] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = {**scope, "headers": headers}
+
+        sent = False
+
+        async def receive_decompressed() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_decompressed, send)
@@ -1,16 +1,60 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     
-    OPENAI_API_KEY: str
+    # Only needed once commentary or speech is requested, the app starts without it
+    OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4"
+    OPENAI_BASE_URL: Optional[str] = None
     
-    DISCORD_BOT_TOKEN: str
-    DISCORD_CHANNEL_ID: str
+    DISCORD_BOT_TOKEN: Optional[str] = None
+    DISCORD_CHANNEL_ID: Optional[str] = None
     
     SECRET_TOKEN: str
+    # Bearer token for the operator endpoints under /api/admin, disabled when unset
+    ADMIN_TOKEN: Optional[str] = None
+
+    MAX_SESSIONS: int = 1000
+    SESSION_IDLE_TIMEOUT: int = 900
+
+    COMMENTARY_WORKERS: int = 4
+    COMMENTARY_QUEUE_SIZE: int = 4
+    COMMENTARY_COALESCE_WINDOW: float = 3.0
+    BROADCAST_QUEUE_SIZE: int = 16
+
+    FORMAT_STRICT: bool = False
+    # Worker processes for formatting and change detection, sessions are sharded across them.
+    # 0 runs both inline on the event loop
+    INGEST_PROCESS_WORKERS: int = 0
+    # Most snapshots accepted by one /api/ingest/bulk request
+    BULK_INGEST_MAX_SNAPSHOTS: int = 120
+
+    # Cap on request bodies, applied to both the compressed and the decompressed size
+    REQUEST_MAX_BODY_BYTES: int = 8 * 1024 * 1024
+    RESPONSE_GZIP_MIN_SIZE: int = 1024
+
+    # Serve /metrics without the bearer token, for scrapers on a private network
+    METRICS_PUBLIC: bool = False
+    # Server-Timing header on every response, otherwise only for requests sending X-Server-Timing: 1
+    SERVER_TIMING_ENABLED: bool = False
+    PROFILER_MAX_INGESTS: int = 1000
+
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL: int = 3600
+    RESPONSE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024
+    RESPONSE_CACHE_PATH: Optional[str] = None
+
+    DATABASE_PATH: Optional[str] = "league_live_data.db"
+    DATABASE_BATCH_SIZE: int = 1000
+
+    TTS_MODEL: str = "tts-1"
+    TTS_CACHE_MAX_MEMORY_BYTES: int = 32 * 1024 * 1024
+    TTS_CACHE_DIR: Optional[str] = None
+    TTS_CACHE_MAX_DISK_BYTES: int = 512 * 1024 * 1024
     
     class Config:
         env_file = ".env"
\ No newline at end of file
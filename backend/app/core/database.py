@@ -0,0 +1,231 @@
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
+import asyncio
+import json
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    champion TEXT,
+    game_status TEXT,
+    game_time REAL,
+    reason TEXT,
+    saved_at TEXT NOT NULL,
+    game_data TEXT,
+    timeline TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    game_time REAL,
+    change_type TEXT NOT NULL,
+    player_name TEXT,
+    old_value TEXT,
+    new_value TEXT,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, game_time);
+CREATE INDEX IF NOT EXISTS games_session ON games (session_id);
+"""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+# SQLite persistence for finished games and detected events.
+# Callers only enqueue rows; a dedicated writer thread drains the queue and commits
+# them in batched transactions (WAL mode), so the event loop never waits on disk.
+class GameDatabase:
+    def __init__(self, batch_size: int = 1000, flush_interval: float = 0.5, max_queue: int = 100000):
+        self.path: Optional[str] = None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        # Flushes requested while the queue was full, set once the writer has drained it
+        self._overflow_flushes: List[threading.Event] = []
+        self._overflow_lock = threading.Lock()
+
+        self.rows_written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    def start(self, path: str):
+        if self._thread is not None:
+            return
+        self.path = path
+        # Open once up front so schema errors surface at startup
+        self._connect().close()
+        self._thread = threading.Thread(target=self._run, name="game-database-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        if self._thread is None:
+            return
+        self._queue.put(("stop", None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    def record_events(self, session_id: str, game_time: float, changes: List[Any]):
+        if not self.enabled or not changes:
+            return
+        self._put(("events", (session_id, time.time(), game_time, changes)))
+
+    def save_game(self, session_id: str, user: str, game_data: Optional[Any], timeline: Optional[Dict[str, Any]], reason: str):
+        if not self.enabled:
+            return
+        self._put(("game", (session_id, user, game_data, timeline, reason)))
+
+    def request_flush(self) -> threading.Event:
+        done = threading.Event()
+        if not self.enabled:
+            done.set()
+            return done
+        # Never blocks, it is called on the event loop. Flush markers must not be dropped,
+        # with a full queue the writer sets it once everything queued before is written
+        try:
+            self._queue.put_nowait(("flush", done))
+        except queue.Full:
+            with self._overflow_lock:
+                self._overflow_flushes.append(done)
+        return done
+
+    async def flush(self, timeout: float = 5.0) -> bool:
+        done = await asyncio.to_thread(self.request_flush)
+        return await asyncio.to_thread(done.wait, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "queue_depth": self._queue.qsize(),
+            "rows_written": self.rows_written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+    def _put(self, item: Tuple[str, Any]):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        connection.commit()
+        return connection
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    self._release_overflow_flushes()
+                    continue
+
+                batch = [first]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = self._write_batch(connection, batch)
+                if self._queue.empty():
+                    self._release_overflow_flushes()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _release_overflow_flushes(self):
+        with self._overflow_lock:
+            flushes, self._overflow_flushes = self._overflow_flushes, []
+        for done in flushes:
+            done.set()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Tuple[str, Any]]) -> bool:
+        event_rows = []
+        game_rows = []
+        flushes = []
+        stop = False
+
+        for kind, item in batch:
+            if kind == "events":
+                session_id, recorded_at, game_time, changes = item
+                for change in changes:
+                    event_rows.append((
+                        session_id,
+                        recorded_at,
+                        game_time,
+                        change.change_type.value,
+                        change.player_name,
+                        _encode(change.old_value),
+                        _encode(change.new_value),
+                        _encode(change.context)
+                    ))
+            elif kind == "game":
+                session_id, user, game_data, timeline, reason = item
+                game_rows.append((
+                    session_id,
+                    user,
+                    game_data.main_player.champion if game_data else None,
+                    game_data.game_status if game_data else None,
+                    game_data.game_time if game_data else None,
+                    reason,
+                    datetime.now(timezone.utc).isoformat(),
+                    game_data.model_dump_json() if game_data else None,
+                    _encode(timeline) if timeline else None
+                ))
+            elif kind == "flush":
+                flushes.append(item)
+            elif kind == "stop":
+                stop = True
+
+        try:
+            with connection:
+                if event_rows:
+                    connection.executemany(
+                        "INSERT INTO events (session_id, recorded_at, game_time, change_type, player_name, old_value, new_value, context) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        event_rows
+                    )
+                if game_rows:
+                    connection.executemany(
+                        "INSERT INTO games (session_id, user, champion, game_status, game_time, reason, saved_at, game_data, timeline) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        game_rows
+                    )
+            self.rows_written += len(event_rows) + len(game_rows)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Error writing game data batch: {e}")
+
+        for done in flushes:
+            done.set()
+
+        return stop
+
+
+game_database = GameDatabase()
@@ -1,7 +1,96 @@
-from typing import Optional
+from typing import Optional, Dict, List, Any
+from dataclasses import dataclass, field
+from datetime import datetime, timezone, timedelta
+import secrets
+
 from app.schemas.session import Session
 from app.schemas.game_data import GameData
+from app.services.change_detection_service import ChangeDetector
+from app.services.timeline_service import GameTimeline
+from app.services.formatting_service import FormatCache
+
+
+# Everything the backend keeps for one connected client
+@dataclass
+class SessionState:
+    session: Session
+    game_data: Optional[GameData] = None
+    change_detector: ChangeDetector = field(default_factory=ChangeDetector)
+    # Last raw allgamedata document and its sequence number, the base for delta ingests
+    raw_data: Optional[Dict[str, Any]] = None
+    raw_seq: Optional[int] = None
+    timeline: GameTimeline = field(default_factory=GameTimeline)
+    format_cache: FormatCache = field(default_factory=FormatCache)
+    # Set once the finished game has been handed to the database
+    game_saved: bool = False
+
+    def reset(self):
+        self.raw_data = None
+        self.raw_seq = None
+        self.start_new_game()
+
+    # Drops everything about the last game, the delta base stays
+    def start_new_game(self):
+        self.game_data = None
+        self.game_saved = False
+        self.change_detector.reset()
+        self.timeline.clear()
+        self.format_cache.clear()
+
+
+# In-memory registry of active sessions keyed by session id
+class SessionStore:
+    def __init__(self):
+        self._sessions: Dict[str, SessionState] = {}
+
+    def create(self, user: str, token: str) -> SessionState:
+        now = datetime.now(timezone.utc)
+        session_id = secrets.token_urlsafe(16)
+        while session_id in self._sessions:
+            session_id = secrets.token_urlsafe(16)
+
+        state = SessionState(
+            session=Session(
+                session_id=session_id,
+                user=user,
+                token=token,
+                isActive=True,
+                created_at=now,
+                last_activity=now
+            )
+        )
+        self._sessions[session_id] = state
+        return state
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        return self._sessions.get(session_id)
+
+    def remove(self, session_id: str) -> Optional[SessionState]:
+        state = self._sessions.pop(session_id, None)
+        if state is not None:
+            state.session.isActive = False
+            state.reset()
+        return state
+
+    def find_idle(self, max_idle_seconds: float) -> List[SessionState]:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=max_idle_seconds)
+        return [
+            state for state in self._sessions.values()
+            if (state.session.last_activity or state.session.created_at) < cutoff
+        ]
+
+    def prune_idle(self, max_idle_seconds: float) -> List[str]:
+        expired = [state.session.session_id for state in self.find_idle(max_idle_seconds)]
+        for session_id in expired:
+            self.remove(session_id)
+        return expired
+
+    def active_count(self) -> int:
+        return len(self._sessions)
+
+    def clear(self):
+        for session_id in list(self._sessions):
+            self.remove(session_id)
+
 
-# In-memory storage for single session and game data
-current_session: Optional[Session] = None
-game_data: Optional[GameData] = None
+sessions = SessionStore()
@@ -0,0 +1,247 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from contextvars import ContextVar
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import RequestTiming, profiler, record_timing, use_timing, wants_timing
+
+
+# Seconds, from sub-millisecond ingest stages up to slow LLM calls
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+INGEST_ENDPOINTS = frozenset({"/api/ingest", "/api/ingest/raw", "/api/ingest/delta", "/api/ingest/bulk"})
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# Label values are passed positionally in the order the metric declares its label names,
+# every observation is a dict lookup and an add
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values.items())
+        ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last one is +Inf), then the sum
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self.series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+
+# Read from its source when /metrics is scraped, nothing is recorded on the request path.
+# The callback returns a number, or a dict of label values -> number
+class CallbackMetric:
+    def __init__(self, name: str, help: str, callback: Callable[[], Any], labels: Sequence[str] = (), kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.labels = tuple(labels)
+        self.kind = kind
+
+    def samples(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Error reading metric {self.name}: {e}")
+            return []
+        if not isinstance(value, dict):
+            return [f"{self.name} {_format_value(value)}"]
+        return [
+            f"{self.name}{_format_labels(self.labels, labels if isinstance(labels, tuple) else (labels,))} {_format_value(v)}"
+            for labels, v in sorted(value.items())
+        ]
+
+
+# When the current request entered the outermost middleware
+_request_started: ContextVar[Optional[float]] = ContextVar("request_started", default=None)
+
+
+class _Stage:
+    __slots__ = ("histogram", "name", "start")
+
+    def __init__(self, histogram: Histogram, name: str):
+        self.histogram = histogram
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.histogram.observe(elapsed, self.name)
+        record_timing(self.name, elapsed)
+
+
+class Metrics:
+    def __init__(self):
+        self.families: List[Any] = []
+
+        self.ingest_requests = self.register(Counter(
+            "ingest_requests_total", "Ingest requests by endpoint and status code", ("endpoint", "status")
+        ))
+        self.ingest_seconds = self.register(Histogram(
+            "ingest_request_seconds", "Ingest request latency from the first middleware to the last body byte", ("endpoint",)
+        ))
+        self.stage_seconds = self.register(Histogram(
+            "ingest_stage_seconds",
+            "Time per ingest stage: parse (body read, JSON decode, validation, auth), decode (raw bodies), "
+            "patch (delta), format, detect, pool (format + detect in a worker process), record",
+            ("stage",)
+        ))
+        self.change_events = self.register(Counter(
+            "change_events_total", "Detected change events by type", ("change_type",)
+        ))
+        self.llm_requests = self.register(Counter(
+            "llm_requests_total", "Agent prompts by outcome (ok, error, cache_hit)", ("outcome",)
+        ))
+        self.llm_seconds = self.register(Histogram(
+            "llm_request_seconds", "Agent run latency, cache hits excluded"
+        ))
+        self.llm_tokens = self.register(Counter(
+            "llm_tokens_total", "Tokens used by agent runs", ("kind",)
+        ))
+        self.tts_requests = self.register(Counter(
+            "tts_requests_total", "Speech synthesis calls by mode (buffered, stream) and outcome (ok, error, cache_hit)", ("mode", "outcome")
+        ))
+        self.tts_seconds = self.register(Histogram(
+            "tts_request_seconds", "Speech synthesis latency until the whole audio was received, cache hits excluded", ("mode",)
+        ))
+
+    def register(self, family):
+        self.families.append(family)
+        return family
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self.stage_seconds, name)
+
+    # Time since the request entered the app, for stages that run before the handler
+    def since_request(self, stage: str):
+        started = _request_started.get()
+        if started is not None:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds.observe(elapsed, stage)
+            record_timing(stage, elapsed)
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families:
+            samples = family.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+# Times ingest requests end to end, including decompression and body parsing.
+# Added outermost so its start time is the earliest point the app sees a request.
+# Requests that opt in (server_timing, or an X-Server-Timing: 1 header) get a Server-Timing
+# response header with the stages they ran; armed ingests are sampled by the profiler.
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ingest = scope["method"] == "POST" and scope["path"] in INGEST_ENDPOINTS
+        timed = self.server_timing or wants_timing(scope)
+        if not ingest and not timed:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        started_token = _request_started.set(start)
+        timing = RequestTiming(start) if timed else None
+        run = profiler.enter() if ingest else 0
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timing is not None:
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", timing.header_value().encode())]
+            await send(message)
+
+        try:
+            with use_timing(timing):
+                await self.app(scope, receive, send_with_status)
+        finally:
+            _request_started.reset(started_token)
+            if run:
+                profiler.exit(run)
+            if ingest:
+                endpoint = scope["path"]
+                metrics.ingest_seconds.observe(time.perf_counter() - start, endpoint)
+                metrics.ingest_requests.inc(endpoint, str(status))
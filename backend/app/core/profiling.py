@@ -0,0 +1,228 @@
+from typing import Any, Dict, List, Optional, Tuple
+from collections import Counter as CounterDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import sys
+import threading
+import time
+
+
+# Named durations recorded while handling one request, sent back as a Server-Timing header.
+# Only exists for requests that opted in, everything else sees None and records nothing
+class RequestTiming:
+    __slots__ = ("start", "entries", "spans")
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = start if start is not None else time.perf_counter()
+        self.entries: List[Tuple[str, float]] = []
+        self.spans: Dict[str, List[Optional[float]]] = {}
+
+    def add(self, name: str, seconds: float):
+        self.entries.append((name, seconds))
+
+    def totals(self) -> Dict[str, float]:
+        # Repeated stages (bulk ingests) are summed, in the order they first ran
+        totals: Dict[str, float] = {}
+        for name, (start, end) in self.spans.items():
+            if end is not None:
+                totals[name] = end - start
+        for name, seconds in self.entries:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def header_value(self) -> str:
+        parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.totals().items()]
+        parts.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(parts)
+
+
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    return _current_timing.get()
+
+
+def record_timing(name: str, seconds: float):
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+class _Span:
+    __slots__ = ("timing", "name", "start")
+
+    def __init__(self, timing: RequestTiming, name: str):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timing.add(self.name, time.perf_counter() - self.start)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+# Times a block into the current request's Server-Timing only, no metrics.
+# Without a timing context it is a shared no-op
+def timed(name: str):
+    timing = _current_timing.get()
+    if timing is None:
+        return _NO_SPAN
+    return _Span(timing, name)
+
+
+# For spans across several functions, e.g. a dependency chain FastAPI resolves in separate
+# threadpool calls. The last end_span call wins
+def begin_span(name: str):
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.spans[name] = [time.perf_counter(), None]
+
+
+def end_span(name: str):
+    timing = _current_timing.get()
+    if timing is not None:
+        span = timing.spans.get(name)
+        if span is not None:
+            span[1] = time.perf_counter()
+
+
+# Makes timing current for code running outside the request, e.g. the commentary worker
+@contextmanager
+def use_timing(timing: Optional[RequestTiming]):
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def wants_timing(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-server-timing":
+            return value.strip() not in (b"", b"0", b"false")
+    return False
+
+
+def _fold(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+# Samples the event loop thread's stack while armed ingests are in flight, for the next N
+# ingests only. Stacks are kept folded ("module:function;module:function count"), the
+# input format of flamegraph.pl, speedscope and inferno.
+# Sync dependencies run on the threadpool and are not sampled, their time shows up as the
+# loop waiting.
+class SamplingProfiler:
+    def __init__(self):
+        self.samples: "CounterDict[str]" = CounterDict()
+        self.requested = 0
+        self.remaining = 0
+        self.active = 0
+        self.completed = 0
+        self.run = 0
+        self.interval = 0.005
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._target: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # Called on the event loop thread, which is the one that gets sampled
+    def arm(self, ingests: int, interval: float):
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        self.samples = CounterDict()
+        self.requested = ingests
+        self.remaining = ingests
+        self.active = 0
+        self.completed = 0
+        self.run += 1
+        self.interval = interval
+        self.started_at = time.time()
+        self.finished_at = None
+        self._target = threading.get_ident()
+        # A fresh event per run, a sampler from a cancelled run may not have woken up yet
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, args=(self._stop,), name="ingest-profiler", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self.remaining = 0
+        self._finish()
+
+    # Middleware hooks, both on the event loop thread. enter returns the run the ingest
+    # belongs to (0 for none), so ingests still in flight from a cancelled run don't count
+    def enter(self) -> int:
+        if self.remaining <= 0:
+            return 0
+        self.remaining -= 1
+        self.active += 1
+        return self.run
+
+    def exit(self, run: int):
+        if run != self.run:
+            return
+        self.active -= 1
+        self.completed += 1
+        if self.remaining <= 0 and self.active <= 0:
+            self._finish()
+
+    def _finish(self):
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        self._thread = None
+        self.finished_at = time.time()
+
+    def _sample(self, stop: threading.Event):
+        while not stop.wait(self.interval):
+            if self.active <= 0:
+                continue
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.samples[_fold(frame)] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "requested": self.requested,
+            "completed": self.completed,
+            "in_flight": self.active,
+            "interval_ms": self.interval * 1000,
+            "samples": sum(self.samples.values()),
+            "stacks": len(self.samples),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+profiler = SamplingProfiler()
@@ -1,11 +1,41 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import ingest
+from fastapi.middleware.gzip import GZipMiddleware
+from .routers import ingest, tts, ws, metrics, admin
+from .core.auth import get_settings
+from .core.database import game_database
+from .core.compression import RequestDecompressionMiddleware
+from .core.metrics import MetricsMiddleware
+from .services.commentary_service import commentary_pipeline
+from .services.broadcast_service import broadcast_hub
+from .services.ingest_pool import ingest_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    broadcast_hub.max_queue = settings.BROADCAST_QUEUE_SIZE
+    if settings.DATABASE_PATH:
+        game_database.batch_size = settings.DATABASE_BATCH_SIZE
+        game_database.start(settings.DATABASE_PATH)
+    await commentary_pipeline.start(
+        workers=settings.COMMENTARY_WORKERS,
+        max_pending_per_session=settings.COMMENTARY_QUEUE_SIZE,
+        coalesce_window=settings.COMMENTARY_COALESCE_WINDOW
+    )
+    await ingest_pool.start(settings.INGEST_PROCESS_WORKERS, strict=settings.FORMAT_STRICT)
+    yield
+    await ingest_pool.stop()
+    await commentary_pipeline.stop()
+    game_database.stop()
+
 
 app = FastAPI(
     title="League Live Data API",
     description="API for League of Legends live game data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
@@ -17,8 +47,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(ingest.router, prefix="/api", tags=["ingest"])
+# Compressed ingest bodies (Content-Encoding: zstd/gzip/deflate), capped before and after decompression
+app.add_middleware(RequestDecompressionMiddleware, max_body_bytes=get_settings().REQUEST_MAX_BODY_BYTES)
+# Larger JSON responses (timeline, stats) are gzipped for clients that accept it, audio is left alone
+app.add_middleware(GZipMiddleware, minimum_size=get_settings().RESPONSE_GZIP_MIN_SIZE, compresslevel=6)
+# Outermost, so ingest latency and Server-Timing include decompression and body parsing
+app.add_middleware(MetricsMiddleware, server_timing=get_settings().SERVER_TIMING_ENABLED)
 
+# Declared before the routers: routes are matched in order, and the included routers are only
+# prepared on the first request that reaches them, so health probes answer without that cost
 @app.get("/")
 async def root():
     return {"message": "League Live Data API", "status": "running"}
@@ -27,6 +64,12 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+app.include_router(ingest.router, prefix="/api", tags=["ingest"])
+app.include_router(tts.router, prefix="/api", tags=["tts"])
+app.include_router(ws.router, prefix="/ws", tags=["ws"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.schemas.auth import ProfileRequest
+from app.core.config import Settings
+from app.core.auth import get_settings, validate_admin_token
+from app.core.profiling import profiler
+
+router = APIRouter()
+
+
+# Samples the event loop during the next N ingests, from any session
+@router.post("/profile", status_code=202)
+async def start_profile(
+    payload: ProfileRequest,
+    token: str = Depends(validate_admin_token),
+    settings: Settings = Depends(get_settings)
+):
+    if payload.ingests > settings.PROFILER_MAX_INGESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PROFILER_MAX_INGESTS} ingests can be profiled at once"
+        )
+
+    try:
+        profiler.arm(payload.ingests, payload.interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return {
+        "status": "armed",
+        "message": f"Profiling the next {payload.ingests} ingests",
+        **profiler.status()
+    }
+
+
+# Progress of the current or last profile
+@router.get("/profile")
+async def profile_status(
+    token: str = Depends(validate_admin_token)
+):
+    return profiler.status()
+
+
+# Folded stacks of the current or last profile, one "frame;frame;frame count" line per stack.
+# Feed to flamegraph.pl, inferno-flamegraph or speedscope
+@router.get("/profile/folded", response_class=PlainTextResponse)
+async def profile_folded(
+    token: str = Depends(validate_admin_token)
+):
+    if profiler.running:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Profile still running, {profiler.completed} of {profiler.requested} ingests done"
+        )
+    return PlainTextResponse(profiler.folded())
+
+
+@router.delete("/profile")
+async def cancel_profile(
+    token: str = Depends(validate_admin_token)
+):
+    profiler.cancel()
+    return profiler.status()
@@ -1,67 +1,99 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import Response
-from datetime import datetime, timezone
-from pydantic import BaseModel
+from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 
 from app.schemas.auth import ConnectionRequest
-from app.schemas.session import Session
-from app.schemas.game_data import GameDataPayload
+from app.schemas.game_data import GameData, GameDataPayload, GameDataDeltaPayload, GameDataBulkPayload
+from app.core.config import Settings
 import app.core.memory_data as memory
-from app.core.auth import validate_secret_token, validate_active_session
+from app.core.memory_data import SessionState
+from app.core.auth import get_settings, validate_secret_token, validate_active_session
+from app.core.database import game_database
+from app.core.compression import SUPPORTED_ENCODINGS
+from app.core.metrics import metrics
 from app.services.formatting_service import format_league_data
-from app.services.change_detection_service import change_detector
-from app.services.openai_service import handle_game_changes, text_to_speech
+from app.services.delta_service import apply_patch, PatchError
+from app.services.decode_service import decode_stats, DecodeError
+from app.services.commentary_service import commentary_pipeline
+from app.services.change_detection_service import ChangeEvent, coalesce_events, game_ended
+from app.services.broadcast_service import broadcast_hub
+from app.services.openai_service import response_cache
+from app.services.ingest_pool import ingest_pool
+from app.services.providers import warm_up_providers
 
 router = APIRouter()
 
 
-class TTSRequest(BaseModel):
-    text: str
-    voice: str = "onyx"  # default voice
+def _save_game(state: SessionState, reason: str):
+    if state.game_data is None or state.game_saved:
+        return
+    game_database.save_game(
+        state.session.session_id,
+        state.session.user,
+        state.game_data,
+        state.timeline.last(len(state.timeline)),
+        reason
+    )
+    state.game_saved = True
+
+
+# Persists whatever the session still holds and drops all of its per-session state
+def _end_session(state: SessionState, reason: str):
+    session_id = state.session.session_id
+    _save_game(state, reason)
+    commentary_pipeline.discard(session_id)
+    broadcast_hub.remove(session_id)
+    memory.sessions.remove(session_id)
+    # Last, the session is already gone if the worker can't be reached
+    ingest_pool.forget(session_id)
 
-# Checks if there is no active user, and then sets up a session for a user
+
+# Sets up a new session for a user, each connected client gets its own session id
 @router.post("/connection/establish")
 async def check_connection(
     payload: ConnectionRequest,
-    token: str = Depends(validate_secret_token)
+    token: str = Depends(validate_secret_token),
+    settings: Settings = Depends(get_settings)
 ):
-    if memory.current_session is not None and memory.current_session.isActive:
+    for expired in memory.sessions.find_idle(settings.SESSION_IDLE_TIMEOUT):
+        _end_session(expired, reason="idle")
+
+    if memory.sessions.active_count() >= settings.MAX_SESSIONS:
         raise HTTPException(
-            status_code=409,
-            detail=f"User '{memory.current_session.user}' is already connected. Please disconnect first."
+            status_code=503,
+            detail="Too many active sessions. Please try again later."
         )
 
-    memory.current_session = Session(
-        user=payload.username,
-        token=token,
-        isActive=True,
-        created_at=datetime.now(timezone.utc),
-        last_activity=datetime.now(timezone.utc)
-    )
+    state = memory.sessions.create(user=payload.username, token=token)
+    commentary_pipeline.set_window(state.session.session_id, payload.coalesce_window)
+    # Commentary follows soon, load the LLM SDK in the background if this is the first session
+    warm_up_providers()
 
     return {
         "status": "connected",
         "message": f"Session established for user: {payload.username}",
-        "user": payload.username
+        "user": payload.username,
+        "session_id": state.session.session_id,
+        "coalesce_window": commentary_pipeline.window(state.session.session_id),
+        # Content-Encodings accepted on ingest bodies, the client picks the first it also supports
+        "accept_encoding": SUPPORTED_ENCODINGS
     }
 
 
-# Checks username and auth token and sets isActive to False if true
-# Should also clear the game session data
+# Checks username and auth token and ends the session
+# Also clears the game session data
 @router.post("/connection/disconnect")
 async def disconnect(
     payload: ConnectionRequest,
-    session: Session = Depends(validate_active_session)
+    state: SessionState = Depends(validate_active_session)
 ):
-    if session.user != payload.username:
+    if state.session.user != payload.username:
         raise HTTPException(
             status_code=403,
-            detail=f"Username mismatch. Current session belongs to: {session.user}"
+            detail=f"Username mismatch. Current session belongs to: {state.session.user}"
         )
 
-    memory.current_session.isActive = False
-    memory.game_data = None
-    change_detector.reset()
+    _end_session(state, reason="disconnect")
+    await game_database.flush()
 
     return {
         "status": "disconnected",
@@ -69,49 +101,246 @@ async def disconnect(
         "user": payload.username
     }
     
+async def _process_snapshot(state: SessionState, payload: GameDataPayload):
+    if ingest_pool.enabled:
+        with metrics.stage("pool"):
+            game_data, changes, ended = await ingest_pool.process(state.session.session_id, data=payload.data)
+        return await _record_snapshot(state, game_data, changes, ended)
+
+    with metrics.stage("format"):
+        game_data = format_league_data(payload, cache=state.format_cache, strict=get_settings().FORMAT_STRICT)
+    with metrics.stage("detect"):
+        changes = state.change_detector.diff(game_data)
+    return await _record_snapshot(state, game_data, changes, game_ended(payload.data))
+
+
+async def _record_snapshot(state: SessionState, game_data: GameData, changes: List[ChangeEvent], ended: bool):
+    with metrics.stage("record"):
+        if state.game_saved and not ended:
+            # The first snapshot after a saved game starts the next one: its history begins
+            # here, and changes against the previous game's final state mean nothing
+            state.start_new_game()
+            ingest_pool.forget(state.session.session_id)
+            state.change_detector.diff(game_data)
+            changes = []
+
+        for change in changes:
+            metrics.change_events.inc(change.change_type.value)
+        if changes:
+            await state.change_detector.notify(changes)
+
+        state.game_data = game_data
+        state.timeline.record(game_data)
+        game_database.record_events(state.session.session_id, game_data.game_time, changes)
+
+        if ended:
+            _save_game(state, reason="game_end")
+            game_database.request_flush()
+
+    return game_data, changes
+
+
+async def _ingest_snapshot(state: SessionState, payload: GameDataPayload) -> dict:
+    game_data, changes = await _process_snapshot(state, payload)
+    return _finish_ingest(state, game_data, changes)
+
+
+def _finish_ingest(state: SessionState, game_data: GameData, changes: List[ChangeEvent]) -> dict:
+    # Commentary runs on the background workers, ingest never waits on the LLM
+    if changes:
+        commentary_pipeline.submit(state.session.session_id, changes, game_data)
+
+    return {
+        "status": "success",
+        "message": "Data ingested successfully",
+        "user": state.session.user,
+        "game_status": game_data.game_status,
+        "changes_detected": len(changes),
+        "commentary_pending": commentary_pipeline.depth(state.session.session_id),
+        "seq": state.raw_seq,
+    }
+
+
 # Regularly called endpoint that gets live league game data and updates to the storage
 @router.post("/ingest", status_code=201)
 async def ingest_game_json(
     payload: GameDataPayload,
-    session: Session = Depends(validate_active_session)
+    state: SessionState = Depends(validate_active_session)
 ):
-    game_data = format_league_data(payload)
+    metrics.since_request("parse")
+    # A full document also (re)sets the base snapshot for delta ingests
+    state.raw_data = payload.data
+    state.raw_seq = payload.seq
 
-    changes = await change_detector.detect_changes(game_data)
+    return await _ingest_snapshot(state, payload)
 
-    if changes:
-        await handle_game_changes(changes)
 
-    memory.game_data = game_data
+# Replays snapshots the client buffered while the backend was unreachable, in order.
+# Every snapshot goes through detection, the timeline and the database like a live one, but
+# the events of the whole batch are merged into a single commentary job.
+# The last snapshot becomes the base for delta ingests, same as /ingest.
+@router.post("/ingest/bulk", status_code=201)
+async def ingest_game_bulk(
+    payload: GameDataBulkPayload,
+    state: SessionState = Depends(validate_active_session),
+    settings: Settings = Depends(get_settings)
+):
+    metrics.since_request("parse")
+    if len(payload.snapshots) > settings.BULK_INGEST_MAX_SNAPSHOTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many snapshots in one request, the limit is {settings.BULK_INGEST_MAX_SNAPSHOTS}"
+        )
+    if not payload.snapshots:
+        raise HTTPException(status_code=400, detail="No snapshots to ingest")
 
-    response = {
+    all_changes = []
+    for snapshot in payload.snapshots:
+        game_data, changes = await _process_snapshot(state, snapshot)
+        all_changes.extend(changes)
+
+    last = payload.snapshots[-1]
+    state.raw_data = last.data
+    state.raw_seq = last.seq
+
+    if all_changes:
+        commentary_pipeline.submit(state.session.session_id, coalesce_events(all_changes), game_data)
+
+    return {
         "status": "success",
-        "message": "Data ingested successfully",
-        "user": session.user,
+        "message": f"Ingested {len(payload.snapshots)} buffered snapshots",
+        "user": state.session.user,
         "game_status": game_data.game_status,
-        "changes_detected": len(changes),
+        "snapshots": len(payload.snapshots),
+        "changes_detected": len(all_changes),
+        "commentary_pending": commentary_pipeline.depth(state.session.session_id),
+        "seq": state.raw_seq,
     }
 
-    return response
 
-# Text-to-speech endpoint
-@router.post("/tts")
-async def generate_speech(
-    payload: TTSRequest,
-    session: Session = Depends(validate_active_session)
+# Same as /ingest, but the body is the allgamedata document itself, exactly as read from the
+# Live Client API. It is decoded once with the fastest available decoder, skipping FastAPI's
+# stdlib json parse and pydantic's walk over fields the backend never reads.
+@router.post("/ingest/raw", status_code=201)
+async def ingest_game_raw(
+    request: Request,
+    state: SessionState = Depends(validate_active_session)
 ):
+    body = await request.body()
+    metrics.since_request("parse")
+
+    if ingest_pool.enabled:
+        # The body goes to the session's worker as is and is decoded there
+        try:
+            with metrics.stage("pool"):
+                game_data, changes, ended = await ingest_pool.process(state.session.session_id, body=body)
+        except DecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid game data: {str(e)}")
+        state.raw_data = None
+        state.raw_seq = None
+        await _record_snapshot(state, game_data, changes, ended)
+        return _finish_ingest(state, game_data, changes)
+
     try:
-        audio_content = await text_to_speech(payload.text, payload.voice)
+        with metrics.stage("decode"):
+            data = decode_stats.decode(body)
+    except DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid game data: {str(e)}")
+
+    # The decoded document may be trimmed, so it can't serve as a delta base
+    state.raw_data = None
+    state.raw_seq = None
+
+    return await _ingest_snapshot(state, GameDataPayload.model_construct(data=data, seq=None))
+
+
+# Decoder in use and measured decode CPU time per raw ingest
+@router.get("/ingest/raw/stats")
+async def raw_ingest_stats(
+    token: str = Depends(validate_secret_token)
+):
+    return decode_stats.stats()
 
-        return Response(
-            content=audio_content,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "inline; filename=speech.mp3"
+
+# Same as /ingest, but the client only sends a JSON patch against the last acknowledged snapshot
+@router.post("/ingest/delta", status_code=201)
+async def ingest_game_delta(
+    payload: GameDataDeltaPayload,
+    state: SessionState = Depends(validate_active_session)
+):
+    metrics.since_request("parse")
+    if state.raw_data is None or state.raw_seq is None or payload.base_seq != state.raw_seq:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Delta base does not match the stored snapshot. Please resync with a full snapshot.",
+                "resync": True,
+                "expected_seq": state.raw_seq
             }
         )
-    except Exception as e:
+
+    try:
+        with metrics.stage("patch"):
+            state.raw_data = apply_patch(state.raw_data, payload.patch)
+    except PatchError as e:
+        state.raw_data = None
+        state.raw_seq = None
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate speech: {str(e)}"
-        )
\ No newline at end of file
+            status_code=409,
+            detail={
+                "message": f"Failed to apply patch: {str(e)}. Please resync with a full snapshot.",
+                "resync": True,
+                "expected_seq": None
+            }
+        )
+
+    state.raw_seq = payload.seq
+
+    return await _ingest_snapshot(state, GameDataPayload.model_construct(data=state.raw_data, seq=payload.seq))
+
+# Worker processes formatting and change detection run on, and ingests sent to each
+@router.get("/ingest/pool/stats")
+async def ingest_pool_stats(
+    token: str = Depends(validate_secret_token)
+):
+    return ingest_pool.stats()
+
+# Per-tick player stat history for the session, either the last N ticks or a game time range in seconds
+@router.get("/timeline")
+async def get_timeline(
+    last: Optional[int] = Query(default=None, ge=1),
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    state: SessionState = Depends(validate_active_session)
+):
+    timeline = state.timeline
+    if start is not None or end is not None:
+        data = timeline.range(start if start is not None else 0.0, end if end is not None else float("inf"))
+    else:
+        data = timeline.last(last if last is not None else len(timeline))
+
+    return {
+        "user": state.session.user,
+        "ticks": len(timeline),
+        "bytes": timeline.nbytes(),
+        "item_sets": [list(items) for items in timeline.item_sets],
+        **data
+    }
+
+# Persistence writer queue depth and throughput
+@router.get("/storage/stats")
+async def storage_stats(
+    token: str = Depends(validate_secret_token)
+):
+    return game_database.stats()
+
+# Commentary queue depth and drop counts, used to size the worker pool
+@router.get("/commentary/stats")
+async def commentary_stats(
+    token: str = Depends(validate_secret_token)
+):
+    return {
+        **commentary_pipeline.stats(),
+        "response_cache": response_cache.stats(),
+        "broadcast": broadcast_hub.stats()
+    }
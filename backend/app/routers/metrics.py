@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from app.core.config import Settings
+import app.core.memory_data as memory
+from app.core.auth import get_settings, extract_bearer_token, validate_secret_token
+from app.core.metrics import metrics, CallbackMetric
+from app.services.commentary_service import commentary_pipeline
+from app.services.ingest_pool import ingest_pool
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Current values, read from the services when scraped
+metrics.register(CallbackMetric(
+    "active_sessions", "Sessions currently established", lambda: memory.sessions.active_count()
+))
+metrics.register(CallbackMetric(
+    "commentary_queue_depth", "Commentary jobs waiting across all sessions", lambda: commentary_pipeline.depth()
+))
+metrics.register(CallbackMetric(
+    "commentary_busy_workers", "Commentary workers running a job", lambda: commentary_pipeline.busy_workers
+))
+metrics.register(CallbackMetric(
+    "commentary_jobs_total",
+    "Commentary jobs by outcome",
+    lambda: {
+        "processed": commentary_pipeline.processed,
+        "failed": commentary_pipeline.failed,
+        "dropped": commentary_pipeline.dropped,
+        "coalesced": commentary_pipeline.coalesced,
+    },
+    labels=("outcome",),
+    kind="counter"
+))
+metrics.register(CallbackMetric(
+    "ingest_pool_restarts_total", "Format/detect worker processes replaced after crashing",
+    lambda: ingest_pool.restarts, kind="counter"
+))
+
+
+def _metrics_auth(
+    authorization: Optional[str] = Header(None, alias="Authorization"),
+    settings: Settings = Depends(get_settings)
+):
+    if not settings.METRICS_PUBLIC:
+        validate_secret_token(extract_bearer_token(authorization), settings)
+
+
+# Prometheus text exposition format, token protected unless METRICS_PUBLIC is set
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(
+    _: None = Depends(_metrics_auth)
+):
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,155 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+import time
+
+from app.core.memory_data import SessionState
+from app.core.auth import validate_active_session
+from app.services.audio_cache import parse_range
+from app.services.openai_service import cached_text_to_speech, speech_key, audio_cache
+from app.services.tts_stream_service import stream_speech, speech_timings
+
+router = APIRouter()
+
+
+class TTSRequest(BaseModel):
+    text: str
+    voice: str = "onyx"  # default voice
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# Builds a 200/206/304/416 response for cached audio, audio is content-addressed so the key is the ETag
+def _audio_response(request: Request, key: str, audio: bytes) -> Response:
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400, immutable",
+        "Content-Location": f"/api/tts/audio/{key}",
+        "Content-Disposition": "inline; filename=speech.mp3"
+    }
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_range(request.headers.get("range"), len(audio))
+    except ValueError:
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{len(audio)}"}
+        )
+
+    if byte_range is None:
+        return Response(content=audio, media_type="audio/mpeg", headers=headers)
+
+    start, end = byte_range
+    return Response(
+        content=audio[start:end + 1],
+        status_code=206,
+        media_type="audio/mpeg",
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(audio)}"}
+    )
+
+
+# Text-to-speech endpoint
+@router.post("/tts")
+async def generate_speech(
+    payload: TTSRequest,
+    request: Request,
+    state: SessionState = Depends(validate_active_session)
+):
+    # The ETag is known before synthesis, so revalidations never touch the speech API
+    key = speech_key(payload.text, payload.voice)
+    if _etag_matches(request, f'"{key}"'):
+        return _audio_response(request, key, b"")
+
+    try:
+        key, audio_content = await cached_text_to_speech(payload.text, payload.voice)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate speech: {str(e)}"
+        )
+
+    return _audio_response(request, key, audio_content)
+
+
+# Streaming text-to-speech, forwards audio chunks with chunked transfer as the speech API produces them
+@router.post("/tts/stream")
+async def stream_generated_speech(
+    payload: TTSRequest,
+    state: SessionState = Depends(validate_active_session)
+):
+    started_at = time.perf_counter()
+    key = speech_key(payload.text, payload.voice)
+    stream = stream_speech(payload.text, payload.voice, started_at=started_at)
+
+    # Pull the first chunk before responding so provider errors still surface as a 500
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate speech: {str(e)}"
+        )
+
+    async def body():
+        if first_chunk:
+            yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={
+            "ETag": f'"{key}"',
+            "Content-Location": f"/api/tts/audio/{key}",
+            "Content-Disposition": "inline; filename=speech.mp3",
+            "Cache-Control": "no-transform"
+        }
+    )
+
+
+@router.get("/tts/stream/stats")
+async def tts_stream_stats(
+    state: SessionState = Depends(validate_active_session)
+):
+    return speech_timings.stats()
+
+
+# Serves previously synthesized audio by its content hash, supports ETag revalidation and Range requests
+@router.get("/tts/audio/{key}")
+async def get_cached_speech(
+    key: str,
+    request: Request,
+    state: SessionState = Depends(validate_active_session)
+):
+    if _etag_matches(request, f'"{key}"'):
+        return _audio_response(request, key, b"")
+
+    audio_content = await audio_cache.aget(key)
+    if audio_content is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Audio not found in cache"
+        )
+
+    return _audio_response(request, key, audio_content)
+
+
+@router.get("/tts/stats")
+async def tts_stats(
+    state: SessionState = Depends(validate_active_session)
+):
+    return audio_cache.stats()
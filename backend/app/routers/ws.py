@@ -0,0 +1,90 @@
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+import asyncio
+
+import app.core.memory_data as memory
+from app.core.memory_data import SessionState
+from app.core.auth import get_settings
+from app.services.broadcast_service import broadcast_hub, Subscriber
+
+router = APIRouter()
+
+
+# Same checks as validate_active_session, but websocket clients may also pass
+# the token and session id as query parameters (browsers cannot set headers)
+def _authenticate(websocket: WebSocket) -> Optional[SessionState]:
+    authorization = websocket.headers.get("authorization", "")
+    token = authorization.replace("Bearer ", "", 1).strip() if authorization.startswith("Bearer ") else ""
+    token = token or websocket.query_params.get("token", "")
+    session_id = websocket.headers.get("x-session-id") or websocket.query_params.get("session_id", "")
+
+    if not token or token != get_settings().SECRET_TOKEN or not session_id:
+        return None
+
+    state = memory.sessions.get(session_id)
+    if state is None or not state.session.isActive or state.session.token != token:
+        return None
+
+    return state
+
+
+async def _send_frames(websocket: WebSocket, subscriber: Subscriber):
+    while True:
+        frame = await subscriber.queue.get()
+        if frame is None:
+            return
+        kind, data = frame
+        if kind == "bytes":
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_json(data)
+
+
+async def _drain_client(websocket: WebSocket):
+    # Subscribers don't send anything meaningful, reading just notices the disconnect
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+# Streams agent commentary (and optional TTS audio as binary frames) for a session
+@router.websocket("/commentary")
+async def commentary_socket(websocket: WebSocket, audio: bool = False):
+    state = _authenticate(websocket)
+    if state is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    # Subscribed before the first await: a session ending meanwhile closes this subscriber
+    # instead of leaving a new broadcaster behind that nothing removes
+    session_id = state.session.session_id
+    broadcaster = broadcast_hub.get(session_id)
+    subscriber = broadcaster.subscribe(wants_audio=audio)
+
+    sender = receiver = None
+    try:
+        await websocket.accept()
+        await websocket.send_json({"type": "subscribed", "session_id": session_id, "audio": audio})
+
+        sender = asyncio.create_task(_send_frames(websocket, subscriber))
+        receiver = asyncio.create_task(_drain_client(websocket))
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        tasks = [task for task in (sender, receiver) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        broadcaster.unsubscribe(subscriber)
+
+    if sender is None:
+        return
+
+    # The session ended while we were subscribed
+    if sender.done() and not sender.cancelled() and sender.exception() is None:
+        try:
+            await websocket.close()
+        except RuntimeError:
+            pass
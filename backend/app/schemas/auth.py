@@ -1,4 +1,11 @@
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, Field
 
 class ConnectionRequest(BaseModel):
-    username: str
\ No newline at end of file
+    username: str
+    # Seconds to merge change events over before asking for commentary, None uses the server default
+    coalesce_window: Optional[float] = Field(default=None, ge=0, le=30)
+
+class ProfileRequest(BaseModel):
+    ingests: int = Field(default=100, ge=1)
+    interval_ms: float = Field(default=5.0, ge=1.0, le=1000.0)
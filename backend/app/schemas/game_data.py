@@ -1,12 +1,23 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 from app.schemas.player_data import PlayerData
 
 class GameDataPayload(BaseModel):
     data: Dict[str, Any]
+    seq: Optional[int] = None
+
+# Snapshots buffered by the client during an outage, oldest first
+class GameDataBulkPayload(BaseModel):
+    snapshots: List[GameDataPayload]
+
+class GameDataDeltaPayload(BaseModel):
+    base_seq: int
+    seq: int
+    patch: List[Dict[str, Any]]
     
 class GameData(BaseModel):
     game_status: str
+    game_time: float = 0.0
     main_player: PlayerData
     ally_players: List[PlayerData]
     enemy_players: List[PlayerData]
\ No newline at end of file
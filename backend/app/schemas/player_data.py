@@ -3,6 +3,7 @@ from pydantic import BaseModel
 
 class PlayerData(BaseModel):
     name: str
+    riot_id: str = ""
     champion: str
     kills: int
     deaths: int
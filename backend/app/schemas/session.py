@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Optional
 
 class Session(BaseModel):
+    session_id: str
     user: str
     token: str
     isActive: bool
@@ -0,0 +1,168 @@
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import threading
+
+
+def audio_key(text: str, voice: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\0{voice}\0{text}".encode("utf-8")).hexdigest()
+
+
+# Content-addressed cache for synthesized speech.
+# Memory tier is an LRU bounded by bytes, the optional disk tier keeps one file per key
+# and evicts least recently used files once the directory grows past its byte cap.
+class AudioCache:
+    def __init__(
+        self,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+
+        # key -> size, ordered from least to most recently used
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self._disk_loaded = False
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        if len(audio) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        audio = self.get(key)
+        if audio is not None:
+            return audio
+
+        if self.disk_dir is not None:
+            audio = await asyncio.to_thread(self._disk_get, key)
+            if audio is not None:
+                self.put(key, audio)
+                self.disk_hits += 1
+                return audio
+
+        self.misses += 1
+        return None
+
+    async def aput(self, key: str, audio: bytes):
+        self.put(key, audio)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._disk_put, key, audio)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "disk_entries": len(self._disk_index),
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes if self.disk_dir is not None else 0,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.mp3"
+
+    def _load_disk_index(self):
+        if self._disk_loaded:
+            return
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.disk_dir.glob("*.mp3"):
+            stat = path.stat()
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(files):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+        self._disk_loaded = True
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        with self._disk_lock:
+            self._load_disk_index()
+            if key not in self._disk_index:
+                return None
+            path = self._path(key)
+            try:
+                audio = path.read_bytes()
+                # mtime doubles as the last access time, so the LRU order survives restarts
+                os.utime(path)
+            except FileNotFoundError:
+                self._disk_bytes -= self._disk_index.pop(key)
+                return None
+            self._disk_index.move_to_end(key)
+            return audio
+
+    def _disk_put(self, key: str, audio: bytes):
+        if len(audio) > self.max_disk_bytes:
+            return
+        with self._disk_lock:
+            self._load_disk_index()
+            path = self._path(key)
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_bytes(audio)
+            os.replace(temp_path, path)
+
+            if key in self._disk_index:
+                self._disk_bytes -= self._disk_index.pop(key)
+            self._disk_index[key] = len(audio)
+            self._disk_bytes += len(audio)
+
+            while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+                evicted_key, size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= size
+                try:
+                    self._path(evicted_key).unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def parse_range(range_header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    # Parses a single "bytes=start-end" range, returns inclusive (start, end) or None when absent.
+    # Raises ValueError when the range cannot be satisfied.
+    if not range_header:
+        return None
+    if not range_header.startswith("bytes=") or "," in range_header:
+        raise ValueError("Unsupported range")
+
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    if start_text == "":
+        suffix = int(end_text)
+        if suffix <= 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, length - suffix), length - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else length - 1
+    end = min(end, length - 1)
+    if start > end or start >= length:
+        raise ValueError("Unsatisfiable range")
+    return start, end
@@ -0,0 +1,120 @@
+from typing import Optional, Dict, Any, Set, Tuple, Union
+import asyncio
+import time
+
+
+# A queued frame is ("text", json payload), ("bytes", audio) or None to close the subscriber
+Frame = Optional[Tuple[str, Union[Dict[str, Any], bytes]]]
+
+
+class Subscriber:
+    def __init__(self, max_queue: int = 16, wants_audio: bool = False):
+        self.queue: "asyncio.Queue[Frame]" = asyncio.Queue(maxsize=max_queue)
+        self.wants_audio = wants_audio
+        self.delivered = 0
+        self.dropped = 0
+
+    def offer(self, frame: Frame):
+        # Never block the publisher: a slow consumer loses its oldest frames instead
+        while self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                break
+        self.queue.put_nowait(frame)
+        self.delivered += 1
+
+    def close(self):
+        self.offer(None)
+
+
+# Fans out commentary for one session to any number of subscribers
+class CommentaryBroadcaster:
+    def __init__(self, session_id: str, max_queue: int = 16):
+        self.session_id = session_id
+        self.max_queue = max_queue
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+
+    def subscribe(self, wants_audio: bool = False) -> Subscriber:
+        subscriber = Subscriber(max_queue=self.max_queue, wants_audio=wants_audio)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def wants_audio(self) -> bool:
+        return any(subscriber.wants_audio for subscriber in self.subscribers)
+
+    def publish(self, message: Dict[str, Any], audio: Optional[bytes] = None) -> int:
+        self.published += 1
+        for subscriber in self.subscribers:
+            subscriber.offer(("text", message))
+            if audio is not None and subscriber.wants_audio:
+                subscriber.offer(("bytes", audio))
+        return len(self.subscribers)
+
+    # Audio for the last published message, sent once synthesis finishes
+    def publish_audio(self, audio: bytes) -> int:
+        listeners = 0
+        for subscriber in self.subscribers:
+            if subscriber.wants_audio:
+                subscriber.offer(("bytes", audio))
+                listeners += 1
+        return listeners
+
+    def close(self):
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "dropped": sum(subscriber.dropped for subscriber in self.subscribers),
+            "max_queue_depth": max((subscriber.queue.qsize() for subscriber in self.subscribers), default=0),
+        }
+
+
+class BroadcastHub:
+    def __init__(self, max_queue: int = 16):
+        self.max_queue = max_queue
+        self._broadcasters: Dict[str, CommentaryBroadcaster] = {}
+
+    def get(self, session_id: str) -> CommentaryBroadcaster:
+        broadcaster = self._broadcasters.get(session_id)
+        if broadcaster is None:
+            broadcaster = CommentaryBroadcaster(session_id, max_queue=self.max_queue)
+            self._broadcasters[session_id] = broadcaster
+        return broadcaster
+
+    def find(self, session_id: str) -> Optional[CommentaryBroadcaster]:
+        return self._broadcasters.get(session_id)
+
+    def remove(self, session_id: str):
+        broadcaster = self._broadcasters.pop(session_id, None)
+        if broadcaster is not None:
+            broadcaster.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._broadcasters),
+            "subscribers": sum(len(b.subscribers) for b in self._broadcasters.values()),
+            "published": sum(b.published for b in self._broadcasters.values()),
+        }
+
+
+def commentary_message(session_id: str, text: str, events: list) -> Dict[str, Any]:
+    return {
+        "type": "commentary",
+        "session_id": session_id,
+        "text": text,
+        "events": events,
+        "sent_at": time.time(),
+    }
+
+
+broadcast_hub = BroadcastHub()
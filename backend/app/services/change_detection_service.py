@@ -1,9 +1,9 @@
-from typing import Optional, Dict, Any, List, Callable, Awaitable
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum
 from app.schemas.game_data import GameData
 from app.schemas.player_data import PlayerData
-import asyncio
 
 
 class ChangeType(Enum):
@@ -66,6 +66,31 @@ class ChangeEvent:
         return f"{self.change_type.value} changed for {self.player_name}"
 
 
+# (kills, deaths, assists, creep_score, current_gold, items) - equal fingerprints mean nothing to report
+PlayerFingerprint = Tuple[int, int, int, int, float, Tuple[str, ...]]
+
+
+def player_key(player: PlayerData) -> str:
+    return player.riot_id or player.name
+
+
+def player_fingerprint(player: PlayerData) -> PlayerFingerprint:
+    return (
+        player.kills,
+        player.deaths,
+        player.assists,
+        player.creep_score,
+        player.current_gold,
+        tuple(player.current_items)
+    )
+
+
+# True when a raw allgamedata snapshot's last event is GameEnd
+def game_ended(raw_data: Dict[str, Any]) -> bool:
+    events = (raw_data.get("events") or {}).get("Events") or []
+    return bool(events) and events[-1].get("EventName") == "GameEnd"
+
+
 class ChangeDetector:
     def __init__(self):
         self.previous_data: Optional[GameData] = None
@@ -75,15 +100,26 @@ class ChangeDetector:
         self.track_assists = True
         self.track_items = True
         self.track_game_status = True
+        # Milestones must stay sorted, crossings are found with bisect
         self.gold_milestones = [1000, 2000, 3000, 5000, 7500, 10000, 15000]
         self.cs_milestones = [50, 100, 150, 200, 250, 300]
+        # Last fingerprint of every player, keyed by riotId
+        self._fingerprints: Dict[str, PlayerFingerprint] = {}
 
     def register_callback(self, callback: Callable[[List[ChangeEvent]], Awaitable[None]]):
         self.callbacks.append(callback)
 
     async def detect_changes(self, current_data: GameData) -> List[ChangeEvent]:
+        changes = self.diff(current_data)
+        if changes:
+            await self.notify(changes)
+        return changes
+
+    # The comparison itself, without callbacks, so it can also run outside the event loop
+    def diff(self, current_data: GameData) -> List[ChangeEvent]:
         if self.previous_data is None:
             self.previous_data = current_data
+            self._index_players(current_data)
             return []
 
         changes: List[ChangeEvent] = []
@@ -96,119 +132,92 @@ class ChangeDetector:
                 new_value=current_data.game_status
             ))
 
-        main_player_changes = self._detect_player_changes(
-            self.previous_data.main_player,
-            current_data.main_player,
-            is_main_player=True
-        )
-        changes.extend(main_player_changes)
-
-        for prev_ally in self.previous_data.ally_players:
-            curr_ally = self._find_player_by_name(current_data.ally_players, prev_ally.name)
-            if curr_ally:
-                ally_changes = self._detect_player_changes(prev_ally, curr_ally, is_main_player=False)
-                changes.extend(ally_changes)
-
-        for prev_enemy in self.previous_data.enemy_players:
-            curr_enemy = self._find_player_by_name(current_data.enemy_players, prev_enemy.name)
-            if curr_enemy:
-                enemy_changes = self._detect_player_changes(prev_enemy, curr_enemy, is_main_player=False)
-                changes.extend(enemy_changes)
+        fingerprints = self._fingerprints
+        self._detect_player_changes(fingerprints, current_data.main_player, True, changes)
+        for player in current_data.ally_players:
+            self._detect_player_changes(fingerprints, player, False, changes)
+        for player in current_data.enemy_players:
+            self._detect_player_changes(fingerprints, player, False, changes)
 
         self.previous_data = current_data
 
-        if changes:
-            await self._fire_callbacks(changes)
-
         return changes
 
+    def _index_players(self, data: GameData):
+        fingerprints = {player_key(data.main_player): player_fingerprint(data.main_player)}
+        for player in data.ally_players:
+            fingerprints[player_key(player)] = player_fingerprint(player)
+        for player in data.enemy_players:
+            fingerprints[player_key(player)] = player_fingerprint(player)
+        self._fingerprints = fingerprints
+
     def _detect_player_changes(
         self,
-        prev_player: PlayerData,
+        fingerprints: Dict[str, PlayerFingerprint],
         curr_player: PlayerData,
-        is_main_player: bool = False
-    ) -> List[ChangeEvent]:
-        changes: List[ChangeEvent] = []
-
-        context = {
-            "kills": curr_player.kills,
-            "deaths": curr_player.deaths,
-            "assists": curr_player.assists,
-            "cs": curr_player.creep_score,
-            "gold": curr_player.current_gold,
-            "champion": curr_player.champion,
-            "is_main_player": is_main_player
-        }
-
-        if self.track_kills and curr_player.kills > prev_player.kills:
+        is_main_player: bool,
+        changes: List[ChangeEvent]
+    ):
+        key = player_key(curr_player)
+        current = player_fingerprint(curr_player)
+        previous = fingerprints.get(key)
+        fingerprints[key] = current
+
+        # Players that just appeared have nothing to compare against, unchanged players are skipped outright
+        if previous is None or previous == current:
+            return
+
+        prev_kills, prev_deaths, prev_assists, prev_cs, prev_gold, prev_items = previous
+        kills, deaths, assists, cs, gold, items = current
+        context: Optional[Dict[str, Any]] = None
+
+        def event(change_type: ChangeType, old_value: Any, new_value: Any):
+            nonlocal context
+            # Context is only built once an event actually fires
+            if context is None:
+                context = {
+                    "kills": kills,
+                    "deaths": deaths,
+                    "assists": assists,
+                    "cs": cs,
+                    "gold": gold,
+                    "champion": curr_player.champion,
+                    "is_main_player": is_main_player
+                }
             changes.append(ChangeEvent(
-                change_type=ChangeType.KILL,
+                change_type=change_type,
                 player_name=curr_player.name,
-                old_value=prev_player.kills,
-                new_value=curr_player.kills,
+                old_value=old_value,
+                new_value=new_value,
                 context=context
             ))
 
-        if self.track_deaths and curr_player.deaths > prev_player.deaths:
-            changes.append(ChangeEvent(
-                change_type=ChangeType.DEATH,
-                player_name=curr_player.name,
-                old_value=prev_player.deaths,
-                new_value=curr_player.deaths,
-                context=context
-            ))
+        if self.track_kills and kills > prev_kills:
+            event(ChangeType.KILL, prev_kills, kills)
 
-        if self.track_assists and curr_player.assists > prev_player.assists:
-            changes.append(ChangeEvent(
-                change_type=ChangeType.ASSIST,
-                player_name=curr_player.name,
-                old_value=prev_player.assists,
-                new_value=curr_player.assists,
-                context=context
-            ))
+        if self.track_deaths and deaths > prev_deaths:
+            event(ChangeType.DEATH, prev_deaths, deaths)
 
-        if self.track_items and set(curr_player.current_items) != set(prev_player.current_items):
-            # Only fire if new items were added (not removed/sold)
-            if len(curr_player.current_items) >= len(prev_player.current_items):
-                changes.append(ChangeEvent(
-                    change_type=ChangeType.ITEM_PURCHASE,
-                    player_name=curr_player.name,
-                    old_value=prev_player.current_items,
-                    new_value=curr_player.current_items,
-                    context=context
-                ))
+        if self.track_assists and assists > prev_assists:
+            event(ChangeType.ASSIST, prev_assists, assists)
 
-        if is_main_player:
-            for milestone in self.gold_milestones:
-                if prev_player.current_gold < milestone <= curr_player.current_gold:
-                    changes.append(ChangeEvent(
-                        change_type=ChangeType.GOLD_MILESTONE,
-                        player_name=curr_player.name,
-                        old_value=prev_player.current_gold,
-                        new_value=milestone,
-                        context=context
-                    ))
+        if self.track_items and items != prev_items and set(items) != set(prev_items):
+            # Only fire if new items were added (not removed/sold)
+            if len(items) >= len(prev_items):
+                event(ChangeType.ITEM_PURCHASE, list(prev_items), list(items))
 
         if is_main_player:
-            for milestone in self.cs_milestones:
-                if prev_player.creep_score < milestone <= curr_player.creep_score:
-                    changes.append(ChangeEvent(
-                        change_type=ChangeType.CS_MILESTONE,
-                        player_name=curr_player.name,
-                        old_value=prev_player.creep_score,
-                        new_value=milestone,
-                        context=context
-                    ))
-
-        return changes
+            if gold > prev_gold:
+                milestones = self.gold_milestones
+                for milestone in milestones[bisect_right(milestones, prev_gold):bisect_right(milestones, gold)]:
+                    event(ChangeType.GOLD_MILESTONE, prev_gold, milestone)
 
-    def _find_player_by_name(self, players: List[PlayerData], name: str) -> Optional[PlayerData]:
-        for player in players:
-            if player.name == name:
-                return player
-        return None
+            if cs > prev_cs:
+                milestones = self.cs_milestones
+                for milestone in milestones[bisect_right(milestones, prev_cs):bisect_right(milestones, cs)]:
+                    event(ChangeType.CS_MILESTONE, prev_cs, milestone)
 
-    async def _fire_callbacks(self, changes: List[ChangeEvent]):
+    async def notify(self, changes: List[ChangeEvent]):
         for callback in self.callbacks:
             try:
                 await callback(changes)
@@ -217,5 +226,29 @@ class ChangeDetector:
 
     def reset(self):
         self.previous_data = None
+        self._fingerprints = {}
+
+
+# Merges events from several consecutive detect_changes calls into one list.
+# Repeated events for the same player and change type collapse into a single event
+# spanning the first old value to the latest new value (e.g. two gold milestones
+# become the latest one, 3 -> 4 -> 5 kills becomes 3 -> 5).
+def coalesce_events(changes: List[ChangeEvent]) -> List[ChangeEvent]:
+    merged: Dict[Any, ChangeEvent] = {}
+
+    for change in changes:
+        key = (change.change_type, change.player_name)
+        previous = merged.get(key)
+        if previous is None:
+            merged[key] = change
+            continue
+
+        merged[key] = ChangeEvent(
+            change_type=change.change_type,
+            player_name=change.player_name,
+            old_value=previous.old_value,
+            new_value=change.new_value,
+            context=change.context
+        )
 
-change_detector = ChangeDetector()
+    return list(merged.values())
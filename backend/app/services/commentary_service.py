@@ -0,0 +1,261 @@
+from typing import Optional, Dict, Any, List, Set, Deque, Callable, Awaitable
+from dataclasses import dataclass, field
+from collections import deque
+import asyncio
+import time
+
+from app.core.profiling import RequestTiming, current_timing, use_timing
+from app.schemas.game_data import GameData
+from app.services.change_detection_service import ChangeEvent, coalesce_events
+from app.services.broadcast_service import broadcast_hub, commentary_message
+
+
+@dataclass
+class CommentaryJob:
+    session_id: str
+    changes: List[ChangeEvent]
+    game_data: GameData
+    enqueued_at: float = field(default_factory=time.monotonic)
+    # Submitted by a request with Server-Timing on, the job logs its own stage timings
+    timed: bool = False
+
+
+CommentaryHandler = Callable[[CommentaryJob], Awaitable[Any]]
+
+
+# Runs AI commentary off the ingest request path.
+# Every session has a bounded queue of pending jobs (newest wins when full) and a
+# pool of async workers drains them, at most one job per session at a time so
+# commentary for a session stays in order.
+# With a coalescing window, a job waits that long after its first events arrive and
+# every ingest in the meantime is merged into it, so a teamfight is one LLM call.
+class CommentaryPipeline:
+    def __init__(
+        self,
+        handler: Optional[CommentaryHandler] = None,
+        workers: int = 4,
+        max_pending_per_session: int = 4,
+        coalesce_window: float = 0.0
+    ):
+        self.handler = handler
+        self.worker_count = workers
+        self.max_pending_per_session = max_pending_per_session
+        self.coalesce_window = coalesce_window
+
+        self._pending: Dict[str, Deque[CommentaryJob]] = {}
+        self._windows: Dict[str, float] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._scheduled: Set[str] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._busy = 0
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+        self.coalesced = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def busy_workers(self) -> int:
+        return self._busy
+
+    async def start(
+        self,
+        workers: Optional[int] = None,
+        max_pending_per_session: Optional[int] = None,
+        coalesce_window: Optional[float] = None
+    ):
+        if self.running:
+            return
+        if workers is not None:
+            self.worker_count = workers
+        if max_pending_per_session is not None:
+            self.max_pending_per_session = max_pending_per_session
+        if coalesce_window is not None:
+            self.coalesce_window = coalesce_window
+
+        self._ready = asyncio.Queue()
+        # Jobs submitted before start were never scheduled
+        self._scheduled.clear()
+        for session_id, pending in self._pending.items():
+            if pending:
+                self._schedule(session_id)
+
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"commentary-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+
+    async def stop(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._ready = None
+        self._busy = 0
+
+    def set_window(self, session_id: str, seconds: Optional[float]):
+        if seconds is None:
+            self._windows.pop(session_id, None)
+        else:
+            self._windows[session_id] = max(0.0, seconds)
+
+    def window(self, session_id: str) -> float:
+        return self._windows.get(session_id, self.coalesce_window)
+
+    def submit(self, session_id: str, changes: List[ChangeEvent], game_data: GameData) -> None:
+        pending = self._pending.get(session_id)
+        if pending is None:
+            pending = deque()
+            self._pending[session_id] = pending
+
+        # Jobs still waiting out their window absorb the new events
+        if pending and self.window(session_id) > 0:
+            job = pending[-1]
+            job.changes = coalesce_events(job.changes + changes)
+            job.game_data = game_data
+            job.timed = job.timed or current_timing() is not None
+            self.coalesced += 1
+            self.enqueued += 1
+            return
+
+        # Drop the oldest pending snapshots so the newest one wins
+        while len(pending) >= self.max_pending_per_session:
+            pending.popleft()
+            self.dropped += 1
+
+        pending.append(CommentaryJob(
+            session_id=session_id, changes=changes, game_data=game_data, timed=current_timing() is not None
+        ))
+        self.enqueued += 1
+        self._schedule(session_id)
+
+    def discard(self, session_id: str) -> int:
+        self._windows.pop(session_id, None)
+        timer = self._timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+            self._scheduled.discard(session_id)
+        pending = self._pending.pop(session_id, None)
+        return len(pending) if pending else 0
+
+    def depth(self, session_id: Optional[str] = None) -> int:
+        if session_id is not None:
+            pending = self._pending.get(session_id)
+            return len(pending) if pending else 0
+        return sum(len(pending) for pending in self._pending.values())
+
+    def stats(self) -> Dict[str, Any]:
+        depths = [len(pending) for pending in self._pending.values() if pending]
+        return {
+            "workers": len(self._workers),
+            "busy_workers": self._busy,
+            "max_pending_per_session": self.max_pending_per_session,
+            "queue_depth": sum(depths),
+            "sessions_pending": len(depths),
+            "max_session_depth": max(depths, default=0),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "processed": self.processed,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "default_coalesce_window": self.coalesce_window,
+        }
+
+    def _schedule(self, session_id: str):
+        if self._ready is None or session_id in self._scheduled:
+            return
+        self._scheduled.add(session_id)
+
+        pending = self._pending.get(session_id)
+        delay = 0.0
+        if pending:
+            delay = pending[0].enqueued_at + self.window(session_id) - time.monotonic()
+
+        if delay > 0:
+            self._timers[session_id] = asyncio.get_running_loop().call_later(delay, self._release, session_id)
+        else:
+            self._ready.put_nowait(session_id)
+
+    def _release(self, session_id: str):
+        self._timers.pop(session_id, None)
+        if self._ready is not None:
+            self._ready.put_nowait(session_id)
+
+    def _next_job(self, session_id: str) -> Optional[CommentaryJob]:
+        pending = self._pending.get(session_id)
+        if not pending:
+            self._pending.pop(session_id, None)
+            return None
+        return pending.popleft()
+
+    async def _worker(self):
+        while True:
+            session_id = await self._ready.get()
+            job = self._next_job(session_id)
+            if job is None:
+                self._scheduled.discard(session_id)
+                continue
+
+            self._busy += 1
+            try:
+                if self.handler is not None:
+                    await self.handler(job)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"Error in commentary worker for session {session_id}: {e}")
+            finally:
+                self._busy -= 1
+                self._scheduled.discard(session_id)
+
+            if self._pending.get(session_id):
+                self._schedule(session_id)
+            else:
+                self._pending.pop(session_id, None)
+
+
+async def _run_commentary(job: CommentaryJob):
+    if not job.timed:
+        return await _commentate(job)
+
+    timing = RequestTiming()
+    timing.add("queue", time.monotonic() - job.enqueued_at)
+    with use_timing(timing):
+        response = await _commentate(job)
+    print(f"Commentary timing for session {job.session_id}: {timing.header_value()}")
+    return response
+
+
+async def _commentate(job: CommentaryJob):
+    from app.services.openai_service import handle_game_changes, cached_text_to_speech
+    response = await handle_game_changes(job.changes, job.game_data)
+
+    broadcaster = broadcast_hub.find(job.session_id)
+    if response and broadcaster is not None and broadcaster.subscribers:
+        # Text goes out right away, text-only subscribers never wait on speech synthesis
+        broadcaster.publish(
+            commentary_message(job.session_id, response, [change.change_type.value for change in job.changes])
+        )
+        if broadcaster.wants_audio():
+            try:
+                _, audio = await cached_text_to_speech(response)
+            except Exception as e:
+                print(f"Error generating commentary audio for session {job.session_id}: {e}")
+            else:
+                broadcaster.publish_audio(audio)
+
+    return response
+
+
+commentary_pipeline = CommentaryPipeline(handler=_run_commentary)
@@ -0,0 +1,142 @@
+from typing import Dict, Any, List, Union
+import json
+import time
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class DecodeError(Exception):
+    pass
+
+
+if msgspec is not None:
+    UNSET = msgspec.UNSET
+    UnsetType = msgspec.UnsetType
+
+    # Only the parts of allgamedata that format_league_data and the ingest route read.
+    # Everything else (abilities, full rune pages, stats, event details) is skipped by the
+    # decoder without ever being materialized. UNSET fields are left out of to_builtins,
+    # so missing keys stay missing and the usual .get() defaults still apply.
+    class _DisplayName(msgspec.Struct):
+        displayName: Union[str, UnsetType] = UNSET
+
+    class _Scores(msgspec.Struct):
+        kills: Union[int, UnsetType] = UNSET
+        deaths: Union[int, UnsetType] = UNSET
+        assists: Union[int, UnsetType] = UNSET
+        creepScore: Union[int, UnsetType] = UNSET
+
+    class _Runes(msgspec.Struct):
+        keystone: Union[_DisplayName, None, UnsetType] = UNSET
+
+    class _FullRunes(msgspec.Struct):
+        generalRunes: Union[List[_DisplayName], None, UnsetType] = UNSET
+
+    class _Player(msgspec.Struct):
+        riotId: Union[str, UnsetType] = UNSET
+        riotIdGameName: Union[str, UnsetType] = UNSET
+        championName: Union[str, UnsetType] = UNSET
+        team: Union[str, UnsetType] = UNSET
+        scores: Union[_Scores, None, UnsetType] = UNSET
+        items: Union[List[_DisplayName], None, UnsetType] = UNSET
+        runes: Union[_Runes, None, UnsetType] = UNSET
+
+    class _ActivePlayer(msgspec.Struct):
+        riotId: Union[str, UnsetType] = UNSET
+        currentGold: Union[float, UnsetType] = UNSET
+        fullRunes: Union[_FullRunes, None, UnsetType] = UNSET
+
+    class _GameInfo(msgspec.Struct):
+        gameMode: Union[str, UnsetType] = UNSET
+        gameTime: Union[float, UnsetType] = UNSET
+
+    class _Event(msgspec.Struct):
+        EventName: Union[str, UnsetType] = UNSET
+
+    class _Events(msgspec.Struct):
+        Events: Union[List[_Event], None, UnsetType] = UNSET
+
+    class _AllGameData(msgspec.Struct):
+        activePlayer: Union[_ActivePlayer, None, UnsetType] = UNSET
+        allPlayers: Union[List[_Player], None, UnsetType] = UNSET
+        gameData: Union[_GameInfo, None, UnsetType] = UNSET
+        events: Union[_Events, None, UnsetType] = UNSET
+
+    _typed_decoder = msgspec.json.Decoder(_AllGameData)
+
+
+def _decode_msgspec(body: bytes) -> Dict[str, Any]:
+    try:
+        return msgspec.to_builtins(_typed_decoder.decode(body))
+    except (msgspec.DecodeError, msgspec.ValidationError) as e:
+        raise DecodeError(str(e))
+
+
+def _decode_orjson(body: bytes) -> Dict[str, Any]:
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise DecodeError(str(e))
+
+
+def _decode_json(body: bytes) -> Dict[str, Any]:
+    try:
+        return json.loads(body)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise DecodeError(str(e))
+
+
+if msgspec is not None:
+    DECODER, _decode = "msgspec", _decode_msgspec
+elif orjson is not None:
+    DECODER, _decode = "orjson", _decode_orjson
+else:
+    DECODER, _decode = "json", _decode_json
+
+
+# Decodes a raw allgamedata body once with the fastest available decoder.
+# With msgspec the result is trimmed to the fields the backend reads.
+def decode_game_data(body: bytes) -> Dict[str, Any]:
+    data = _decode(body)
+    if not isinstance(data, dict):
+        raise DecodeError("Expected a JSON object")
+    return data
+
+
+# Decode CPU time per raw ingest. The comparison with what /api/ingest spends on the same
+# body lives in benchmarks.raw_ingest, requests only pay for their own decode.
+class DecodeStats:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.decode_seconds = 0.0
+
+    def decode(self, body: bytes) -> Dict[str, Any]:
+        start = time.thread_time()
+        data = decode_game_data(body)
+        elapsed = time.thread_time() - start
+
+        self.requests += 1
+        self.bytes += len(body)
+        self.decode_seconds += elapsed
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        decode_us = self.decode_seconds / self.requests * 1e6 if self.requests else 0.0
+        return {
+            "decoder": DECODER,
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "avg_decode_cpu_us": decode_us,
+        }
+
+
+decode_stats = DecodeStats()
@@ -0,0 +1,105 @@
+from typing import Any, Dict, List
+
+# Minimal RFC 6902 JSON Patch support (add / remove / replace) for the delta ingest protocol
+
+
+class PatchError(Exception):
+    pass
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _split_pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path}")
+    return [_unescape(token) for token in path[1:].split("/")]
+
+
+def _resolve_parent(document: Any, tokens: List[str]) -> Any:
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, dict):
+            if token not in target:
+                raise PatchError(f"Path segment '{token}' does not exist")
+            target = target[token]
+        elif isinstance(target, list):
+            try:
+                target = target[int(token)]
+            except (ValueError, IndexError):
+                raise PatchError(f"Invalid list index '{token}'")
+        else:
+            raise PatchError(f"Cannot descend into '{token}'")
+    return target
+
+
+def _list_index(container: List[Any], token: str, allow_end: bool) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    try:
+        index = int(token)
+    except ValueError:
+        raise PatchError(f"Invalid list index '{token}'")
+    upper = len(container) if allow_end else len(container) - 1
+    if index < 0 or index > upper:
+        raise PatchError(f"List index {index} out of range")
+    return index
+
+
+def apply_patch(document: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Applies the patch in place and returns the document
+    for operation in patch:
+        op = operation.get("op")
+        path = operation.get("path")
+        if path is None:
+            raise PatchError("Patch operation is missing 'path'")
+
+        tokens = _split_pointer(path)
+        if not tokens:
+            if op in ("add", "replace") and isinstance(operation.get("value"), dict):
+                document = operation["value"]
+                continue
+            raise PatchError("Cannot apply operation to the document root")
+
+        parent = _resolve_parent(document, tokens)
+        key = tokens[-1]
+
+        if op == "add":
+            if "value" not in operation:
+                raise PatchError("'add' operation is missing 'value'")
+            if isinstance(parent, dict):
+                parent[key] = operation["value"]
+            elif isinstance(parent, list):
+                parent.insert(_list_index(parent, key, allow_end=True), operation["value"])
+            else:
+                raise PatchError(f"Cannot add to '{path}'")
+
+        elif op == "replace":
+            if "value" not in operation:
+                raise PatchError("'replace' operation is missing 'value'")
+            if isinstance(parent, dict):
+                if key not in parent:
+                    raise PatchError(f"Cannot replace missing key '{path}'")
+                parent[key] = operation["value"]
+            elif isinstance(parent, list):
+                parent[_list_index(parent, key, allow_end=False)] = operation["value"]
+            else:
+                raise PatchError(f"Cannot replace '{path}'")
+
+        elif op == "remove":
+            if isinstance(parent, dict):
+                if key not in parent:
+                    raise PatchError(f"Cannot remove missing key '{path}'")
+                del parent[key]
+            elif isinstance(parent, list):
+                del parent[_list_index(parent, key, allow_end=False)]
+            else:
+                raise PatchError(f"Cannot remove '{path}'")
+
+        else:
+            raise PatchError(f"Unsupported patch operation: {op}")
+
+    return document
@@ -1,14 +1,30 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.schemas.game_data import GameDataPayload, GameData
 from app.schemas.player_data import PlayerData
-import app.core.memory_data as memory
 
+_EMPTY_DICT: Dict[str, Any] = {}
+_EMPTY_LIST: List[Any] = []
 
-def format_league_data(payload: GameDataPayload) -> GameData:
+
+# Per-session memo of the last PlayerData built for each player.
+# A player whose extracted fields are identical to the previous tick reuses the
+# previous object instead of being validated again.
+class FormatCache:
+    def __init__(self):
+        # (riotId, is_main_player) -> (extracted field values, PlayerData)
+        self.players: Dict[Tuple[str, bool], Tuple[Dict[str, Any], PlayerData]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.players.clear()
+
+
+def format_league_data(payload: GameDataPayload, cache: Optional[FormatCache] = None, strict: bool = False) -> GameData:
     raw_data = payload.data
 
     active_player_data = raw_data.get("activePlayer")
-    game_data_obj = raw_data.get("gameData")
+    game_data_obj = raw_data.get("gameData") or _EMPTY_DICT
     all_players_data = raw_data.get("allPlayers")
 
     if not all_players_data:
@@ -23,83 +39,103 @@ def format_league_data(payload: GameDataPayload) -> GameData:
             enemy_players=[]
         )
 
+    # Strict mode is for debugging untrusted captures: no reuse, no type coercion
+    if strict:
+        cache = None
+
     active_player_riot_id = active_player_data.get("riotId", "") if active_player_data else ""
-    game_status = game_data_obj.get("gameMode", "UNKNOWN") if game_data_obj else "UNKNOWN"
 
     main_player = None
     main_player_team = None
-    temp_players = []
+    others = []
 
+    # Single pass: every player dict is read once and turned into a PlayerData
     for player_data in all_players_data:
-        player_riot_id = player_data.get("riotId")
-
-        if player_riot_id == active_player_riot_id:
-            main_player = _create_player_from_data(player_data, active_player_data)
+        if main_player is None and player_data.get("riotId") == active_player_riot_id:
+            main_player = _build_player(player_data, active_player_data, cache, strict)
             main_player_team = player_data.get("team")
         else:
-            temp_players.append((player_data, player_data.get("team")))
+            others.append((player_data.get("team"), player_data))
 
     if main_player is None:
-        main_player = _create_player_from_data(all_players_data[0], active_player_data)
+        main_player = _build_player(all_players_data[0], active_player_data, cache, strict)
         main_player_team = all_players_data[0].get("team")
-        temp_players = temp_players[1:] if len(temp_players) > 0 else []
+        others = others[1:]
 
     ally_players = []
     enemy_players = []
-    for player_data, player_team in temp_players:
-        player = _create_player_from_data(player_data)
+    for player_team, player_data in others:
+        player = _build_player(player_data, None, cache, strict)
         if player_team == main_player_team:
             ally_players.append(player)
         else:
             enemy_players.append(player)
 
-    game_data = GameData(
-        game_status=game_status,
-        main_player=main_player,
-        ally_players=ally_players,
-        enemy_players=enemy_players
-    )
-
-    update_game_data(game_data)
-
-    return game_data
-
-def _create_player_from_data(player_data: Dict[str, Any], active_player_data: Optional[Dict[str, Any]] = None) -> PlayerData:
-    scores = player_data.get("scores")
-    items_data = player_data.get("items")
-
-    if items_data:
-        item_names = [item["displayName"] for item in items_data if "displayName" in item]
-    else:
-        item_names = []
-
+    # PlayerData instances are not revalidated, only the top level fields are checked
+    return GameData.model_validate({
+        "game_status": game_data_obj.get("gameMode", "UNKNOWN"),
+        "game_time": game_data_obj.get("gameTime", 0.0),
+        "main_player": main_player,
+        "ally_players": ally_players,
+        "enemy_players": enemy_players
+    }, strict=strict)
+
+
+def _build_player(
+    player_data: Dict[str, Any],
+    active_player_data: Optional[Dict[str, Any]],
+    cache: Optional[FormatCache],
+    strict: bool = False
+) -> PlayerData:
+    values = _player_values(player_data, active_player_data)
+
+    if cache is None:
+        return PlayerData.model_validate(values, strict=strict)
+
+    key = (values["riot_id"], active_player_data is not None)
+    cached = cache.players.get(key)
+    if cached is not None and cached[0] == values:
+        cache.hits += 1
+        return cached[1]
+
+    cache.misses += 1
+    player = PlayerData.model_validate(values)
+    cache.players[key] = (values, player)
+    return player
+
+
+def _player_values(player_data: Dict[str, Any], active_player_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    scores = player_data.get("scores") or _EMPTY_DICT
+    items_data = player_data.get("items") or _EMPTY_LIST
     current_gold = active_player_data.get("currentGold", 0.0) if active_player_data else 0.0
 
     main_rune = "Unknown"
     if active_player_data:
-        full_runes = active_player_data.get("fullRunes")
-        if full_runes:
-            general_runes = full_runes.get("generalRunes")
-            if general_runes:
-                main_rune = general_runes[0].get("displayName", "Unknown")
+        general_runes = (active_player_data.get("fullRunes") or _EMPTY_DICT).get("generalRunes")
+        if general_runes:
+            main_rune = general_runes[0].get("displayName", "Unknown")
     else:
-        runes = player_data.get("runes")
-        if runes:
-            keystone = runes.get("keystone")
-            if keystone:
-                main_rune = keystone.get("displayName", "Unknown")
-
-    return PlayerData(
-        name=player_data.get("riotIdGameName", "Unknown"),
-        champion=player_data.get("championName", "Unknown"),
-        kills=scores.get("kills", 0) if scores else 0,
-        deaths=scores.get("deaths", 0) if scores else 0,
-        assists=scores.get("assists", 0) if scores else 0,
-        creep_score=scores.get("creepScore", 0) if scores else 0,
-        current_gold=current_gold,
-        current_items=item_names,
-        main_rune=main_rune
-    )
+        keystone = (player_data.get("runes") or _EMPTY_DICT).get("keystone")
+        if keystone:
+            main_rune = keystone.get("displayName", "Unknown")
+
+    return {
+        "name": player_data.get("riotIdGameName", "Unknown"),
+        "riot_id": player_data.get("riotId", ""),
+        "champion": player_data.get("championName", "Unknown"),
+        "kills": scores.get("kills", 0),
+        "deaths": scores.get("deaths", 0),
+        "assists": scores.get("assists", 0),
+        "creep_score": scores.get("creepScore", 0),
+        "current_gold": current_gold,
+        "current_items": [item["displayName"] for item in items_data if "displayName" in item],
+        "main_rune": main_rune
+    }
+
+
+def _create_player_from_data(player_data: Dict[str, Any], active_player_data: Optional[Dict[str, Any]] = None) -> PlayerData:
+    return _build_player(player_data, active_player_data, None)
+
 
 def extract_players(all_players_data: List[Dict[str, Any]], main_player_team: str) -> tuple[List[PlayerData], List[PlayerData]]:
     ally_players = []
@@ -114,6 +150,3 @@ def extract_players(all_players_data: List[Dict[str, Any]], main_player_team: st
             enemy_players.append(player)
 
     return ally_players, enemy_players
-
-def update_game_data(data: GameData) -> None:
-    memory.game_data = data
\ No newline at end of file
@@ -0,0 +1,130 @@
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import zlib
+
+from app.schemas.game_data import GameData, GameDataPayload
+from app.services.change_detection_service import ChangeDetector, ChangeEvent, game_ended
+from app.services.formatting_service import FormatCache, format_league_data
+from app.services.decode_service import decode_game_data
+
+
+# Per-session state inside a worker process, a session always lands on the same worker
+_worker_sessions: Dict[str, Tuple[FormatCache, ChangeDetector]] = {}
+
+
+def _warm_up() -> bool:
+    return True
+
+
+def _process_in_worker(
+    session_id: str,
+    data: Optional[Dict[str, Any]],
+    body: Optional[bytes],
+    strict: bool
+) -> Tuple[Dict[str, Any], List[ChangeEvent], bool]:
+    # Raw ingests send the undecoded body, so decoding moves off the event loop too
+    if data is None:
+        data = decode_game_data(body)
+
+    entry = _worker_sessions.get(session_id)
+    if entry is None:
+        entry = _worker_sessions[session_id] = (FormatCache(), ChangeDetector())
+    format_cache, change_detector = entry
+
+    game_data = format_league_data(GameDataPayload.model_construct(data=data, seq=None), cache=format_cache, strict=strict)
+    changes = change_detector.diff(game_data)
+
+    # A plain dict pickles and validates back faster than the pickled model (measured ~60 vs ~90 us)
+    return game_data.model_dump(), changes, game_ended(data)
+
+
+def _forget_in_worker(session_id: str):
+    _worker_sessions.pop(session_id, None)
+
+
+# Runs formatting and change detection for ingests in separate processes.
+# Sessions are sharded over single-process executors by a stable hash of the session id, so a
+# session's FormatCache and ChangeDetector live in one worker and its snapshots are handled
+# in the order they were submitted. The event loop only awaits the result and rebuilds the
+# GameData, everything else about the ingest (timeline, database, commentary) is unchanged.
+# With no workers (the default) ingest formats and detects inline as before.
+class IngestPool:
+    def __init__(self):
+        self._shards: List[ProcessPoolExecutor] = []
+        self.strict = False
+        self.submitted: List[int] = []
+        self.restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._shards)
+
+    async def start(self, workers: int, strict: bool = False):
+        if workers <= 0 or self._shards:
+            return
+        self.strict = strict
+        self._shards = [self._new_shard() for _ in range(workers)]
+        self.submitted = [0] * workers
+        # Spawn the processes now rather than on the first ingest
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(shard, _warm_up) for shard in self._shards))
+
+    async def stop(self):
+        shards, self._shards = self._shards, []
+        for shard in shards:
+            # Waiting for a worker to exit would block the event loop during shutdown
+            await asyncio.to_thread(shard.shutdown, wait=True, cancel_futures=True)
+
+    def _new_shard(self) -> ProcessPoolExecutor:
+        # spawn, forking a process with a running event loop and worker threads isn't safe
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+    def shard_for(self, session_id: str) -> int:
+        return zlib.crc32(session_id.encode("utf-8")) % len(self._shards)
+
+    async def process(
+        self,
+        session_id: str,
+        data: Optional[Dict[str, Any]] = None,
+        body: Optional[bytes] = None
+    ) -> Tuple[GameData, List[ChangeEvent], bool]:
+        index = self.shard_for(session_id)
+        self.submitted[index] += 1
+        loop = asyncio.get_running_loop()
+        shard = self._shards[index]
+        try:
+            values, changes, ended = await loop.run_in_executor(
+                shard, _process_in_worker, session_id, data, body, self.strict
+            )
+        except BrokenProcessPool:
+            # The worker died, its sessions start over with an empty detector on a fresh process.
+            # Concurrent ingests on the same shard all see the failure, only the first replaces it
+            if self._shards[index] is shard:
+                self.restarts += 1
+                self._shards[index] = self._new_shard()
+            values, changes, ended = await loop.run_in_executor(
+                self._shards[index], _process_in_worker, session_id, data, body, self.strict
+            )
+        return GameData.model_validate(values), changes, ended
+
+    def forget(self, session_id: str):
+        if not self._shards:
+            return
+        try:
+            self._shards[self.shard_for(session_id)].submit(_forget_in_worker, session_id)
+        except (BrokenProcessPool, RuntimeError):
+            # A dead worker took its sessions' state with it, the next process call replaces it
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._shards),
+            "submitted": list(self.submitted),
+            "restarts": self.restarts,
+        }
+
+
+ingest_pool = IngestPool()
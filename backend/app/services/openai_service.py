@@ -1,53 +1,112 @@
-from typing import List
-import os
-from app.core.config import Settings
-import app.core.memory_data as memory
-from openai import AsyncOpenAI
+from typing import List, Optional, Tuple, AsyncIterator
+import time
+from app.core.auth import get_settings
+from app.core.metrics import metrics
+from app.core.profiling import record_timing, timed
+from app.schemas.game_data import GameData
+from app.services.response_cache import ResponseCache, PromptNames, event_signature
+from app.services.audio_cache import AudioCache, audio_key
+from app.services.providers import get_llm_provider, get_speech_provider
+
+# The LLM and speech clients live behind app.services.providers and are created on first use
+settings = get_settings()
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_SIZE,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    disk_path=settings.RESPONSE_CACHE_PATH
+)
 
-settings = Settings()
+# With names, cached responses are stored as templates without player names (see PromptNames)
+async def run_agent_prompt(prompt: str, cache_key: Optional[str] = None, names: Optional[PromptNames] = None) -> str:
+    if (prompt is None or prompt == ""):
+        return "I am at a lost for words. You just suck."
 
-openai_api_key = settings.OPENAI_API_KEY
-openai_model = settings.OPENAI_MODEL
+    if cache_key is not None and settings.RESPONSE_CACHE_ENABLED:
+        cached = await response_cache.aget(cache_key)
+        if cached is not None and names is not None:
+            cached = names.fill(cached)
+        if cached is not None:
+            metrics.llm_requests.inc("cache_hit")
+            return cached
+
+    start = time.perf_counter()
+    try:
+        result = await get_llm_provider().complete(prompt)
+    except Exception:
+        metrics.llm_requests.inc("error")
+        raise
+    elapsed = time.perf_counter() - start
+    metrics.llm_seconds.observe(elapsed)
+    record_timing("llm", elapsed)
+    metrics.llm_requests.inc("ok")
+    metrics.llm_tokens.inc("input", amount=result.input_tokens)
+    metrics.llm_tokens.inc("output", amount=result.output_tokens)
 
-os.environ["OPENAI_API_KEY"] = openai_api_key
+    if cache_key is not None and settings.RESPONSE_CACHE_ENABLED and result.text:
+        template = names.to_template(result.text) if names is not None else result.text
+        if template is not None:
+            await response_cache.aput(cache_key, template)
 
-from agents import Agent, Runner
+    return result.text
 
-openai_client = AsyncOpenAI(api_key=openai_api_key)
 
-league_game_agent = Agent(
-    name="League of Legends Game Agent",
-    instructions=
-        "You are a game stats agent for League of Legends that is very mean, and you will be given live game stats data of a match. " \
-        "Go out of your way to roast and criticize the player whenever you get the chance to, but still give good advice. Use your given tools when appropriate. " \
-        "Keep your responses concise and punchy - 2-3 sentences max. Focus on the most important aspects of what just happened.",
-    model=openai_model,
+audio_cache = AudioCache(
+    max_memory_bytes=settings.TTS_CACHE_MAX_MEMORY_BYTES,
+    disk_dir=settings.TTS_CACHE_DIR,
+    max_disk_bytes=settings.TTS_CACHE_MAX_DISK_BYTES
 )
 
-async def run_agent_prompt(prompt: str) -> str:
-    if (prompt is None or prompt == ""):
-        return "I am at a lost for words. You just suck."
-
-    result = await Runner.run(league_game_agent, prompt)
-    return result.final_output
+def speech_key(text: str, voice: str = "onyx") -> str:
+    return audio_key(text, voice, settings.TTS_MODEL)
 
 
 async def text_to_speech(text: str, voice: str = "onyx") -> bytes:
+    start = time.perf_counter()
     try:
-        response = await openai_client.audio.speech.create(
-            model="tts-1",
-            voice=voice,
-            input=text,
-            response_format="mp3"
-        )
+        audio = await get_speech_provider().synthesize(text, voice)
 
-        return response.content
+        elapsed = time.perf_counter() - start
+        metrics.tts_seconds.observe(elapsed, "buffered")
+        record_timing("tts", elapsed)
+        metrics.tts_requests.inc("buffered", "ok")
+        return audio
     except Exception as e:
+        metrics.tts_requests.inc("buffered", "error")
         print(f"Error generating speech: {e}")
         raise
 
 
-async def handle_game_changes(changes: List) -> None:
+# Yields audio chunks as they arrive from the speech API instead of buffering the whole file
+async def stream_text_to_speech(text: str, voice: str = "onyx", chunk_size: int = 4096) -> AsyncIterator[bytes]:
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        async for chunk in get_speech_provider().stream(text, voice, chunk_size):
+            yield chunk
+        outcome = "ok"
+        metrics.tts_seconds.observe(time.perf_counter() - start, "stream")
+    finally:
+        # Also counts streams the client walked away from as errors
+        metrics.tts_requests.inc("stream", outcome)
+
+
+# Same as text_to_speech, but repeated (text, voice, model) combinations are served from the audio cache
+async def cached_text_to_speech(text: str, voice: str = "onyx") -> Tuple[str, bytes]:
+    key = speech_key(text, voice)
+
+    audio = await audio_cache.aget(key)
+    if audio is None:
+        audio = await text_to_speech(text, voice)
+        await audio_cache.aput(key, audio)
+    else:
+        metrics.tts_requests.inc("buffered", "cache_hit")
+
+    return key, audio
+
+
+async def handle_game_changes(changes: List, game_data: GameData) -> None:
     from app.services.change_detection_service import ChangeEvent, ChangeType
 
     if not changes:
@@ -70,22 +129,25 @@ async def handle_game_changes(changes: List) -> None:
     if not significant_changes:
         return
 
-    prompts = [change.to_prompt() for change in significant_changes]
-    combined_prompt = "\n".join(prompts)
-
-    full_prompt = (
-        f"The following events just happened in the game:\n\n"
-        f"{combined_prompt}\n\n"
-        f"Give a brief, snarky commentary on what just happened. Prioritizing on suggesting item builds for the active player and their champion:\n\n"
-        f"Active Player's Username: {memory.game_data.main_player.name}\n\n"
-        f"Active Player's Champion: {memory.game_data.main_player.champion}\n\n"
-        f"Current Items: {memory.game_data.main_player.current_items}"
-        f"Enemy Champions: {[enemy.name for enemy in memory.game_data.enemy_players]}"
-        f"Be mean but helpful. Keep it short and punchy."
-    )
+    with timed("prompt"):
+        prompts = [change.to_prompt() for change in significant_changes]
+        combined_prompt = "\n".join(prompts)
+
+        full_prompt = (
+            f"The following events just happened in the game:\n\n"
+            f"{combined_prompt}\n\n"
+            f"Give a brief, snarky commentary on what just happened. Prioritizing on suggesting item builds for the active player and their champion:\n\n"
+            f"Active Player's Username: {game_data.main_player.name}\n\n"
+            f"Active Player's Champion: {game_data.main_player.champion}\n\n"
+            f"Current Items: {game_data.main_player.current_items}"
+            f"Enemy Champions: {[enemy.name for enemy in game_data.enemy_players]}"
+            f"Be mean but helpful. Keep it short and punchy."
+        )
+        cache_key = event_signature(significant_changes, game_data)
+        names = PromptNames(significant_changes, game_data)
 
     try:
-        response = await run_agent_prompt(full_prompt)
+        response = await run_agent_prompt(full_prompt, cache_key=cache_key, names=names)
 
         print(f"\n{'='*60}")
         print(f"AI AGENT RESPONSE:")
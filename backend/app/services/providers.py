@@ -0,0 +1,151 @@
+from typing import AsyncIterator, Optional, Protocol
+from dataclasses import dataclass
+import threading
+
+from app.core.config import Settings
+from app.core.auth import get_settings
+
+
+AGENT_INSTRUCTIONS = (
+    "You are a game stats agent for League of Legends that is very mean, and you will be given live game stats data of a match. "
+    "Go out of your way to roast and criticize the player whenever you get the chance to, but still give good advice. Use your given tools when appropriate. "
+    "Keep your responses concise and punchy - 2-3 sentences max. Focus on the most important aspects of what just happened."
+)
+
+
+class ProviderError(Exception):
+    pass
+
+
+@dataclass
+class Completion:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class LLMProvider(Protocol):
+    async def complete(self, prompt: str) -> Completion: ...
+
+
+class SpeechProvider(Protocol):
+    async def synthesize(self, text: str, voice: str) -> bytes: ...
+
+    def stream(self, text: str, voice: str, chunk_size: int) -> AsyncIterator[bytes]: ...
+
+
+# LLM commentary through the Agents SDK and speech through the OpenAI API.
+# Nothing is imported or built until the first call: the openai and agents packages take
+# seconds to import, and without OPENAI_API_KEY the app still starts, only these calls fail.
+# OPENAI_BASE_URL points both at a compatible server (e.g. a local fake).
+class OpenAIProvider:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._client = None
+        self._agent = None
+        self._runner = None
+        self._warming = False
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.settings.OPENAI_API_KEY:
+                        raise ProviderError("OPENAI_API_KEY is not set")
+                    from openai import AsyncOpenAI
+                    self._client = AsyncOpenAI(
+                        api_key=self.settings.OPENAI_API_KEY,
+                        base_url=self.settings.OPENAI_BASE_URL or None
+                    )
+        return self._client
+
+    def _load_agent(self):
+        if self._agent is None:
+            client = self.client
+            with self._lock:
+                if self._agent is None:
+                    from agents import Agent, Runner, set_default_openai_client
+                    set_default_openai_client(client)
+                    self._runner = Runner
+                    self._agent = Agent(
+                        name="League of Legends Game Agent",
+                        instructions=AGENT_INSTRUCTIONS,
+                        model=self.settings.OPENAI_MODEL,
+                    )
+        return self._agent
+
+    # Imports the SDKs ahead of the first call, on a background thread
+    def warm_up(self):
+        if self._warming or self._agent is not None or not self.settings.OPENAI_API_KEY:
+            return
+        self._warming = True
+
+        def load():
+            try:
+                self._load_agent()
+            except Exception as e:
+                print(f"Error warming up the OpenAI provider: {e}")
+
+        threading.Thread(target=load, name="provider-warm-up", daemon=True).start()
+
+    async def complete(self, prompt: str) -> Completion:
+        agent = self._load_agent()
+        result = await self._runner.run(agent, prompt)
+        usage = result.context_wrapper.usage
+        return Completion(result.final_output, usage.input_tokens, usage.output_tokens)
+
+    async def synthesize(self, text: str, voice: str) -> bytes:
+        response = await self.client.audio.speech.create(
+            model=self.settings.TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format="mp3"
+        )
+        return response.content
+
+    # Yields audio chunks as they arrive from the speech API instead of buffering the whole file
+    async def stream(self, text: str, voice: str, chunk_size: int = 4096) -> AsyncIterator[bytes]:
+        async with self.client.audio.speech.with_streaming_response.create(
+            model=self.settings.TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format="mp3"
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size):
+                yield chunk
+
+
+_llm_provider: Optional[LLMProvider] = None
+_speech_provider: Optional[SpeechProvider] = None
+_default_provider: Optional[OpenAIProvider] = None
+
+
+def _default() -> OpenAIProvider:
+    global _default_provider
+    if _default_provider is None:
+        _default_provider = OpenAIProvider(get_settings())
+    return _default_provider
+
+
+def get_llm_provider() -> LLMProvider:
+    return _llm_provider if _llm_provider is not None else _default()
+
+
+def get_speech_provider() -> SpeechProvider:
+    return _speech_provider if _speech_provider is not None else _default()
+
+
+# Replaces the providers, e.g. with another backend or a stand-in for benchmarks
+def set_providers(llm: Optional[LLMProvider] = None, speech: Optional[SpeechProvider] = None):
+    global _llm_provider, _speech_provider
+    _llm_provider = llm
+    _speech_provider = speech
+
+
+def warm_up_providers():
+    for provider in (get_llm_provider(), get_speech_provider()):
+        warm_up = getattr(provider, "warm_up", None)
+        if warm_up is not None:
+            warm_up()
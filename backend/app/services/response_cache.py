@@ -0,0 +1,260 @@
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+
+from app.services.change_detection_service import ChangeEvent, ChangeType
+from app.schemas.game_data import GameData
+
+
+# Bucket sizes used to normalize stats, so near-identical situations share a cache entry
+GOLD_BUCKET = 500
+CS_BUCKET = 25
+SCORE_BUCKET = 3
+SCORE_CAP = 10
+
+
+def _bucket(value: Any, size: int) -> int:
+    try:
+        return int(value // size)
+    except TypeError:
+        return 0
+
+
+def _score_bucket(value: Any) -> int:
+    return _bucket(min(value, SCORE_CAP), SCORE_BUCKET)
+
+
+def _event_signature(change: ChangeEvent) -> Tuple:
+    context = change.context
+    champion = context.get("champion", change.player_name)
+
+    if change.change_type in (ChangeType.KILL, ChangeType.DEATH, ChangeType.ASSIST):
+        value = min(change.new_value, SCORE_CAP)
+    elif change.change_type == ChangeType.ITEM_PURCHASE:
+        value = tuple(sorted(set(change.new_value) - set(change.old_value)))
+    elif change.change_type in (ChangeType.GOLD_MILESTONE, ChangeType.CS_MILESTONE):
+        value = change.new_value
+    else:
+        value = str(change.new_value)
+
+    return (
+        change.change_type.value,
+        champion,
+        bool(context.get("is_main_player", False)),
+        value,
+        _score_bucket(context.get("kills", 0)),
+        _score_bucket(context.get("deaths", 0)),
+        _score_bucket(context.get("assists", 0)),
+        _bucket(context.get("cs", 0), CS_BUCKET),
+        _bucket(context.get("gold", 0), GOLD_BUCKET),
+    )
+
+
+# No player names and no item lists, so the same situation hits across games
+def event_signature(changes: List[ChangeEvent], game_data: GameData) -> str:
+    signature = (
+        game_data.main_player.champion,
+        tuple(sorted(_event_signature(change) for change in changes)),
+    )
+    return hashlib.sha256(repr(signature).encode("utf-8")).hexdigest()
+
+
+_PLACEHOLDER = re.compile(r"\{\{player:([^{}]+)\}\}")
+
+
+# Names are not in the key, so they must not be in the cached text either: before storing,
+# every player name is swapped for a placeholder of the player's champion, and on a hit the
+# placeholders are filled with this game's names. Only champions that are part of the key
+# (the main player's and the events') can be filled in later; a response naming anyone else
+# is not cached.
+class PromptNames:
+    def __init__(self, changes: List[ChangeEvent], game_data: GameData):
+        main_player = game_data.main_player
+        players = (main_player, *game_data.ally_players, *game_data.enemy_players)
+        self.champions = {player.name: player.champion for player in players if player.name}
+        # One pass over all names, longest first so a name containing another is replaced whole
+        names = sorted(self.champions, key=len, reverse=True)
+        self.pattern = re.compile(
+            "|".join(rf"(?<!\w){re.escape(name)}(?!\w)" for name in names)
+        ) if names else None
+        # champion -> name, None when two keyed players share a champion
+        self.keyed: Dict[str, Optional[str]] = {}
+        for champion, name in [(main_player.champion, main_player.name)] + [
+            (change.context.get("champion", ""), change.player_name) for change in changes
+        ]:
+            if champion:
+                self.keyed[champion] = name if self.keyed.get(champion, name) == name else None
+
+    def to_template(self, text: str) -> Optional[str]:
+        if self.pattern is None:
+            return text
+        unkeyed = False
+
+        def placeholder(match: re.Match) -> str:
+            nonlocal unkeyed
+            champion = self.champions[match.group(0)]
+            if self.keyed.get(champion) != match.group(0):
+                unkeyed = True
+            return f"{{{{player:{champion}}}}}"
+
+        template = self.pattern.sub(placeholder, text)
+        return None if unkeyed else template
+
+    def fill(self, template: str) -> Optional[str]:
+        missing = False
+
+        def name(match: re.Match) -> str:
+            nonlocal missing
+            found = self.keyed.get(match.group(1))
+            if found is None:
+                missing = True
+                return ""
+            return found
+
+        text = _PLACEHOLDER.sub(name, template)
+        return None if missing else text
+
+
+# Two tier cache for agent responses: an LRU + TTL in-memory tier capped by entry count
+# and bytes, and an optional SQLite tier on disk that survives restarts.
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        max_bytes: int = 4 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 50000
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+
+        # key -> (value, stored_at wall clock, size in bytes)
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at, size = entry
+            if time.time() - stored_at <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._remove(key)
+            self.expirations += 1
+        return None
+
+    def put(self, key: str, value: str, stored_at: Optional[float] = None):
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, stored_at if stored_at is not None else time.time(), size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def aget(self, key: str) -> Optional[str]:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        if self.disk_path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                value, stored_at = row
+                self.put(key, value, stored_at)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def aput(self, key: str, value: str):
+        stored_at = time.time()
+        self.put(key, value, stored_at)
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_put, key, value, stored_at)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_enabled": bool(self.disk_path),
+        }
+
+    def _remove(self, key: str):
+        value, stored_at, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._disk is None:
+            self._disk = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._disk.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+            self._disk.commit()
+        return self._disk
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._disk_lock:
+            row = self._connect().execute(
+                "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return row[0], row[1]
+
+    def _disk_put(self, key: str, value: str, stored_at: float):
+        with self._disk_lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, stored_at)
+            )
+            connection.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+            connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+            connection.commit()
@@ -0,0 +1,176 @@
+from typing import Optional, Dict, Any, List, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+
+from app.schemas.game_data import GameData
+from app.schemas.player_data import PlayerData
+
+# Per-player stat columns and their array typecodes
+STAT_COLUMNS = {
+    "kills": "H",
+    "deaths": "H",
+    "assists": "H",
+    "cs": "H",
+    "gold": "f",
+    "item_set": "H",
+}
+
+
+# Columnar per-game history of every tick's numeric player stats.
+# Each column is a flat array laid out tick-major (tick * players + slot), so a
+# 40 minute game costs a few hundred KB instead of thousands of pydantic objects.
+# Once more than max_ticks are stored, the older half is thinned to every other
+# tick, so old history keeps getting coarser while recent ticks stay at full resolution.
+class GameTimeline:
+    def __init__(self, players: int = 10, max_ticks: int = 600):
+        self.players = players
+        self.max_ticks = max_ticks
+
+        self.times = array("d")
+        self.columns: Dict[str, array] = {name: array(code) for name, code in STAT_COLUMNS.items()}
+
+        self._slots: Dict[str, int] = {}
+        self.slot_players: List[str] = []
+        self.slot_champions: List[str] = []
+
+        self._item_set_ids: Dict[Tuple[str, ...], int] = {(): 0}
+        self.item_sets: List[Tuple[str, ...]] = [()]
+
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _slot(self, player: PlayerData) -> Optional[int]:
+        key = player.riot_id or player.name
+        slot = self._slots.get(key)
+        if slot is None:
+            if len(self.slot_players) >= self.players:
+                return None
+            slot = len(self.slot_players)
+            self._slots[key] = slot
+            self.slot_players.append(player.name)
+            self.slot_champions.append(player.champion)
+        return slot
+
+    def _item_set_id(self, items: List[str]) -> int:
+        key = tuple(sorted(items))
+        item_set_id = self._item_set_ids.get(key)
+        if item_set_id is None:
+            item_set_id = len(self.item_sets)
+            self._item_set_ids[key] = item_set_id
+            self.item_sets.append(key)
+        return item_set_id
+
+    def record(self, game_data: GameData, game_time: Optional[float] = None):
+        # Loading screen or a transient empty response: no players and a game time of 0
+        if not game_data.ally_players and not game_data.enemy_players and game_data.game_status == "UNKNOWN":
+            return
+
+        game_time = game_data.game_time if game_time is None else game_time
+
+        if self.times:
+            if game_time < self.times[-1]:
+                # Clock went backwards, a new game started without a GameEnd in between
+                self.clear()
+            elif game_time == self.times[-1]:
+                self._pop_last()
+
+        players = self.players
+        start = len(self.times) * players
+        columns = self.columns
+
+        # Players missing from this tick keep their previous values
+        for column in columns.values():
+            if start:
+                column.extend(column[start - players:start])
+            else:
+                column.extend([0] * players)
+        self.times.append(game_time)
+
+        kills, deaths, assists = columns["kills"], columns["deaths"], columns["assists"]
+        cs, gold, item_set = columns["cs"], columns["gold"], columns["item_set"]
+
+        for player in (game_data.main_player, *game_data.ally_players, *game_data.enemy_players):
+            slot = self._slot(player)
+            if slot is None:
+                continue
+            index = start + slot
+            kills[index] = player.kills
+            deaths[index] = player.deaths
+            assists[index] = player.assists
+            cs[index] = player.creep_score
+            gold[index] = player.current_gold
+            item_set[index] = self._item_set_id(player.current_items)
+
+        if len(self.times) > self.max_ticks:
+            self._compact()
+
+    def _pop_last(self):
+        del self.times[-1]
+        for column in self.columns.values():
+            del column[-self.players:]
+
+    def _compact(self):
+        # Keep every other tick from the older half
+        half = len(self.times) // 2
+        players = self.players
+        keep = range(0, half, 2)
+
+        times = array("d", (self.times[t] for t in keep))
+        times.extend(self.times[half:])
+        self.times = times
+
+        for name, column in self.columns.items():
+            compacted = array(column.typecode)
+            for t in keep:
+                compacted.extend(column[t * players:(t + 1) * players])
+            compacted.extend(column[half * players:])
+            self.columns[name] = compacted
+
+        self.compactions += 1
+
+    def clear(self):
+        self.times = array("d")
+        self.columns = {name: array(code) for name, code in STAT_COLUMNS.items()}
+        self._slots.clear()
+        self.slot_players.clear()
+        self.slot_champions.clear()
+        self._item_set_ids = {(): 0}
+        self.item_sets = [()]
+
+    def nbytes(self) -> int:
+        total = self.times.itemsize * len(self.times)
+        for column in self.columns.values():
+            total += column.itemsize * len(column)
+        return total
+
+    def _slice(self, start: int, end: int) -> Dict[str, Any]:
+        players = self.players
+        return {
+            "players": list(self.slot_players),
+            "champions": list(self.slot_champions),
+            "times": self.times[start:end].tolist(),
+            "columns": {
+                name: [column[t * players:(t + 1) * players].tolist() for t in range(start, end)]
+                for name, column in self.columns.items()
+            },
+        }
+
+    def last(self, count: int) -> Dict[str, Any]:
+        end = len(self.times)
+        return self._slice(max(0, end - count), end)
+
+    def range(self, start_time: float, end_time: float) -> Dict[str, Any]:
+        return self._slice(bisect_left(self.times, start_time), bisect_right(self.times, end_time))
+
+    def series(self, player_name: str, stat: str, count: Optional[int] = None) -> List[float]:
+        # One stat for one player, e.g. the main player's CS over the last 30 ticks
+        slot = self.slot_players.index(player_name)
+        column = self.columns[stat]
+        end = len(self.times)
+        start = 0 if count is None else max(0, end - count)
+        return column[start * self.players + slot:end * self.players:self.players].tolist()
+
+    def item_names(self, item_set_id: int) -> Tuple[str, ...]:
+        return self.item_sets[item_set_id]
@@ -0,0 +1,101 @@
+from typing import Optional, Dict, Any, List, AsyncIterator
+from dataclasses import dataclass, asdict
+from collections import deque
+import time
+
+from app.core.metrics import metrics
+from app.services.openai_service import stream_text_to_speech, speech_key, audio_cache
+
+
+@dataclass
+class SpeechTiming:
+    key: str
+    cached: bool
+    ttfb_ms: float
+    total_ms: float
+    bytes: int
+    completed: bool
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+# Keeps the most recent streaming TTS timings for the stats endpoint
+class SpeechTimingRecorder:
+    def __init__(self, max_records: int = 500):
+        self.records: "deque[SpeechTiming]" = deque(maxlen=max_records)
+        self.requests = 0
+
+    def record(self, timing: SpeechTiming):
+        self.requests += 1
+        self.records.append(timing)
+
+    def stats(self) -> Dict[str, Any]:
+        streamed = [r for r in self.records if not r.cached and r.completed]
+        ttfb = [r.ttfb_ms for r in streamed]
+        total = [r.total_ms for r in streamed]
+        return {
+            "requests": self.requests,
+            "cached": sum(1 for r in self.records if r.cached),
+            "ttfb_ms": {"p50": _percentile(ttfb, 50), "p95": _percentile(ttfb, 95), "max": max(ttfb, default=0.0)},
+            "total_ms": {"p50": _percentile(total, 50), "p95": _percentile(total, 95), "max": max(total, default=0.0)},
+            "recent": [asdict(r) for r in list(self.records)[-10:]],
+        }
+
+
+speech_timings = SpeechTimingRecorder()
+
+
+# Streams speech to the client while it is being synthesized, records time-to-first-byte
+# and total duration, and stores the finished audio in the audio cache.
+# Cached audio is still sent in chunks so clients see the same transfer shape.
+async def stream_speech(
+    text: str,
+    voice: str = "onyx",
+    started_at: Optional[float] = None,
+    chunk_size: int = 4096
+) -> AsyncIterator[bytes]:
+    started_at = started_at if started_at is not None else time.perf_counter()
+    key = speech_key(text, voice)
+
+    first_byte_at: Optional[float] = None
+    sent = 0
+    completed = False
+
+    cached_audio = await audio_cache.aget(key)
+    chunks: List[bytes] = []
+
+    try:
+        if cached_audio is not None:
+            metrics.tts_requests.inc("stream", "cache_hit")
+            for offset in range(0, len(cached_audio), chunk_size):
+                chunk = cached_audio[offset:offset + chunk_size]
+                if first_byte_at is None:
+                    first_byte_at = time.perf_counter()
+                sent += len(chunk)
+                yield chunk
+        else:
+            async for chunk in stream_text_to_speech(text, voice, chunk_size):
+                if not chunk:
+                    continue
+                if first_byte_at is None:
+                    first_byte_at = time.perf_counter()
+                chunks.append(chunk)
+                sent += len(chunk)
+                yield chunk
+            await audio_cache.aput(key, b"".join(chunks))
+        completed = True
+    finally:
+        finished_at = time.perf_counter()
+        speech_timings.record(SpeechTiming(
+            key=key,
+            cached=cached_audio is not None,
+            ttfb_ms=((first_byte_at or finished_at) - started_at) * 1000,
+            total_ms=(finished_at - started_at) * 1000,
+            bytes=sent,
+            completed=completed
+        ))
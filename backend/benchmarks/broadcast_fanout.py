@@ -0,0 +1,124 @@
+"""
+Commentary broadcast latency over real websockets with 1, 10 and 100 subscribers.
+
+The backend runs in-process on a local port, every subscriber is a websocket client
+on /ws/commentary, and messages are published straight into the session broadcaster.
+A few subscribers that never read can be added to show a slow consumer does not
+stall the others.
+
+Run from the backend directory:
+    python -m benchmarks.broadcast_fanout --subscribers 1 10 100 --slow 1
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import configure_env, percentile, auth_headers
+from benchmarks.fake_openai_server import free_port
+
+configure_env()
+
+import httpx
+import uvicorn
+import websockets
+
+from app.main import app
+from app.core.auth import get_settings
+from app.services.broadcast_service import broadcast_hub, commentary_message
+
+
+async def consume(url: str, expected: int, latencies: list, ready: asyncio.Event, connected: list, target: int):
+    async with websockets.connect(url, max_size=None) as socket:
+        await socket.recv()  # subscribed
+        connected.append(socket)
+        if len(connected) >= target:
+            ready.set()
+        received = 0
+        while received < expected:
+            message = json.loads(await socket.recv())
+            latencies.append((time.perf_counter() - message["bench_sent"]) * 1000)
+            received += 1
+
+
+async def run_level(base_url: str, ws_url: str, token: str, subscribers: int, slow: int, messages: int, interval: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post("/api/connection/establish", json={"username": "bench"}, headers=auth_headers(token))
+        session_id = response.json()["session_id"]
+
+    url = f"{ws_url}/ws/commentary?token={token}&session_id={session_id}"
+    latencies: list = []
+    ready = asyncio.Event()
+    target = subscribers + slow
+    connected: list = []
+
+    consumers = [asyncio.create_task(consume(url, messages, latencies, ready, connected, target)) for _ in range(subscribers)]
+    slow_sockets = []
+    for _ in range(slow):
+        socket = await websockets.connect(url, max_size=None)
+        await socket.recv()
+        slow_sockets.append(socket)
+        connected.append(socket)
+    if len(connected) >= target:
+        ready.set()
+    await ready.wait()
+
+    broadcaster = broadcast_hub.get(session_id)
+    publish_cost = []
+    for i in range(messages):
+        message = commentary_message(session_id, f"You died again. Message {i}. " * 4, ["death"])
+        message["bench_sent"] = time.perf_counter()
+        start = time.perf_counter()
+        broadcaster.publish(message)
+        publish_cost.append((time.perf_counter() - start) * 1e6)
+        await asyncio.sleep(interval)
+
+    await asyncio.wait_for(asyncio.gather(*consumers), timeout=60)
+    for socket in slow_sockets:
+        await socket.close()
+    broadcast_hub.remove(session_id)
+
+    return {
+        "subscribers": subscribers,
+        "slow_subscribers": slow,
+        "messages": messages,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": max(latencies, default=0.0),
+        "publish_us": percentile(publish_cost, 50),
+    }
+
+
+async def main_async(args):
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_queue=64))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    token = get_settings().SECRET_TOKEN
+    print(f"{'subs':>5} {'slow':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'publish us':>11}")
+    for level in args.subscribers:
+        result = await run_level(
+            f"http://127.0.0.1:{port}", f"ws://127.0.0.1:{port}", token,
+            level, args.slow, args.messages, args.interval_ms / 1000
+        )
+        print(f"{result['subscribers']:>5} {result['slow_subscribers']:>5} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['max_ms']:>8.2f} {result['publish_us']:>11.1f}")
+
+    server.should_exit = True
+    await server_task
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--slow", type=int, default=1)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import importlib.util
+import json
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SAMPLE_LIVE_DATA = BACKEND_DIR / "sample_live_data.json"
+FRONTEND_APP_DIR = BACKEND_DIR.parent / "frontend" / "app"
+
+BENCH_TOKEN = "bench-token"
+
+
+def configure_env():
+    # Benchmarks run in-process without a .env file, so fill in dummy settings
+    os.environ.setdefault("SECRET_TOKEN", BENCH_TOKEN)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("DISCORD_BOT_TOKEN", "bench")
+    os.environ.setdefault("DISCORD_CHANNEL_ID", "bench")
+    # Keep benchmark runs from writing a database next to the code
+    os.environ.setdefault("DATABASE_PATH", "")
+
+
+def load_sample() -> Dict[str, Any]:
+    with open(SAMPLE_LIVE_DATA, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def auth_headers(token: str, session_id: str = "") -> Dict[str, str]:
+    headers = {"Authorization": f"Bearer {token}"}
+    if session_id:
+        headers["X-Session-ID"] = session_id
+    return headers
+
+
+# A module of the connector (frontend/app), so benchmarks send exactly what it sends.
+# Loaded by path: the connector imports its modules by bare name, it isn't a package here
+def load_frontend_module(name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(f"connector_{name}", FRONTEND_APP_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
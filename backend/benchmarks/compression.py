@@ -0,0 +1,87 @@
+"""
+Bytes on the wire and CPU cost per ingest for each body codec, over a synthetic game:
+client-side compress time, server-side decompress time (RequestDecompressionMiddleware's
+decoder) and average body size, for full snapshots and for delta patches.
+
+Run from the backend directory:
+    python -m benchmarks.compression --minutes 10
+"""
+import argparse
+import gzip
+import json
+import time
+import zlib
+
+from benchmarks.fixtures import SyntheticGame
+from app.core.compression import decompress_body, zstandard
+from benchmarks.common import load_frontend_module
+
+# The connector's own patch encoder
+make_patch = load_frontend_module("delta").make_patch
+
+MAX_BODY = 8 * 1024 * 1024
+
+
+def codecs():
+    result = {
+        "identity": (lambda body: body, None),
+        "gzip-1": (lambda body: gzip.compress(body, compresslevel=1), "gzip"),
+        "gzip-6": (lambda body: gzip.compress(body, compresslevel=6), "gzip"),
+        "deflate-6": (lambda body: zlib.compress(body, 6), "deflate"),
+    }
+    if zstandard is not None:
+        for level in (1, 3, 9):
+            compressor = zstandard.ZstdCompressor(level=level)
+            result[f"zstd-{level}"] = (compressor.compress, "zstd")
+    return result
+
+
+def measure(bodies, compress, encoding):
+    wire = 0
+    compress_seconds = decompress_seconds = 0.0
+    for body in bodies:
+        start = time.process_time()
+        compressed = compress(body)
+        compress_seconds += time.process_time() - start
+        wire += len(compressed)
+
+        if encoding is not None:
+            start = time.process_time()
+            decompress_body(encoding, compressed, MAX_BODY)
+            decompress_seconds += time.process_time() - start
+
+    count = len(bodies)
+    raw = sum(len(body) for body in bodies)
+    return wire / count, raw / wire, compress_seconds / count * 1e6, decompress_seconds / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--warmup-minutes", type=float, default=15)
+    args = parser.parse_args()
+
+    game = SyntheticGame(seed=3)
+    game.advance(int(args.warmup_minutes * 60 / game.tick_seconds))
+    previous = game.snapshot()
+
+    full_bodies = []
+    delta_bodies = []
+    ticks = int(args.minutes * 60 / game.tick_seconds)
+    for seq, snapshot in enumerate(game.ticks(ticks), start=1):
+        full_bodies.append(json.dumps({"data": snapshot, "seq": seq}, separators=(",", ":")).encode())
+        delta_bodies.append(json.dumps(
+            {"base_seq": seq - 1, "seq": seq, "patch": make_patch(previous, snapshot)}, separators=(",", ":")
+        ).encode())
+        previous = snapshot
+
+    for label, bodies in (("full snapshot", full_bodies), ("delta patch", delta_bodies)):
+        print(f"\n{label}: {len(bodies)} ingests")
+        print(f"{'codec':>10} {'bytes/ingest':>13} {'ratio':>7} {'compress':>11} {'decompress':>11}")
+        for name, (compress, encoding) in codecs().items():
+            wire, ratio, compress_us, decompress_us = measure(bodies, compress, encoding)
+            print(f"{name:>10} {wire:>13.0f} {ratio:>6.1f}x {compress_us:>9.1f}us {decompress_us:>9.1f}us")
+
+
+if __name__ == "__main__":
+    main()
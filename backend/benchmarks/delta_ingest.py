@@ -0,0 +1,61 @@
+"""
+Upload size and backend decode cost of full vs delta ingests over a synthetic game.
+
+Run from the backend directory:
+    python -m benchmarks.delta_ingest --minutes 20
+"""
+import argparse
+import copy
+import json
+import time
+
+from benchmarks.fixtures import SyntheticGame
+from app.services.delta_service import apply_patch
+from benchmarks.common import load_frontend_module
+
+# The connector's own patch encoder
+make_patch = load_frontend_module("delta").make_patch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=20)
+    parser.add_argument("--warmup-minutes", type=float, default=10)
+    args = parser.parse_args()
+
+    game = SyntheticGame(seed=1)
+    game.advance(int(args.warmup_minutes * 60 / game.tick_seconds))
+    previous = game.snapshot()
+    server_copy = copy.deepcopy(previous)
+
+    ticks = int(args.minutes * 60 / game.tick_seconds)
+    full_bytes = delta_bytes = 0
+    full_seconds = delta_seconds = 0.0
+
+    for seq, snapshot in enumerate(game.ticks(ticks), start=1):
+        full_body = json.dumps({"data": snapshot, "seq": seq}).encode()
+        delta_body = json.dumps({"base_seq": seq - 1, "seq": seq, "patch": make_patch(previous, snapshot)}).encode()
+        full_bytes += len(full_body)
+        delta_bytes += len(delta_body)
+
+        start = time.perf_counter()
+        json.loads(full_body)
+        full_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        server_copy = apply_patch(server_copy, json.loads(delta_body)["patch"])
+        delta_seconds += time.perf_counter() - start
+
+        previous = snapshot
+
+    assert server_copy == previous, "patched snapshot diverged from the client snapshot"
+
+    print(f"ticks:                 {ticks}")
+    print(f"full bytes/tick:       {full_bytes / ticks:,.0f}")
+    print(f"delta bytes/tick:      {delta_bytes / ticks:,.0f} ({full_bytes / max(delta_bytes, 1):.1f}x smaller)")
+    print(f"full decode us/tick:   {full_seconds / ticks * 1e6:,.1f}")
+    print(f"delta decode+apply us: {delta_seconds / ticks * 1e6:,.1f} ({full_seconds / max(delta_seconds, 1e-9):.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+ChangeDetector.detect_changes cost per tick over a synthetic 10-player game.
+
+The game is formatted up front so only change detection is timed. Quiet ticks,
+regular ticks and teamfight ticks are reported separately.
+
+Run from the backend directory:
+    python -m benchmarks.detect_changes --minutes 30 --repeat 5
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.fixtures import SyntheticGame
+from app.schemas.game_data import GameDataPayload
+from app.services.formatting_service import format_league_data
+from app.services.change_detection_service import ChangeDetector
+
+
+def build_ticks(minutes: float, seed: int):
+    game = SyntheticGame(seed=seed)
+    ticks = []
+    total = int(minutes * 60 / game.tick_seconds)
+    for i in range(total):
+        if i and i % 150 == 0:
+            game.teamfight()
+        game.advance()
+        ticks.append(format_league_data(GameDataPayload(data=game.snapshot())))
+    return ticks
+
+
+async def run(ticks, repeat: int):
+    best = None
+    events = 0
+    for _ in range(repeat):
+        detector = ChangeDetector()
+        await detector.detect_changes(ticks[0])
+        events = 0
+        start = time.perf_counter()
+        for game_data in ticks[1:]:
+            events += len(await detector.detect_changes(game_data))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ticks = build_ticks(args.minutes, args.seed)
+    # An unchanged tick is the common case between fights and shop visits
+    quiet = [ticks[0]] * len(ticks)
+
+    for label, series in (("game", ticks), ("quiet", quiet)):
+        elapsed, events = asyncio.run(run(series, args.repeat))
+        per_tick = elapsed / (len(series) - 1) * 1e6
+        print(f"{label:>6}: {len(series) - 1} ticks, {events} events, {per_tick:.2f} us/tick")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Local stand-in for the OpenAI endpoints the backend calls (speech and the Responses API
+the commentary agent uses), so TTS and commentary can be exercised and benchmarked
+without network access or API keys.
+
+Run from the backend directory:
+    python -m benchmarks.fake_openai_server --port 9000
+then start the backend with OPENAI_BASE_URL=http://127.0.0.1:9000/v1
+"""
+import argparse
+import asyncio
+import hashlib
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+class FakeConfig:
+    first_byte_ms: float = 300.0
+    chunk_interval_ms: float = 40.0
+    chunk_size: int = 4096
+    bytes_per_char: int = 120
+    # Responses API: time until the whole (non-streamed) response is returned
+    response_latency_ms: float = 800.0
+    response_words: int = 40
+
+
+config = FakeConfig()
+app = FastAPI(title="Fake OpenAI API")
+
+
+def fake_mp3(text: str, voice: str) -> bytes:
+    # Deterministic bytes sized roughly like real speech for the given text
+    size = max(config.chunk_size, len(text) * config.bytes_per_char)
+    seed = hashlib.sha256(f"{voice}:{text}".encode()).digest()
+    body = (seed * (size // len(seed) + 1))[:size]
+    return b"ID3" + body
+
+
+@app.post("/v1/audio/speech")
+async def speech(request: Request):
+    payload = await request.json()
+    audio = fake_mp3(payload.get("input", ""), payload.get("voice", "onyx"))
+
+    async def body():
+        await asyncio.sleep(config.first_byte_ms / 1000)
+        for offset in range(0, len(audio), config.chunk_size):
+            if offset:
+                await asyncio.sleep(config.chunk_interval_ms / 1000)
+            yield audio[offset:offset + config.chunk_size]
+
+    return StreamingResponse(body(), media_type="audio/mpeg")
+
+
+ROAST_WORDS = (
+    "that build is a crime against the rift and your CS is an insult to the minions "
+    "buy a control ward before you feed again and maybe try hitting the creeps this time"
+).split()
+
+
+def fake_commentary(prompt: str) -> str:
+    # Deterministic text that still varies with the prompt
+    offset = int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % len(ROAST_WORDS)
+    words = [ROAST_WORDS[(offset + i) % len(ROAST_WORDS)] for i in range(config.response_words)]
+    return " ".join(words).capitalize() + "."
+
+
+def _prompt_text(payload: dict) -> str:
+    items = payload.get("input")
+    if isinstance(items, str):
+        return items
+    parts = []
+    for item in items or []:
+        content = item.get("content") if isinstance(item, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+    return "\n".join(parts)
+
+
+@app.post("/v1/responses")
+async def responses(request: Request):
+    payload = await request.json()
+    prompt = _prompt_text(payload)
+    text = fake_commentary(prompt)
+    await asyncio.sleep(config.response_latency_ms / 1000)
+
+    input_tokens = len(prompt) // 4
+    output_tokens = len(text) // 4
+    return {
+        "id": f"resp_{hashlib.sha256(prompt.encode()).hexdigest()[:24]}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": payload.get("model", "gpt-4"),
+        "output": [{
+            "type": "message",
+            "id": f"msg_{int(time.time() * 1000)}",
+            "status": "completed",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve_in_thread(server_app, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(server_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--first-byte-ms", type=float, default=config.first_byte_ms)
+    parser.add_argument("--chunk-interval-ms", type=float, default=config.chunk_interval_ms)
+    parser.add_argument("--response-latency-ms", type=float, default=config.response_latency_ms)
+    args = parser.parse_args()
+
+    config.first_byte_ms = args.first_byte_ms
+    config.chunk_interval_ms = args.chunk_interval_ms
+    config.response_latency_ms = args.response_latency_ms
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import copy
+import random
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.common import load_sample
+
+CHAMPIONS = [
+    "Yone", "Lee Sin", "Ahri", "Jinx", "Thresh",
+    "Darius", "Graves", "Syndra", "Kai'Sa", "Nautilus",
+]
+
+# (itemID, displayName, price)
+ITEM_BUILD = [
+    (1055, "Doran's Blade", 450),
+    (3006, "Berserker's Greaves", 1100),
+    (6672, "Kraken Slayer", 3100),
+    (3031, "Infinity Edge", 3400),
+    (3046, "Phantom Dancer", 2600),
+    (3072, "Bloodthirster", 3400),
+]
+
+
+def _make_item(slot: int, item_id: int, name: str, price: int) -> Dict[str, Any]:
+    return {
+        "canUse": False,
+        "consumable": False,
+        "count": 1,
+        "displayName": name,
+        "itemID": item_id,
+        "price": price,
+        "rawDescription": f"GeneratedTip_Item_{item_id}_Description",
+        "rawDisplayName": f"Item_{item_id}_Name",
+        "slot": slot,
+    }
+
+
+def build_game(sample: Optional[Dict[str, Any]] = None, players: int = 10) -> Dict[str, Any]:
+    sample = copy.deepcopy(sample if sample is not None else load_sample())
+    template = sample["allPlayers"][0]
+    active_riot_id = sample["activePlayer"]["riotId"]
+
+    all_players = []
+    for i in range(players):
+        player = copy.deepcopy(template)
+        if i > 0:
+            game_name = f"Player{i}"
+            player["riotIdGameName"] = game_name
+            player["riotId"] = f"{game_name}#bench"
+            player["summonerName"] = f"{game_name}#bench"
+        else:
+            player["riotId"] = active_riot_id
+        player["championName"] = CHAMPIONS[i % len(CHAMPIONS)]
+        player["team"] = "ORDER" if i < players // 2 else "CHAOS"
+        player["items"] = []
+        player["scores"] = {"assists": 0, "creepScore": 0, "deaths": 0, "kills": 0, "wardScore": 0.0}
+        all_players.append(player)
+
+    sample["allPlayers"] = all_players
+    sample["gameData"]["gameMode"] = "CLASSIC"
+    sample["gameData"]["gameTime"] = 0.0
+    sample["activePlayer"]["currentGold"] = 500.0
+    sample["events"] = {"Events": [{"EventID": 0, "EventName": "GameStart", "EventTime": 0.0}]}
+    return sample
+
+
+class SyntheticGame:
+    """Evolving allgamedata document: CS, gold, items, kills progress over game time."""
+
+    def __init__(self, seed: int = 0, tick_seconds: float = 2.0, players: int = 10,
+                 sample: Optional[Dict[str, Any]] = None):
+        self.random = random.Random(seed)
+        self.tick_seconds = tick_seconds
+        self.document = build_game(sample, players)
+        self.gold = [500.0] * players
+
+    @property
+    def game_time(self) -> float:
+        return self.document["gameData"]["gameTime"]
+
+    def _add_event(self, name: str, **fields):
+        events = self.document["events"]["Events"]
+        events.append({"EventID": len(events), "EventName": name, "EventTime": self.game_time, **fields})
+
+    def _kill(self, killer: int, victim: int, assisters: List[int]):
+        players = self.document["allPlayers"]
+        players[killer]["scores"]["kills"] += 1
+        players[victim]["scores"]["deaths"] += 1
+        for assister in assisters:
+            players[assister]["scores"]["assists"] += 1
+        self.gold[killer] += 300
+        self._add_event(
+            "ChampionKill",
+            KillerName=players[killer]["riotIdGameName"],
+            VictimName=players[victim]["riotIdGameName"],
+            Assisters=[players[a]["riotIdGameName"] for a in assisters],
+        )
+
+    def _shop(self, index: int):
+        player = self.document["allPlayers"][index]
+        owned = len(player["items"])
+        if owned >= len(ITEM_BUILD):
+            return
+        item_id, name, price = ITEM_BUILD[owned]
+        if self.gold[index] >= price:
+            self.gold[index] -= price
+            player["items"].append(_make_item(owned, item_id, name, price))
+
+    def teamfight(self):
+        players = self.document["allPlayers"]
+        half = len(players) // 2
+        for _ in range(self.random.randint(3, 5)):
+            killer_team, victim_team = (range(0, half), range(half, len(players)))
+            if self.random.random() < 0.5:
+                killer_team, victim_team = victim_team, killer_team
+            killer = self.random.choice(list(killer_team))
+            victim = self.random.choice(list(victim_team))
+            assisters = [p for p in killer_team if p != killer and self.random.random() < 0.6]
+            self._kill(killer, victim, assisters)
+
+    def advance(self, ticks: int = 1):
+        for _ in range(ticks):
+            self.document["gameData"]["gameTime"] += self.tick_seconds
+            players = self.document["allPlayers"]
+            for i, player in enumerate(players):
+                if self.game_time > 90 and self.random.random() < 0.45:
+                    player["scores"]["creepScore"] += 1
+                    self.gold[i] += 21
+                self.gold[i] += 2.04 * self.tick_seconds
+                self._shop(i)
+            if self.game_time > 180 and self.random.random() < 0.03:
+                half = len(players) // 2
+                killer = self.random.randrange(len(players))
+                enemies = range(half, len(players)) if killer < half else range(0, half)
+                self._kill(killer, self.random.choice(list(enemies)), [])
+            self.document["activePlayer"]["currentGold"] = self.gold[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return copy.deepcopy(self.document)
+
+    def ticks(self, count: int) -> Iterator[Dict[str, Any]]:
+        for _ in range(count):
+            self.advance()
+            yield self.snapshot()
+
+
+def game_at(seconds: float, seed: int = 0) -> Dict[str, Any]:
+    game = SyntheticGame(seed=seed)
+    game.advance(int(seconds / game.tick_seconds))
+    return game.snapshot()
+
+
+def phase_fixtures(seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    fixtures = {
+        "early": game_at(5 * 60, seed),
+        "mid": game_at(18 * 60, seed),
+        "late": game_at(35 * 60, seed),
+    }
+    game = SyntheticGame(seed=seed)
+    game.advance(int(18 * 60 / game.tick_seconds))
+    game.teamfight()
+    fixtures["teamfight"] = game.snapshot()
+    return fixtures
+
+
+# (previous tick, current tick) per phase, what a detector sees on one ingest
+def phase_pairs(seed: int = 0) -> Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]:
+    pairs = {}
+    for phase, minutes in (("early", 5), ("mid", 18), ("late", 35)):
+        game = SyntheticGame(seed=seed)
+        game.advance(int(minutes * 60 / game.tick_seconds) - 1)
+        previous = game.snapshot()
+        game.advance()
+        pairs[phase] = (previous, game.snapshot())
+    game = SyntheticGame(seed=seed)
+    game.advance(int(18 * 60 / game.tick_seconds))
+    previous = game.snapshot()
+    game.teamfight()
+    pairs["teamfight"] = (previous, game.snapshot())
+    return pairs
@@ -0,0 +1,173 @@
+"""
+Per-call cost of format_league_data on allgamedata captures: the bundled sample,
+synthetic early/mid/late 10-player games, and a stream of consecutive ticks where
+most players are unchanged from one call to the next.
+
+Columns:
+    before  the implementation before the fast path (a copy is kept below)
+    strict  the current one with strict=True: no reuse, no type coercion
+    fast    the current default, with a per-session FormatCache on the stream
+
+Run from the backend directory:
+    python -m benchmarks.format_data
+"""
+from typing import Any, Dict, Optional
+import argparse
+import time
+
+from benchmarks.common import load_sample
+from benchmarks.fixtures import SyntheticGame, phase_fixtures
+from app.schemas.game_data import GameData, GameDataPayload
+from app.schemas.player_data import PlayerData
+from app.services.formatting_service import format_league_data, FormatCache
+
+
+# format_league_data as it was before the fast path, kept as the "before" column
+def baseline_format_league_data(payload: GameDataPayload) -> GameData:
+    raw_data = payload.data
+
+    active_player_data = raw_data.get("activePlayer")
+    game_data_obj = raw_data.get("gameData")
+    all_players_data = raw_data.get("allPlayers")
+
+    if not all_players_data:
+        return GameData(
+            game_status="UNKNOWN",
+            main_player=PlayerData(
+                name="Unknown", champion="Unknown", kills=0, deaths=0,
+                assists=0, creep_score=0, current_gold=0.0,
+                current_items=[], main_rune="Unknown"
+            ),
+            ally_players=[],
+            enemy_players=[]
+        )
+
+    active_player_riot_id = active_player_data.get("riotId", "") if active_player_data else ""
+    game_status = game_data_obj.get("gameMode", "UNKNOWN") if game_data_obj else "UNKNOWN"
+    game_time = game_data_obj.get("gameTime", 0.0) if game_data_obj else 0.0
+
+    main_player = None
+    main_player_team = None
+    temp_players = []
+
+    for player_data in all_players_data:
+        player_riot_id = player_data.get("riotId")
+
+        if player_riot_id == active_player_riot_id:
+            main_player = _baseline_player(player_data, active_player_data)
+            main_player_team = player_data.get("team")
+        else:
+            temp_players.append((player_data, player_data.get("team")))
+
+    if main_player is None:
+        main_player = _baseline_player(all_players_data[0], active_player_data)
+        main_player_team = all_players_data[0].get("team")
+        temp_players = temp_players[1:] if len(temp_players) > 0 else []
+
+    ally_players = []
+    enemy_players = []
+    for player_data, player_team in temp_players:
+        player = _baseline_player(player_data)
+        if player_team == main_player_team:
+            ally_players.append(player)
+        else:
+            enemy_players.append(player)
+
+    return GameData(
+        game_status=game_status,
+        game_time=game_time,
+        main_player=main_player,
+        ally_players=ally_players,
+        enemy_players=enemy_players
+    )
+
+
+def _baseline_player(player_data: Dict[str, Any], active_player_data: Optional[Dict[str, Any]] = None) -> PlayerData:
+    scores = player_data.get("scores")
+    items_data = player_data.get("items")
+
+    if items_data:
+        item_names = [item["displayName"] for item in items_data if "displayName" in item]
+    else:
+        item_names = []
+
+    current_gold = active_player_data.get("currentGold", 0.0) if active_player_data else 0.0
+
+    main_rune = "Unknown"
+    if active_player_data:
+        full_runes = active_player_data.get("fullRunes")
+        if full_runes:
+            general_runes = full_runes.get("generalRunes")
+            if general_runes:
+                main_rune = general_runes[0].get("displayName", "Unknown")
+    else:
+        runes = player_data.get("runes")
+        if runes:
+            keystone = runes.get("keystone")
+            if keystone:
+                main_rune = keystone.get("displayName", "Unknown")
+
+    return PlayerData(
+        name=player_data.get("riotIdGameName", "Unknown"),
+        riot_id=player_data.get("riotId", ""),
+        champion=player_data.get("championName", "Unknown"),
+        kills=scores.get("kills", 0) if scores else 0,
+        deaths=scores.get("deaths", 0) if scores else 0,
+        assists=scores.get("assists", 0) if scores else 0,
+        creep_score=scores.get("creepScore", 0) if scores else 0,
+        current_gold=current_gold,
+        current_items=item_names,
+        main_rune=main_rune
+    )
+
+
+def timed(fn, repeat: int, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    captures = {"sample": load_sample(), **{k: v for k, v in phase_fixtures().items() if k != "teamfight"}}
+    modes = [
+        ("before", {"baseline": True}),
+        ("strict", {"strict": True}),
+        ("fast", {}),
+    ]
+
+    def run(payload, baseline: bool = False, **kwargs):
+        return baseline_format_league_data(payload) if baseline else format_league_data(payload, **kwargs)
+
+    print(f"{'capture':>10} " + " ".join(f"{label:>12}" for label, _ in modes) + f" {'speedup':>9}")
+    for name, data in captures.items():
+        payload = GameDataPayload(data=data)
+        row = [timed(lambda: run(payload, **kwargs), args.repeat) for _, kwargs in modes]
+        print(f"{name:>10} " + " ".join(f"{us:>10.1f}us" for us in row) + f" {row[0] / row[-1]:>8.2f}x")
+
+    # Consecutive ticks: a per-session cache can reuse unchanged players
+    game = SyntheticGame(seed=7)
+    game.advance(300)
+    stream = [GameDataPayload(data=snapshot) for snapshot in game.ticks(500)]
+
+    def run_stream(**kwargs):
+        if not kwargs:
+            kwargs["cache"] = FormatCache()
+        start = time.perf_counter()
+        for payload in stream:
+            run(payload, **kwargs)
+        return (time.perf_counter() - start) / len(stream) * 1e6
+
+    row = [min(run_stream(**kwargs) for _ in range(5)) for _, kwargs in modes]
+    print(f"{'stream':>10} " + " ".join(f"{us:>10.1f}us" for us in row) + f" {row[0] / row[-1]:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
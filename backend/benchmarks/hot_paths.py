@@ -0,0 +1,223 @@
+"""
+Microbenchmarks for the backend hot paths, checked against a stored baseline.
+
+Cases, over fixed synthetic games at 5 (early), 18 (mid) and 35 (late) minutes plus an
+18-minute teamfight burst:
+    format_league_data      allgamedata -> GameData, no per-session reuse
+    detect_changes          one ingest's worth of detection, previous tick -> current tick
+    to_prompt               every event of the tick rendered to a prompt line
+    validate_active_session the Authorization -> token -> session dependency chain
+    ingest_round_trip       POST /api/ingest through the ASGI app (mid game)
+
+For every case it reports ops/sec (best of --rounds) and the peak memory traced by
+tracemalloc during one call, a stand-in for how much a call allocates.
+
+The run fails (exit code 1) when a case is slower than the baseline by more than
+--tolerance, or allocates more than --alloc-tolerance above it. Baselines are machine
+specific, record one on the machine that runs the check:
+    python -m benchmarks.hot_paths --save-baseline
+
+Run from the backend directory:
+    python -m benchmarks.hot_paths
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.common import configure_env, auth_headers
+
+configure_env()
+
+from fastapi.testclient import TestClient
+
+from benchmarks.fixtures import phase_pairs
+from app.main import app
+from app.core.auth import get_settings, extract_bearer_token, validate_secret_token, validate_active_session
+import app.core.memory_data as memory
+import app.services.commentary_service as commentary_service
+from app.schemas.game_data import GameDataPayload
+from app.services.formatting_service import format_league_data
+from app.services.change_detection_service import ChangeDetector
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def ops_per_sec(fn: Callable[[], Any], rounds: int, min_time: float) -> float:
+    # Calibrate a batch size that runs for about min_time, then take the best of rounds,
+    # other load on the machine only ever makes a round slower
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 5 or number >= 1_000_000:
+            break
+        number *= 2
+    number = max(1, int(number * (min_time / max(elapsed, 1e-9))))
+
+    best = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = max(best, number / (time.perf_counter() - start))
+    return best
+
+
+def peak_alloc_bytes(fn: Callable[[], Any]) -> int:
+    fn()  # warm caches so only the steady state is measured
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def detection_case(previous, current) -> Callable[[], Any]:
+    detector = ChangeDetector()
+    detector.diff(previous)
+    primed = detector._fingerprints
+
+    def run():
+        # Back to the previous tick each call, so every call detects the same events
+        detector.previous_data = previous
+        detector._fingerprints = dict(primed)
+        return detector.diff(current)
+
+    return run
+
+
+async def _no_commentary(job):
+    return None
+
+
+def build_cases(client: TestClient) -> List[Tuple[str, Callable[[], Any]]]:
+    cases = []
+    pairs = phase_pairs()
+
+    for phase, (previous_raw, current_raw) in pairs.items():
+        payload = GameDataPayload(data=current_raw)
+        cases.append((f"format_league_data/{phase}", lambda payload=payload: format_league_data(payload)))
+
+    for phase, (previous_raw, current_raw) in pairs.items():
+        previous = format_league_data(GameDataPayload(data=previous_raw))
+        current = format_league_data(GameDataPayload(data=current_raw))
+        detect = detection_case(previous, current)
+        cases.append((f"detect_changes/{phase}", detect))
+
+        events = detect()
+        if events:
+            cases.append((f"to_prompt/{phase} ({len(events)} events)", lambda events=events: [e.to_prompt() for e in events]))
+
+    settings = get_settings()
+    state = memory.sessions.create("bench", settings.SECRET_TOKEN)
+    authorization = f"Bearer {settings.SECRET_TOKEN}"
+    session_id = state.session.session_id
+
+    def dependency_chain():
+        token = validate_secret_token(extract_bearer_token(authorization), get_settings())
+        return validate_active_session(token, session_id)
+
+    cases.append(("validate_active_session", dependency_chain))
+
+    response = client.post("/api/connection/establish", json={"username": "bench"}, headers=auth_headers(settings.SECRET_TOKEN))
+    headers = auth_headers(settings.SECRET_TOKEN, response.json()["session_id"])
+    bodies = [json.dumps({"data": raw}).encode() for raw in pairs["mid"]]
+    headers["Content-Type"] = "application/json"
+    toggle = [0]
+
+    def ingest():
+        # Alternates between two ticks so detection does real work on every request
+        toggle[0] ^= 1
+        return client.post("/api/ingest", content=bodies[toggle[0]], headers=headers)
+
+    cases.append(("ingest_round_trip/mid", ingest))
+    return cases
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float, alloc_tolerance: float) -> List[str]:
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get("cases", {}).get(name)
+        if expected is None:
+            continue
+        floor = expected["ops_per_sec"] * (1 - tolerance)
+        if result["ops_per_sec"] < floor:
+            failures.append(
+                f"{name}: {result['ops_per_sec']:.0f} ops/s, baseline {expected['ops_per_sec']:.0f} "
+                f"({result['ops_per_sec'] / expected['ops_per_sec'] - 1:+.0%})"
+            )
+        ceiling = expected["peak_alloc_bytes"] * (1 + alloc_tolerance) + 1024
+        if result["peak_alloc_bytes"] > ceiling:
+            failures.append(
+                f"{name}: {result['peak_alloc_bytes']} bytes allocated, baseline {expected['peak_alloc_bytes']}"
+            )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per round")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed ops/sec drop, 0.25 = 25%%")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10, help="allowed growth in peak allocation")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    commentary_service.commentary_pipeline.handler = _no_commentary
+    results: Dict[str, Dict[str, Any]] = {}
+
+    with TestClient(app) as client:
+        cases = [(name, fn) for name, fn in build_cases(client) if args.filter in name]
+        print(f"{'case':<38} {'ops/sec':>12} {'peak alloc':>12}")
+        for name, fn in cases:
+            rate = ops_per_sec(fn, args.rounds, args.min_time)
+            allocated = peak_alloc_bytes(fn)
+            results[name] = {"ops_per_sec": round(rate, 1), "peak_alloc_bytes": allocated}
+            print(f"{name:<38} {rate:>12.0f} {allocated / 1024:>10.1f}KB")
+
+    memory.sessions.clear()
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "cases": results,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}, run with --save-baseline to record one")
+        return
+
+    failures = compare(results, json.loads(baseline_path.read_text()), args.tolerance, args.alloc_tolerance)
+    if failures:
+        print(f"\nREGRESSION against {baseline_path.name}:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nNo regressions against {baseline_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Ingest throughput with formatting and change detection inline on the event loop versus
+sharded over INGEST_PROCESS_WORKERS worker processes.
+
+Every level drives --sessions concurrent sessions, each posting its own synthetic game to
+/api/ingest/raw in order (the body is decoded in the worker when the pool is on), through
+the ASGI app in-process. "stage" is the same work submitted to the pool directly, without
+HTTP, i.e. the ceiling the pool itself allows. Throughput only scales while the event loop
+has CPU to spare for request handling, so expect the gain to flatten past a few workers.
+
+Run from the backend directory:
+    python -m benchmarks.ingest_pool --workers 0 1 2 4 8 --sessions 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import configure_env, auth_headers
+
+configure_env()
+
+import httpx
+from benchmarks.fixtures import SyntheticGame
+from app.main import app
+from app.core.auth import get_settings
+import app.core.memory_data as memory
+from app.services.ingest_pool import ingest_pool
+from app.services.commentary_service import commentary_pipeline
+from app.services.decode_service import decode_game_data
+from app.schemas.game_data import GameDataPayload
+from app.services.formatting_service import FormatCache, format_league_data
+from app.services.change_detection_service import ChangeDetector
+
+
+async def _no_commentary(job):
+    return None
+
+
+def build_bodies(sessions: int, ticks: int):
+    bodies = []
+    for seed in range(sessions):
+        game = SyntheticGame(seed=seed)
+        game.advance(100)
+        bodies.append([json.dumps(snapshot).encode() for snapshot in game.ticks(ticks)])
+    return bodies
+
+
+async def run_stage(bodies, workers: int) -> float:
+    if workers == 0:
+        # Inline, what the event loop would spend per ingest without the pool
+        states = [(FormatCache(), ChangeDetector()) for _ in bodies]
+        start = time.perf_counter()
+        for (format_cache, detector), session_bodies in zip(states, bodies):
+            for body in session_bodies:
+                data = decode_game_data(body)
+                detector.diff(format_league_data(GameDataPayload.model_construct(data=data, seq=None), cache=format_cache))
+        return sum(len(b) for b in bodies) / (time.perf_counter() - start)
+
+    async def session(index: int, session_bodies):
+        for body in session_bodies:
+            await ingest_pool.process(f"bench-{index}", body=body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i, b) for i, b in enumerate(bodies)))
+    return sum(len(b) for b in bodies) / (time.perf_counter() - start)
+
+
+async def run_http(client: httpx.AsyncClient, token: str, bodies) -> float:
+    session_ids = []
+    for i in range(len(bodies)):
+        response = await client.post("/api/connection/establish", json={"username": f"player-{i}"}, headers=auth_headers(token))
+        response.raise_for_status()
+        session_ids.append(response.json()["session_id"])
+
+    async def session(session_id: str, session_bodies):
+        headers = auth_headers(token, session_id)
+        for body in session_bodies:
+            response = await client.post("/api/ingest/raw", content=body, headers=headers)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(s, b) for s, b in zip(session_ids, bodies)))
+    elapsed = time.perf_counter() - start
+    memory.sessions.clear()
+    return sum(len(b) for b in bodies) / elapsed
+
+
+async def run(args):
+    settings = get_settings()
+    bodies = build_bodies(args.sessions, args.ticks)
+    commentary_pipeline.handler = _no_commentary
+    await commentary_pipeline.start(workers=1)
+
+    print(f"{args.sessions} sessions x {args.ticks} snapshots, {os.cpu_count()} CPUs\n")
+    print(f"{'workers':>8} {'stage/s':>10} {'ingest/s':>10} {'speedup':>8}")
+    baseline = None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for workers in args.workers:
+            await ingest_pool.start(workers)
+            stage = await run_stage(bodies, workers)
+            http = await run_http(client, settings.SECRET_TOKEN, bodies)
+            await ingest_pool.stop()
+            baseline = baseline or http
+            print(f"{workers:>8} {stage:>10.0f} {http:>10.0f} {http / baseline:>7.2f}x")
+
+    await commentary_pipeline.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--ticks", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
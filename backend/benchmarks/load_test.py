@@ -0,0 +1,288 @@
+"""
+How many concurrently streaming players one backend instance sustains.
+
+Every simulated connector establishes its own session, subscribes to /ws/commentary
+(with audio, so TTS runs too) and posts a synthetic 10-player game to /api/ingest every
+--interval seconds, with kills, CS, gold and items progressing over game time. The LLM
+and speech calls go to benchmarks.fake_openai_server.
+
+Reported per level, as JSON:
+    ingest      request latency of every upload
+    detection   latency of the uploads whose response reported detected events
+    commentary  upload carrying events -> commentary (text and audio) on the websocket,
+                including the coalescing window and the fake LLM/TTS latency
+A level counts as sustained when nothing failed, under 1% of uploads left their slot
+late and ingest p99 stays under the upload interval.
+
+Unless --backend is given, the backend is started as a subprocess on a free port and
+pointed at a fake OpenAI server running in this process.
+
+Run from the backend directory:
+    python -m benchmarks.load_test --connectors 10 50 100 --duration 60 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import BACKEND_DIR, BENCH_TOKEN, percentile, auth_headers
+from benchmarks.fake_openai_server import app as fake_app, config as fake_config, free_port, serve_in_thread
+from benchmarks.fixtures import SyntheticGame
+
+import httpx
+import websockets
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0,
+    }
+
+
+class LevelResults:
+    def __init__(self):
+        self.ingest: List[float] = []
+        self.detection: List[float] = []
+        self.commentary: List[float] = []
+        self.errors = 0
+        self.late = 0
+        self.events = 0
+        self.audio_frames = 0
+
+
+class Connector:
+    def __init__(self, index: int, base_url: str, ws_url: str, token: str, args, results: LevelResults):
+        self.index = index
+        self.base_url = base_url
+        self.ws_url = ws_url
+        self.token = token
+        self.args = args
+        self.results = results
+        self.game = SyntheticGame(seed=index, tick_seconds=args.interval * args.game_speed)
+        self.game.advance(int(args.start_minute * 60 / (args.interval * args.game_speed)))
+        # Send times of uploads with events that no commentary has answered yet
+        self.awaiting_commentary: List[float] = []
+
+    async def run(self, deadline: float):
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30.0) as client:
+            response = await client.post(
+                "/api/connection/establish", json={"username": f"load-{self.index}"}, headers=auth_headers(self.token)
+            )
+            response.raise_for_status()
+            session_id = response.json()["session_id"]
+            headers = auth_headers(self.token, session_id)
+
+            listener = asyncio.create_task(self.listen(session_id))
+            try:
+                await self.stream(client, headers, deadline)
+            finally:
+                listener.cancel()
+                await client.post("/api/connection/disconnect", json={"username": f"load-{self.index}"}, headers=headers)
+
+    async def stream(self, client: httpx.AsyncClient, headers: Dict[str, str], deadline: float):
+        interval = self.args.interval
+        # Connectors start spread over one interval, like real clients would
+        next_tick = time.monotonic() + random.uniform(0, interval)
+        while True:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > interval:
+                # A whole slot behind schedule, the connector would have skipped a tick
+                self.results.late += 1
+            if time.monotonic() >= deadline:
+                return
+            next_tick += interval
+
+            self.game.advance()
+            payload = {"data": self.game.snapshot()}
+            sent = time.perf_counter()
+            try:
+                response = await client.post("/api/ingest", json=payload, headers=headers)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self.results.errors += 1
+                continue
+            latency = (time.perf_counter() - sent) * 1000
+            self.results.ingest.append(latency)
+
+            changes = response.json().get("changes_detected", 0)
+            if changes:
+                self.results.events += changes
+                self.results.detection.append(latency)
+                self.awaiting_commentary.append(sent)
+
+    async def listen(self, session_id: str):
+        url = f"{self.ws_url}/ws/commentary?token={self.token}&session_id={session_id}&audio={str(self.args.audio).lower()}"
+        async with websockets.connect(url, max_size=None) as socket:
+            await socket.recv()  # subscribed
+            while True:
+                message = await socket.recv()
+                if isinstance(message, bytes):
+                    self.results.audio_frames += 1
+                    continue
+                if json.loads(message).get("type") != "commentary":
+                    continue
+                # A commentary answers everything queued before it, coalesced jobs cover several uploads
+                if self.awaiting_commentary:
+                    self.results.commentary.append((time.perf_counter() - self.awaiting_commentary[0]) * 1000)
+                    self.awaiting_commentary.clear()
+
+
+async def run_level(base_url: str, ws_url: str, token: str, connectors: int, args) -> Dict[str, Any]:
+    results = LevelResults()
+    clients = [Connector(i, base_url, ws_url, token, args, results) for i in range(connectors)]
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    outcomes = await asyncio.gather(*(c.run(start + args.duration) for c in clients), return_exceptions=True)
+    elapsed = time.monotonic() - start
+    failed = [o for o in outcomes if isinstance(o, Exception)]
+    # Let commentary still in flight arrive before reading the server side counters
+    await asyncio.sleep(args.drain)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        server = (await client.get("/api/commentary/stats", headers=auth_headers(token))).json()
+
+    uploads = len(results.ingest) + results.errors
+    late_pct = results.late / uploads * 100 if uploads else 0.0
+    ingest = summarize(results.ingest)
+    return {
+        "connectors": connectors,
+        "connector_failures": len(failed),
+        "elapsed_s": round(elapsed, 3),
+        "ingest": {
+            **ingest,
+            "errors": results.errors,
+            "throughput_per_s": round(len(results.ingest) / elapsed, 1) if elapsed else 0.0,
+        },
+        "detection": {**summarize(results.detection), "events": results.events},
+        "commentary": {**summarize(results.commentary), "audio_frames": results.audio_frames},
+        "late_pct": round(late_pct, 2),
+        "sustained": not failed and not results.errors and late_pct < 1.0 and ingest["p99_ms"] < args.interval * 1000,
+        "load_generator_cpu_pct": round((time.process_time() - cpu_start) / elapsed * 100, 1) if elapsed else 0.0,
+        "server": {
+            "commentary_processed": server.get("processed"),
+            "commentary_dropped": server.get("dropped"),
+            "commentary_failed": server.get("failed"),
+            "response_cache": server.get("response_cache"),
+        },
+    }
+
+
+def start_backend(port: int, fake_url: str, log_path: Optional[str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SECRET_TOKEN": os.environ.get("SECRET_TOKEN", BENCH_TOKEN),
+        "OPENAI_API_KEY": "sk-bench",
+        "OPENAI_BASE_URL": fake_url,
+        "OPENAI_AGENTS_DISABLE_TRACING": "1",
+        "DISCORD_BOT_TOKEN": "bench",
+        "DISCORD_CHANNEL_ID": "bench",
+        "DATABASE_PATH": "",
+    }
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Backend did not become healthy within 30s")
+
+
+async def run(args) -> Dict[str, Any]:
+    backend = None
+    token = args.token or os.environ.get("SECRET_TOKEN", BENCH_TOKEN)
+    base_url = args.backend
+    if base_url is None:
+        fake_config.response_latency_ms = args.llm_latency_ms
+        fake_config.first_byte_ms = args.tts_latency_ms
+        fake_port = free_port()
+        serve_in_thread(fake_app, fake_port)
+        port = free_port()
+        backend = start_backend(port, f"http://127.0.0.1:{fake_port}/v1", args.backend_log)
+        base_url = f"http://127.0.0.1:{port}"
+    ws_url = base_url.replace("http", "ws", 1)
+
+    levels = []
+    try:
+        for connectors in args.connectors:
+            result = await run_level(base_url, ws_url, token, connectors, args)
+            levels.append(result)
+            print(
+                f"{connectors:>6} connectors: {result['ingest']['throughput_per_s']:>7.1f} ingest/s "
+                f"p50 {result['ingest']['p50_ms']:.1f}ms p99 {result['ingest']['p99_ms']:.1f}ms, "
+                f"commentary p50 {result['commentary']['p50_ms']:.0f}ms, "
+                f"{'sustained' if result['sustained'] else 'NOT sustained'}",
+                file=sys.stderr
+            )
+    finally:
+        if backend is not None:
+            backend.terminate()
+            backend.wait(timeout=10)
+
+    return {
+        "benchmark": "load_test",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "duration_s": args.duration,
+            "interval_s": args.interval,
+            "game_speed": args.game_speed,
+            "start_minute": args.start_minute,
+            "audio": args.audio,
+            "llm_latency_ms": args.llm_latency_ms if args.backend is None else None,
+            "tts_latency_ms": args.tts_latency_ms if args.backend is None else None,
+            "backend": args.backend or "subprocess",
+        },
+        "levels": levels,
+        "max_sustained_connectors": max((level["connectors"] for level in levels if level["sustained"]), default=0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connectors", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--duration", type=float, default=60, help="seconds per level")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between uploads per connector")
+    parser.add_argument("--game-speed", type=float, default=1.0, help="game seconds per real second")
+    parser.add_argument("--start-minute", type=float, default=10, help="game time the synthetic games start at")
+    parser.add_argument("--no-audio", dest="audio", action="store_false", help="subscribe without TTS audio")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--tts-latency-ms", type=float, default=300)
+    parser.add_argument("--drain", type=float, default=5.0, help="seconds to wait for in-flight commentary")
+    parser.add_argument("--backend", help="existing backend URL instead of starting one")
+    parser.add_argument("--backend-log", help="file for the started backend's output")
+    parser.add_argument("--token", help="defaults to SECRET_TOKEN from the environment")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Sustained event rows/second of the SQLite writer thread, and how much enqueueing
+costs the caller (the event loop) while the writer is busy.
+
+Run from the backend directory:
+    python -m benchmarks.persistence --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import percentile
+from app.core.database import GameDatabase
+from app.services.change_detection_service import ChangeEvent, ChangeType
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--events-per-ingest", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    context = {"kills": 3, "deaths": 2, "assists": 5, "cs": 120, "gold": 1840.5, "champion": "Yone", "is_main_player": True}
+    changes = [
+        ChangeEvent(ChangeType.KILL, f"Player{i}", 2, 3, context)
+        for i in range(args.events_per_ingest)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = GameDatabase(batch_size=args.batch_size, max_queue=args.rows)
+        database.start(os.path.join(directory, "bench.db"))
+
+        enqueue_us = []
+        ingests = args.rows // args.events_per_ingest
+        start = time.perf_counter()
+        for i in range(ingests):
+            begin = time.perf_counter()
+            database.record_events(f"session-{i % 100}", i * 2.0, changes)
+            enqueue_us.append((time.perf_counter() - begin) * 1e6)
+        done = database.request_flush()
+        done.wait()
+        elapsed = time.perf_counter() - start
+        database.stop()
+
+        stats = database.stats()
+        print(f"rows written:   {stats['rows_written']:,} in {stats['batches']} batches ({stats['dropped']} dropped)")
+        print(f"throughput:     {stats['rows_written'] / elapsed:,.0f} rows/s")
+        print(f"enqueue cost:   p50 {percentile(enqueue_us, 50):.1f} us, p99 {percentile(enqueue_us, 99):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Decode CPU time per ingest body: what /api/ingest does (stdlib json, then pydantic over
+the whole document) against the decoders /api/ingest/raw can use (orjson, msgspec typed
+structs that only keep the fields the backend reads). Also times decode + format_league_data.
+
+Run from the backend directory:
+    python -m benchmarks.raw_ingest
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import load_sample
+from benchmarks.fixtures import phase_fixtures
+from app.schemas.game_data import GameDataPayload
+from app.services import decode_service
+from app.services.formatting_service import format_league_data
+
+
+def cpu_us(fn, body: bytes, repeat: int, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.process_time()
+        for _ in range(repeat):
+            fn(body)
+        best = min(best, time.process_time() - start)
+    return best / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    decoders = {"stdlib+pydantic": lambda body: GameDataPayload(data=json.loads(body)).data}
+    if decode_service.orjson is not None:
+        decoders["orjson"] = decode_service._decode_orjson
+    if decode_service.msgspec is not None:
+        decoders["msgspec typed"] = decode_service._decode_msgspec
+
+    captures = {"sample": load_sample(), **phase_fixtures()}
+
+    print(f"decoder used by /api/ingest/raw: {decode_service.DECODER}\n")
+    print(f"{'capture':>10} {'bytes':>8} " + " ".join(f"{name:>16}" for name in decoders))
+    for name, data in captures.items():
+        body = json.dumps(data).encode()
+        row = [cpu_us(decode, body, args.repeat) for decode in decoders.values()]
+        print(f"{name:>10} {len(body):>8} " + " ".join(f"{us:>14.1f}us" for us in row))
+
+    print("\ndecode + format_league_data")
+    print(f"{'capture':>10} {'':>8} " + " ".join(f"{name:>16}" for name in decoders))
+    for name, data in captures.items():
+        body = json.dumps(data).encode()
+        row = [
+            cpu_us(lambda b, decode=decode: format_league_data(GameDataPayload.model_construct(data=decode(b), seq=None)), body, args.repeat)
+            for decode in decoders.values()
+        ]
+        print(f"{name:>10} {'':>8} " + " ".join(f"{us:>14.1f}us" for us in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Records allgamedata snapshots from a running League client into a compressed file that
+benchmarks.replay_game can play back. Stops on GameEnd, after --duration, or on Ctrl+C.
+With --synthetic MINUTES it writes a generated game instead, no client needed.
+
+Run from the backend directory:
+    python -m benchmarks.record_game --output games/ranked.jsonl.zst --interval 1
+    python -m benchmarks.record_game --output games/synthetic.jsonl.zst --synthetic 30
+"""
+import argparse
+import os
+import time
+
+import httpx
+
+from app.services.change_detection_service import game_ended
+from benchmarks.fixtures import SyntheticGame
+from benchmarks.recording import RecordingWriter
+
+LIVE_URL = "https://127.0.0.1:2999/liveclientdata/allgamedata"
+
+
+def record_live(writer: RecordingWriter, url: str, interval: float, duration: float):
+    start = time.monotonic()
+    waiting = False
+    # The client serves a self-signed certificate
+    with httpx.Client(verify=False, timeout=2.0) as client:
+        while not duration or time.monotonic() - start < duration:
+            tick = time.monotonic()
+            try:
+                response = client.get(url)
+                response.raise_for_status()
+                data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                # Loading screen or no game yet
+                if not waiting:
+                    print(f"Waiting for the game client: {e}")
+                    waiting = True
+            else:
+                waiting = False
+                writer.write(data)
+                if writer.count % 30 == 0:
+                    print(f"{writer.count} snapshots, game time {data.get('gameData', {}).get('gameTime', 0):.0f}s")
+                if game_ended(data):
+                    print("GameEnd received")
+                    return
+            time.sleep(max(0.0, interval - (time.monotonic() - tick)))
+
+
+def record_synthetic(writer: RecordingWriter, minutes: float, interval: float, seed: int):
+    game = SyntheticGame(seed=seed, tick_seconds=interval)
+    for index, snapshot in enumerate(game.ticks(int(minutes * 60 / interval))):
+        writer.write(snapshot, t=index * interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", required=True, help="ends in .zst for zstd, anything else is gzip")
+    parser.add_argument("--url", default=LIVE_URL)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between snapshots")
+    parser.add_argument("--duration", type=float, default=0, help="seconds, 0 records until GameEnd")
+    parser.add_argument("--synthetic", type=float, default=0, help="minutes of a generated game instead of a live one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    with RecordingWriter(args.output, source="synthetic" if args.synthetic else args.url) as writer:
+        try:
+            if args.synthetic:
+                record_synthetic(writer, args.synthetic, args.interval, args.seed)
+            else:
+                record_live(writer, args.url, args.interval, args.duration)
+        except KeyboardInterrupt:
+            pass
+
+    size = os.path.getsize(args.output)
+    ratio = writer.raw_bytes / size if size else 0.0
+    print(f"{writer.count} snapshots, {writer.raw_bytes / 1e6:.1f} MB of JSON stored in {size / 1e6:.2f} MB ({ratio:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+File format shared by benchmarks.record_game and benchmarks.replay_game.
+
+A recording is JSON lines, one {"t": seconds since recording start, "data": allgamedata}
+per snapshot, after a header line. Files ending in .zst are zstd compressed with a long
+window, so every snapshot is stored mostly as references to the previous one; anything
+else is gzip.
+"""
+from typing import Any, Dict, Iterator, Optional, Tuple
+import gzip
+import io
+import json
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMAT = "allgamedata-recording"
+VERSION = 1
+
+
+def _is_zstd(path: str) -> bool:
+    return path.endswith(".zst")
+
+
+def open_recording(path: str, mode: str):
+    if _is_zstd(path):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed, use a .jsonl.gz recording")
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=10, write_checksum=True).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=9)
+
+
+class RecordingWriter:
+    def __init__(self, path: str, source: str = ""):
+        self.path = path
+        self.count = 0
+        self.raw_bytes = 0
+        self._start: Optional[float] = None
+        self._file = open_recording(path, "w")
+        self._file.write(json.dumps({"format": FORMAT, "version": VERSION, "source": source, "recorded_at": time.time()}) + "\n")
+
+    def write(self, data: Dict[str, Any], t: Optional[float] = None):
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        line = json.dumps({"t": round(t if t is not None else now - self._start, 3), "data": data}, separators=(",", ":"))
+        self._file.write(line + "\n")
+        self.count += 1
+        self.raw_bytes += len(line) + 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_recording(path: str) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    with open_recording(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not an allgamedata recording")
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["t"], entry["data"]
@@ -0,0 +1,202 @@
+"""
+Plays back a recording made by benchmarks.record_game.
+
+serve: stands in for the League client's Live Client Data API, so the connector (or
+anything else polling port 2999) sees the recorded game. Start the connector with
+LEAGUE_LIVE_URL=http://127.0.0.1:2999, or pass --certfile/--keyfile to serve https.
+
+ingest: posts every snapshot straight to the backend's /api/ingest (or /api/ingest/raw)
+on the recorded schedule and reports per-request latency and throughput.
+
+--speed 1 is real time, 10 is ten times faster, 0 is as fast as possible (serve hands out
+the next snapshot on every request, ingest posts back to back).
+
+Run from the backend directory:
+    python -m benchmarks.replay_game serve games/ranked.jsonl.zst --speed 10
+    python -m benchmarks.replay_game ingest games/ranked.jsonl.zst --backend http://127.0.0.1:8000 --speed 0
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException
+
+from benchmarks.common import percentile, auth_headers
+from benchmarks.recording import read_recording
+
+
+# Which snapshot the stand-in client serves. Real time and sped up playback follow the wall
+# clock from the first request, as fast as possible advances one snapshot per request.
+class Playback:
+    def __init__(self, snapshots: List[Tuple[float, Dict[str, Any]]], speed: float, loop: bool):
+        self.snapshots = snapshots
+        self.speed = speed
+        self.loop = loop
+        self.requests = 0
+        self._start = None
+        self._lock = threading.Lock()
+
+    def current(self) -> Dict[str, Any]:
+        with self._lock:
+            self.requests += 1
+            if self._start is None:
+                self._start = time.monotonic()
+            if self.speed <= 0:
+                index = self.requests - 1
+            else:
+                elapsed = (time.monotonic() - self._start) * self.speed
+                index = self._index_at(elapsed)
+
+            if self.loop:
+                index %= len(self.snapshots)
+            # After the last snapshot the client keeps serving the final state, like after GameEnd
+            return self.snapshots[min(index, len(self.snapshots) - 1)][1]
+
+    def _index_at(self, elapsed: float) -> int:
+        if self.loop:
+            elapsed %= self.snapshots[-1][0] + 1e-9
+        low, high = 0, len(self.snapshots) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.snapshots[middle][0] <= elapsed:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+
+def make_app(playback: Playback) -> FastAPI:
+    app = FastAPI(title="Recorded Live Client Data API")
+
+    @app.get("/liveclientdata/allgamedata")
+    async def allgamedata():
+        return playback.current()
+
+    @app.get("/liveclientdata/activeplayer")
+    async def activeplayer():
+        return playback.current().get("activePlayer") or {}
+
+    @app.get("/liveclientdata/playerlist")
+    async def playerlist():
+        return playback.current().get("allPlayers") or []
+
+    @app.get("/liveclientdata/eventdata")
+    async def eventdata():
+        return playback.current().get("events") or {"Events": []}
+
+    @app.get("/liveclientdata/gamestats")
+    async def gamestats():
+        data = playback.current().get("gameData")
+        if data is None:
+            raise HTTPException(status_code=404, detail="No game data in this snapshot")
+        return data
+
+    return app
+
+
+def serve(args, snapshots):
+    playback = Playback(snapshots, args.speed, args.loop)
+    scheme = "https" if args.certfile else "http"
+    print(f"Serving {len(snapshots)} snapshots on {scheme}://{args.host}:{args.port}/liveclientdata/allgamedata at speed {args.speed or 'max'}")
+    uvicorn.run(
+        make_app(playback),
+        host=args.host,
+        port=args.port,
+        ssl_certfile=args.certfile,
+        ssl_keyfile=args.keyfile,
+        log_level="warning"
+    )
+
+
+def ingest(args, snapshots):
+    token = args.token or os.environ.get("SECRET_TOKEN", "")
+    path = "/api/ingest/raw" if args.raw else "/api/ingest"
+    latencies = []
+    lag = []
+    changes = 0
+    failures = 0
+
+    with httpx.Client(base_url=args.backend, timeout=30.0) as client:
+        response = client.post("/api/connection/establish", json={"username": args.username}, headers=auth_headers(token))
+        response.raise_for_status()
+        headers = auth_headers(token, response.json()["session_id"])
+
+        start = time.monotonic()
+        for t, data in snapshots:
+            if args.speed > 0:
+                due = start + t / args.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Requests slower than the schedule push every later snapshot back
+                    lag.append(-delay * 1000)
+
+            sent = time.perf_counter()
+            if args.raw:
+                response = client.post(path, content=json.dumps(data), headers=headers)
+            else:
+                response = client.post(path, json={"data": data}, headers=headers)
+            latencies.append((time.perf_counter() - sent) * 1000)
+
+            if response.status_code == 201:
+                changes += response.json().get("changes_detected", 0)
+            else:
+                failures += 1
+
+        elapsed = time.monotonic() - start
+        client.post("/api/connection/disconnect", json={"username": args.username}, headers=headers)
+
+    result = {
+        "snapshots": len(snapshots),
+        "failures": failures,
+        "changes_detected": changes,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(snapshots) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_lag_ms": round(max(lag), 1) if lag else 0.0,
+    }
+    print(json.dumps(result, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="stand-in for the Live Client Data API")
+    serve_parser.add_argument("recording")
+    serve_parser.add_argument("--speed", type=float, default=1.0)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=2999)
+    serve_parser.add_argument("--certfile")
+    serve_parser.add_argument("--keyfile")
+    serve_parser.add_argument("--loop", action="store_true", help="start over after the last snapshot")
+
+    ingest_parser = subparsers.add_parser("ingest", help="post the snapshots to the backend")
+    ingest_parser.add_argument("recording")
+    ingest_parser.add_argument("--speed", type=float, default=1.0)
+    ingest_parser.add_argument("--backend", default="http://127.0.0.1:8000")
+    ingest_parser.add_argument("--token", help="defaults to SECRET_TOKEN from the environment")
+    ingest_parser.add_argument("--username", default="replay")
+    ingest_parser.add_argument("--raw", action="store_true", help="use /api/ingest/raw")
+
+    args = parser.parse_args()
+    snapshots = list(read_recording(args.recording))
+    if not snapshots:
+        parser.error(f"{args.recording} has no snapshots")
+
+    if args.mode == "serve":
+        serve(args, snapshots)
+    else:
+        ingest(args, snapshots)
+
+
+if __name__ == "__main__":
+    main()
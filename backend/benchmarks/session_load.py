@@ -0,0 +1,75 @@
+"""
+Per-request /api/ingest latency as the number of active sessions grows.
+
+Run from the backend directory:
+    python -m benchmarks.session_load --levels 1 10 100 250 500
+"""
+import argparse
+import time
+
+from benchmarks.common import configure_env, load_sample, percentile, auth_headers
+
+configure_env()
+
+from fastapi.testclient import TestClient
+from app.main import app
+import app.core.memory_data as memory
+
+
+def run_level(client: TestClient, token: str, sample: dict, active: int, requests_per_level: int) -> dict:
+    memory.sessions.clear()
+
+    session_ids = []
+    for i in range(active):
+        response = client.post(
+            "/api/connection/establish",
+            json={"username": f"player-{i}"},
+            headers=auth_headers(token)
+        )
+        response.raise_for_status()
+        session_ids.append(response.json()["session_id"])
+
+    payload = {"data": sample}
+
+    # Warm every session so the detector has a previous snapshot
+    for session_id in session_ids:
+        client.post("/api/ingest", json=payload, headers=auth_headers(token, session_id)).raise_for_status()
+
+    latencies = []
+    for i in range(requests_per_level):
+        session_id = session_ids[i % active]
+        start = time.perf_counter()
+        response = client.post("/api/ingest", json=payload, headers=auth_headers(token, session_id))
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+    return {
+        "active_sessions": active,
+        "requests": requests_per_level,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.core.auth import get_settings
+    settings = get_settings()
+    sample = load_sample()
+
+    with TestClient(app) as client:
+        print(f"{'sessions':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for level in args.levels:
+            result = run_level(client, settings.SECRET_TOKEN, sample, level, args.requests)
+            print(f"{result['active_sessions']:>9} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f}")
+
+    memory.sessions.clear()
+
+
+if __name__ == "__main__":
+    main()
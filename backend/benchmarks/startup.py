@@ -0,0 +1,157 @@
+"""
+How fast a fresh backend process can answer /health.
+
+Every run is a new interpreter, so nothing is imported yet:
+    in-process  time from before `import app.main` to the first 200 from GET /health,
+                with the lifespan startup (commentary workers, ingest pool, database)
+                in between; the request goes straight to the ASGI app. The import is
+                also split into fastapi itself and the app on top of it
+    uvicorn     process spawn to the first 200 over TCP from `python -m uvicorn app.main:app`,
+                interpreter and uvicorn startup included (--uvicorn)
+
+The backend is started without OPENAI_API_KEY, and the report says whether the openai or
+agents packages were imported by then (they should only load once commentary is needed).
+Exits with 1 when the median app time is over --target-ms: everything from import to the
+first 200 except importing fastapi itself, which the app doesn't control and alone takes
+300-500ms on some machines.
+
+Run from the backend directory:
+    python -m benchmarks.startup --runs 10 --uvicorn
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import BACKEND_DIR, BENCH_TOKEN
+
+
+def child():
+    start = time.perf_counter()
+    # Timed apart to show how much of the import is the framework itself
+    import fastapi
+    framework = time.perf_counter()
+    import app.main
+    imported = time.perf_counter()
+
+    async def first_request():
+        async with app.main.app.router.lifespan_context(app.main.app):
+            started = time.perf_counter()
+            messages = []
+
+            async def receive():
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                "scheme": "http", "path": "/health", "raw_path": b"/health", "query_string": b"",
+                "root_path": "", "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 1),
+                "server": ("127.0.0.1", 80),
+            }
+            await app.main.app(scope, receive, send)
+            answered = time.perf_counter()
+            status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+            return started, answered, status
+
+    started, answered, status = asyncio.run(first_request())
+    print(json.dumps({
+        "status": status,
+        "import_ms": (imported - start) * 1000,
+        "fastapi_import_ms": (framework - start) * 1000,
+        "app_import_ms": (imported - framework) * 1000,
+        "startup_ms": (started - imported) * 1000,
+        "first_request_ms": (answered - started) * 1000,
+        "total_ms": (answered - start) * 1000,
+        "app_total_ms": (answered - framework) * 1000,
+        "llm_sdk_loaded": "agents" in sys.modules or "openai" in sys.modules,
+    }))
+
+
+def backend_env():
+    env = {**os.environ, "SECRET_TOKEN": os.environ.get("SECRET_TOKEN", BENCH_TOKEN), "DATABASE_PATH": ""}
+    env.pop("OPENAI_API_KEY", None)
+    return env
+
+
+def run_in_process() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        cwd=BACKEND_DIR, env=backend_env(), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _health_ok(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5) as s:
+            s.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+            return s.recv(32).startswith(b"HTTP/1.1 200")
+    except OSError:
+        return False
+
+
+def run_uvicorn() -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=backend_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while not _health_ok(port):
+            if process.poll() is not None:
+                raise RuntimeError(f"Backend exited with code {process.returncode}")
+            if time.perf_counter() - start > 30:
+                raise RuntimeError("Backend did not become healthy within 30s")
+            time.sleep(0.005)
+        return (time.perf_counter() - start) * 1000
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=300)
+    parser.add_argument("--uvicorn", action="store_true", help="also time a uvicorn process to its first 200")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    runs = [run_in_process() for _ in range(args.runs)]
+    for key in ("fastapi_import_ms", "app_import_ms", "import_ms", "startup_ms", "first_request_ms", "total_ms", "app_total_ms"):
+        samples = [run[key] for run in runs]
+        print(f"{key:<18} median {statistics.median(samples):>8.1f}ms   min {min(samples):>8.1f}ms")
+    print(f"LLM SDK imported before the first 200: {any(run['llm_sdk_loaded'] for run in runs)}")
+
+    if args.uvicorn:
+        samples = [run_uvicorn() for _ in range(args.runs)]
+        print(f"{'uvicorn spawn->200':<18} median {statistics.median(samples):>8.1f}ms   min {min(samples):>8.1f}ms")
+
+    median = statistics.median(run["app_total_ms"] for run in runs)
+    if median > args.target_ms:
+        print(f"\nApp import to first 200 takes {median:.0f}ms, over the {args.target_ms:.0f}ms target")
+        sys.exit(1)
+    print(f"\nApp import to first 200 takes {median:.0f}ms, within the {args.target_ms:.0f}ms target")
+
+
+if __name__ == "__main__":
+    main()
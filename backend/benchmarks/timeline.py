@@ -0,0 +1,73 @@
+"""
+Memory and query cost of the columnar GameTimeline over a synthetic 40-minute game,
+compared with keeping every tick's GameData object.
+
+Run from the backend directory:
+    python -m benchmarks.timeline --minutes 40
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import SyntheticGame
+from app.schemas.game_data import GameDataPayload
+from app.services.formatting_service import format_league_data
+from app.services.timeline_service import GameTimeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=40)
+    parser.add_argument("--max-ticks", type=int, default=600)
+    args = parser.parse_args()
+
+    game = SyntheticGame(seed=4)
+    ticks = []
+    for i in range(int(args.minutes * 60 / game.tick_seconds)):
+        if i and i % 150 == 0:
+            game.teamfight()
+        game.advance()
+        ticks.append(format_league_data(GameDataPayload(data=game.snapshot())))
+
+    timeline = GameTimeline(max_ticks=args.max_ticks)
+    start = time.perf_counter()
+    for game_data in ticks:
+        timeline.record(game_data)
+    record_us = (time.perf_counter() - start) / len(ticks) * 1e6
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    timeline = GameTimeline(max_ticks=args.max_ticks)
+    for game_data in ticks:
+        timeline.record(game_data)
+    timeline_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    objects = [game_data.model_copy(deep=True) for game_data in ticks]
+    objects_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del objects
+
+    def timed(fn, repeat=1000):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - start) / repeat * 1e6
+
+    main_player = ticks[-1].main_player.name
+    end_time = timeline.times[-1]
+
+    print(f"ticks recorded:        {len(ticks)} ({len(timeline)} kept, {timeline.compactions} compactions)")
+    print(f"column bytes:          {timeline.nbytes():,}")
+    print(f"timeline heap bytes:   {timeline_bytes:,}")
+    print(f"GameData list bytes:   {objects_bytes:,}")
+    print(f"record:                {record_us:.2f} us/tick")
+    print(f"last(30):              {timed(lambda: timeline.last(30)):.2f} us")
+    print(f"range(last 5 min):     {timed(lambda: timeline.range(end_time - 300, end_time)):.2f} us")
+    print(f"series(cs, last 30):   {timed(lambda: timeline.series(main_player, 'cs', 30)):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
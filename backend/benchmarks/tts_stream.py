@@ -0,0 +1,86 @@
+"""
+Time-to-first-byte and total time of buffered /api/tts vs streaming /api/tts/stream,
+against the local fake speech server.
+
+Run from the backend directory:
+    python -m benchmarks.tts_stream --requests 10
+"""
+import argparse
+import os
+import time
+
+from benchmarks.common import configure_env, percentile, auth_headers
+from benchmarks.fake_openai_server import app as fake_app, config as fake_config, free_port, serve_in_thread
+
+ROAST = (
+    "You bought a second Doran's Blade at twenty minutes. "
+    "Your minimap is a decoration, apparently. "
+    "Build Kraken Slayer and stop walking into brush alone."
+)
+
+
+def measure(client, path: str, headers: dict, text: str):
+    start = time.perf_counter()
+    first_byte = None
+    size = 0
+    with client.stream("POST", path, json={"text": text}, headers=headers) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None and chunk:
+                first_byte = time.perf_counter()
+            size += len(chunk)
+    end = time.perf_counter()
+    return (first_byte - start) * 1000, (end - start) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--first-byte-ms", type=float, default=300)
+    parser.add_argument("--chunk-interval-ms", type=float, default=40)
+    args = parser.parse_args()
+
+    fake_config.first_byte_ms = args.first_byte_ms
+    fake_config.chunk_interval_ms = args.chunk_interval_ms
+    fake_port = free_port()
+    serve_in_thread(fake_app, fake_port)
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{fake_port}/v1"
+    configure_env()
+
+    import httpx
+    from app.main import app
+    from app.core.auth import get_settings
+
+    backend_port = free_port()
+    serve_in_thread(app, backend_port)
+    token = get_settings().SECRET_TOKEN
+
+    with httpx.Client(base_url=f"http://127.0.0.1:{backend_port}", timeout=60) as client:
+        session_id = client.post(
+            "/api/connection/establish", json={"username": "bench"}, headers=auth_headers(token)
+        ).json()["session_id"]
+        headers = auth_headers(token, session_id)
+
+        results = {}
+        for label, path, suffix in (
+            ("buffered", "/api/tts", "buffered"),
+            ("streaming", "/api/tts/stream", "streaming"),
+            ("cached", "/api/tts/stream", "streaming"),
+        ):
+            ttfb, total = [], []
+            for i in range(args.requests):
+                first, whole, _ = measure(client, path, headers, f"{ROAST} ({suffix} {i})")
+                ttfb.append(first)
+                total.append(whole)
+            results[label] = (ttfb, total)
+
+        print(f"{'mode':>10} {'ttfb p50':>10} {'ttfb p95':>10} {'total p50':>10}")
+        for label, (ttfb, total) in results.items():
+            print(f"{label:>10} {percentile(ttfb, 50):>8.1f}ms {percentile(ttfb, 95):>8.1f}ms {percentile(total, 50):>8.1f}ms")
+
+        print("server-side:", client.get("/api/tts/stream/stats", headers=headers).json()["ttfb_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional, Tuple
+from bisect import bisect_right
+
+# Same milestones as the backend change detector, crossing one forces an upload
+GOLD_MILESTONES = [1000, 2000, 3000, 5000, 7500, 10000, 15000]
+CS_MILESTONES = [50, 100, 150, 200, 250, 300]
+
+
+def _active_player(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    riot_id = (data.get("activePlayer") or {}).get("riotId")
+    for player in data.get("allPlayers") or []:
+        if player.get("riotId") == riot_id:
+            return player
+    return None
+
+
+# Cheap fingerprint of the fields the backend reacts to: game mode, every player's
+# kills/deaths/assists and items, the main player's gold and CS milestones, and the number
+# of game events (GameEnd, kills, objectives). Gold and CS move almost every second, so
+# only the milestone they are past is included, like the backend's milestone events.
+def snapshot_fingerprint(data: Dict[str, Any]) -> Tuple:
+    game_data = data.get("gameData") or {}
+    active_player = data.get("activePlayer") or {}
+    active_riot_id = active_player.get("riotId")
+    main_cs = 0
+    players = []
+    for player in data.get("allPlayers") or []:
+        scores = player.get("scores") or {}
+        if player.get("riotId") == active_riot_id:
+            main_cs = scores.get("creepScore", 0)
+        players.append((
+            player.get("riotId"),
+            scores.get("kills", 0),
+            scores.get("deaths", 0),
+            scores.get("assists", 0),
+            tuple(item.get("displayName") for item in player.get("items") or []),
+        ))
+    events = (data.get("events") or {}).get("Events") or []
+    return (
+        game_data.get("gameMode"),
+        bisect_right(GOLD_MILESTONES, active_player.get("currentGold", 0.0)),
+        bisect_right(CS_MILESTONES, main_cs),
+        len(events),
+        tuple(players),
+    )
+
+
+def game_ended(data: Dict[str, Any]) -> bool:
+    events = (data.get("events") or {}).get("Events") or []
+    return bool(events) and events[-1].get("EventName") == "GameEnd"
+
+
+# Picks the next poll interval from how often the fingerprint has been changing.
+# change_rate is an exponentially weighted share of recent polls that saw a change,
+# 1.0 polls at min_ms and 0.0 at max_ms. While the main player is dead nothing they do
+# can change, so polling slows down to max_ms (or until respawn, if that is sooner),
+# and without a game (loading screen, client closed) it stays at max_ms.
+class AdaptiveInterval:
+    def __init__(self, min_ms: int = 1000, max_ms: int = 5000, smoothing: float = 0.3):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.smoothing = smoothing
+        self.change_rate = 1.0
+
+    def reset(self):
+        self.change_rate = 1.0
+
+    def next_interval(self, data: Optional[Dict[str, Any]], changed: bool) -> int:
+        if data is None:
+            return self.max_ms
+
+        self.change_rate += self.smoothing * ((1.0 if changed else 0.0) - self.change_rate)
+
+        player = _active_player(data)
+        if player is not None and player.get("isDead"):
+            respawn_ms = int(float(player.get("respawnTimer") or 0.0) * 1000)
+            return max(self.min_ms, min(self.max_ms, respawn_ms or self.max_ms))
+
+        return int(self.max_ms - (self.max_ms - self.min_ms) * self.change_rate)
+
+
+# Poll and upload counters for one game, printed when the game ends
+class GameUploadStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.polls = 0
+        self.uploads = 0
+        self.uploads_saved = 0
+        self.last_game_time = 0.0
+
+    def starts_new_game(self, data: Dict[str, Any]) -> bool:
+        # The game clock going backwards means a new game on the same connection
+        game_time = (data.get("gameData") or {}).get("gameTime", 0.0)
+        new_game = game_time < self.last_game_time
+        self.last_game_time = game_time
+        return new_game
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "uploads": self.uploads,
+            "uploads_saved": self.uploads_saved,
+            "saved_pct": round(self.uploads_saved / self.polls * 100, 1) if self.polls else 0.0,
+        }
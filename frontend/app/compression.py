@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional, Tuple
+import gzip
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Body encodings this client can produce, in order of preference
+CLIENT_ENCODINGS: List[str] = (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard is not None else None
+
+
+def choose_encoding(preference: str, server_encodings: List[str]) -> Optional[str]:
+    # "auto" takes the first encoding both sides support, "none" disables compression,
+    # anything else is used as configured if the backend accepts it
+    if preference == "none":
+        return None
+    if preference == "auto":
+        for encoding in CLIENT_ENCODINGS:
+            if encoding in server_encodings:
+                return encoding
+        return None
+    if preference in CLIENT_ENCODINGS and preference in server_encodings:
+        return preference
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return _zstd_compressor.compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def encode_json(payload: Any, encoding: Optional[str], min_size: int) -> Tuple[bytes, Dict[str, str]]:
+    # Returns the request body and the extra headers to send with it.
+    # Small bodies (most deltas) are sent as-is, compressing them costs more than it saves.
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if encoding is None or len(body) < min_size:
+        return body, {}
+    return compress(body, encoding), {"Content-Encoding": encoding}
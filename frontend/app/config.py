@@ -1,2 +1,53 @@
-LEAGUE_LIVE_API = "https://127.0.0.1:2999/liveclientdata/allgamedata"
-BACKEND_API = "http://localhost:8000/api/ingest"
\ No newline at end of file
+import os
+
+# Overridable to point the connector at a recorded game (backend/benchmarks/replay_game.py)
+LEAGUE_LIVE_URL = os.environ.get("LEAGUE_LIVE_URL", "https://127.0.0.1:2999")
+LEAGUE_LIVE_PATH = "/liveclientdata/allgamedata"
+LEAGUE_LIVE_API = f"{LEAGUE_LIVE_URL}{LEAGUE_LIVE_PATH}"
+
+BACKEND_URL = "http://localhost:8000"
+ESTABLISH_PATH = "/api/connection/establish"
+DISCONNECT_PATH = "/api/connection/disconnect"
+INGEST_PATH = "/api/ingest"
+INGEST_DELTA_PATH = "/api/ingest/delta"
+INGEST_BULK_PATH = "/api/ingest/bulk"
+BACKEND_API = f"{BACKEND_URL}{INGEST_PATH}"
+BACKEND_DELTA_API = f"{BACKEND_URL}{INGEST_DELTA_PATH}"
+
+# (connect, read) timeouts in seconds. The game client is local, so it should answer fast
+LEAGUE_TIMEOUT = (1.0, 2.0)
+BACKEND_TIMEOUT = (3.0, 10.0)
+# Keep-alive connections kept open per endpoint
+LEAGUE_POOL_SIZE = 1
+BACKEND_POOL_SIZE = 2
+# Print connect / TLS / transfer time for every call (a line per poll and upload, for diagnosis)
+LOG_CALL_TIMINGS = False
+
+# Send JSON patches against the last acknowledged snapshot instead of the full document
+USE_DELTA_INGEST = True
+
+# Ingest body compression: "auto" (best codec the backend accepts), "zstd", "gzip" or "none"
+INGEST_COMPRESSION = "auto"
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = 1024
+
+# Poll interval when ADAPTIVE_POLLING is off
+POLL_INTERVAL_MS = 2000
+# Poll faster while stats change often, slower while nothing happens or the player is dead
+ADAPTIVE_POLLING = True
+POLL_MIN_INTERVAL_MS = 1000
+POLL_MAX_INTERVAL_MS = 5000
+# Unchanged snapshots are not uploaded, except one at least this often
+UPLOAD_HEARTBEAT_SECONDS = 10
+
+# Snapshots that can't be uploaded (backend down, timeouts, 5xx) are kept on disk and
+# replayed in order through /api/ingest/bulk once the backend is reachable again
+OFFLINE_BUFFER_ENABLED = True
+OFFLINE_BUFFER_DIR = os.path.join(os.path.expanduser("~"), ".league_live_connector", "offline")
+OFFLINE_BUFFER_MAX_SNAPSHOTS = 900
+OFFLINE_BUFFER_MAX_BYTES = 50 * 1024 * 1024
+# Buffered snapshots older than this are discarded when the connector starts
+OFFLINE_BUFFER_MAX_AGE_SECONDS = 3600
+# Snapshots per bulk request and the most snapshots replayed per second
+REPLAY_BATCH_SIZE = 30
+REPLAY_MAX_PER_SECOND = 15
\ No newline at end of file
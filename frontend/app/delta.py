@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Optional
+
+# Client side of the delta ingest protocol: diffs snapshots into RFC 6902 JSON Patches
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        patch: List[Dict[str, Any]] = []
+        for key, old_value in old.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in new:
+                patch.append({"op": "remove", "path": child})
+            else:
+                patch.extend(make_patch(old_value, new[key], child))
+        for key, new_value in new.items():
+            if key not in old:
+                patch.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": new_value})
+        return patch
+
+    if isinstance(old, list):
+        patch = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            patch.extend(make_patch(old[i], new[i], f"{path}/{i}"))
+        for i in range(common, len(new)):
+            patch.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        for i in range(len(old) - 1, common - 1, -1):
+            patch.append({"op": "remove", "path": f"{path}/{i}"})
+        return patch
+
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+class DeltaState:
+    """Tracks the last snapshot the backend acknowledged, the base for the next patch."""
+
+    def __init__(self):
+        self.acked_snapshot: Optional[Dict[str, Any]] = None
+        self.acked_seq: Optional[int] = None
+        self._next_seq = 1
+
+    def has_base(self) -> bool:
+        return self.acked_snapshot is not None and self.acked_seq is not None
+
+    def next_seq(self) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    def acknowledge(self, snapshot: Dict[str, Any], seq: int):
+        self.acked_snapshot = snapshot
+        self.acked_seq = seq
+
+    def reset(self):
+        self.acked_snapshot = None
+        self.acked_seq = None
@@ -0,0 +1,179 @@
+from typing import Any, Dict, Optional, Tuple
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Timings of the call currently running on this thread, filled in by the connection classes
+_current = threading.local()
+
+
+def _record(stage: str, seconds: float):
+    timings = getattr(_current, "timings", None)
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+# Connection classes that time the TCP connect and the TLS handshake separately.
+# Both only run when the pool has to open a new connection, a reused keep-alive
+# connection reports zero for both.
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record("connect", time.perf_counter() - start)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record("connect", time.perf_counter() - start)
+
+    def connect(self):
+        timings = getattr(_current, "timings", None)
+        connect_before = timings.get("connect", 0.0) if timings is not None else 0.0
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            # Everything in connect() besides the TCP handshake is TLS
+            if timings is not None:
+                tcp = timings.get("connect", 0.0) - connect_before
+                _record("tls", time.perf_counter() - start - tcp)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class CallTiming:
+    def __init__(self, connect: float, tls: float, total: float, status: Optional[int]):
+        self.connect = connect
+        self.tls = tls
+        # Request upload, server time and response download on an open connection
+        self.transfer = max(0.0, total - connect - tls)
+        self.total = total
+        self.status = status
+
+    @property
+    def new_connection(self) -> bool:
+        return self.connect > 0.0
+
+    def __repr__(self):
+        return (
+            f"connect={self.connect * 1000:.1f}ms tls={self.tls * 1000:.1f}ms "
+            f"transfer={self.transfer * 1000:.1f}ms total={self.total * 1000:.1f}ms"
+            f"{' (new connection)' if self.new_connection else ''}"
+        )
+
+
+# Long-lived keep-alive session for one endpoint (base URL).
+# timeout is (connect, read) seconds, the read timeout applies between bytes received.
+class PooledClient:
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        pool_maxsize: int = 2,
+        timeout: Tuple[float, float] = (3.0, 10.0),
+        verify: bool = True,
+        log_timings: bool = False
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.verify = verify
+        self.log_timings = log_timings
+
+        self.session = requests.Session()
+        # One host per client, so a single pool holding a couple of connections is enough
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount(self.base_url, adapter)
+
+        self._lock = threading.Lock()
+        self.last_timing: Optional[CallTiming] = None
+        self.calls = 0
+        self.failures = 0
+        self.new_connections = 0
+        self.connect_seconds = 0.0
+        self.tls_seconds = 0.0
+        self.transfer_seconds = 0.0
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        # Per call, a session level verify=False is overridden by REQUESTS_CA_BUNDLE
+        kwargs.setdefault("verify", self.verify)
+        _current.timings = {}
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self.session.request(method, self.url(path), **kwargs)
+            return response
+        finally:
+            total = time.perf_counter() - start
+            timings = _current.timings
+            _current.timings = None
+            timing = CallTiming(
+                timings.get("connect", 0.0),
+                timings.get("tls", 0.0),
+                total,
+                response.status_code if response is not None else None
+            )
+            self._account(timing, failed=response is None)
+            if self.log_timings:
+                print(f"[{self.name}] {method} {path} {timing}")
+
+    def _account(self, timing: CallTiming, failed: bool):
+        with self._lock:
+            self.last_timing = timing
+            self.calls += 1
+            self.failures += 1 if failed else 0
+            self.new_connections += 1 if timing.new_connection else 0
+            self.connect_seconds += timing.connect
+            self.tls_seconds += timing.tls
+            self.transfer_seconds += timing.transfer
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "new_connections": self.new_connections,
+                "avg_connect_ms": self.connect_seconds / calls * 1000,
+                "avg_tls_ms": self.tls_seconds / calls * 1000,
+                "avg_transfer_ms": self.transfer_seconds / calls * 1000,
+            }
+
+    def close(self):
+        self.session.close()
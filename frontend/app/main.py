@@ -1,13 +1,26 @@
 import sys
 import requests
 from PyQt6.QtWidgets import QApplication, QLineEdit, QWidget, QLabel, QPushButton, QVBoxLayout, QMainWindow
-from PyQt6.QtCore import QTimer
-
-from config import LEAGUE_LIVE_API, BACKEND_API
-from utils import league_live_api, establish_connection, send_to_backend, disconnect_session
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from config import (
+    USE_DELTA_INGEST, INGEST_COMPRESSION, POLL_INTERVAL_MS, ADAPTIVE_POLLING,
+    POLL_MIN_INTERVAL_MS, POLL_MAX_INTERVAL_MS, UPLOAD_HEARTBEAT_SECONDS,
+    OFFLINE_BUFFER_ENABLED, OFFLINE_BUFFER_DIR, OFFLINE_BUFFER_MAX_SNAPSHOTS, OFFLINE_BUFFER_MAX_BYTES,
+    OFFLINE_BUFFER_MAX_AGE_SECONDS, REPLAY_BATCH_SIZE, REPLAY_MAX_PER_SECOND
+)
+from utils import establish_connection, disconnect_session, close_clients
+from poller import PollWorker
+from adaptive import AdaptiveInterval
+from delta import DeltaState
+from compression import choose_encoding
+from offline_buffer import OfflineBuffer
 
 
 class MainWindow(QMainWindow):
+    # Queued to the poll worker, its timer has to be stopped from its own thread
+    stop_polling = pyqtSignal()
+
     def __init__(self):
         super().__init__()
 
@@ -15,12 +28,21 @@ class MainWindow(QMainWindow):
         self.is_connected = False
         self.is_streaming = False
         self.secret_token = ""
+        self.session_id = ""
+        self.delta_state = DeltaState() if USE_DELTA_INGEST else None
+        self.ingest_encoding = None
         self.username = "Player"  # Default username
 
-        # Timer for Sleeping on Loop
-        self.api_timer = QTimer()
-        self.api_timer.timeout.connect(self.call_api)
-        self.api_timer.setInterval(2000)
+        # Fetch -> upload loop, runs on its own thread while streaming
+        self.poll_interval_ms = POLL_INTERVAL_MS
+        self.poll_thread = None
+        self.poll_worker = None
+        # Stopped workers are kept alive until their thread has finished the last upload
+        self.retired_pollers = []
+        # Snapshots kept on disk while the backend is unreachable, replayed on reconnect
+        self.offline_buffer = OfflineBuffer(
+            OFFLINE_BUFFER_DIR, OFFLINE_BUFFER_MAX_SNAPSHOTS, OFFLINE_BUFFER_MAX_BYTES, OFFLINE_BUFFER_MAX_AGE_SECONDS
+        ) if OFFLINE_BUFFER_ENABLED else None
 
         # PyQt UI Components
         self.setWindowTitle("League Live Game Connector")
@@ -151,6 +173,14 @@ class MainWindow(QMainWindow):
 
             if result.is_success():
                 self.is_connected = True
+                self.session_id = result.data.get("session_id", "")
+                self.ingest_encoding = choose_encoding(INGEST_COMPRESSION, result.data.get("accept_encoding", []))
+                if self.delta_state is not None:
+                    self.delta_state.reset()
+                # Whatever is still buffered belongs to an earlier session (and likely an
+                # earlier game), replaying it into this one would rewind the backend timeline
+                if self.offline_buffer is not None:
+                    self.offline_buffer.clear()
                 self.connect_button.setText("Disconnect")
                 self.update_connect_button_style()
                 self.token_input.setEnabled(False)
@@ -164,13 +194,15 @@ class MainWindow(QMainWindow):
             if self.is_streaming:
                 self.is_streaming = False
                 self.stream_button.setText("Start Stream")
-                self.api_timer.stop()
+                # An upload still in flight must not outlive the session it belongs to
+                self.stop_poll_worker(wait_ms=5000)
                 self.update_stream_button_style()
 
-            result = disconnect_session(self.username, self.secret_token)
+            result = disconnect_session(self.username, self.secret_token, self.session_id)
 
             if result.is_success():
                 self.is_connected = False
+                self.session_id = ""
                 self.connect_button.setText("Connect")
                 self.update_connect_button_style()
                 self.token_input.setEnabled(True)
@@ -186,28 +218,69 @@ class MainWindow(QMainWindow):
 
             if self.is_streaming:
                 self.stream_button.setText("Stop Stream")
-                self.api_timer.start()
-                self.show_notification("Stream started - polling every 2 seconds", "info")
+                self.start_poll_worker()
+                self.show_notification("Stream started - adaptive polling" if ADAPTIVE_POLLING else f"Stream started - polling every {POLL_INTERVAL_MS / 1000:g} seconds", "info")
             else:
                 self.stream_button.setText("Start Stream")
-                self.api_timer.stop()
+                self.stop_poll_worker()
                 self.show_notification("Stream stopped", "info")
 
             self.update_stream_button_style()
         else:
             self.show_notification("Please connect first before starting stream", "warning")
 
-    def call_api(self):
-        league_result = league_live_api()
-
-        if league_result.is_success():
-            backend_result = send_to_backend(league_result.data, self.secret_token)
-
-            if not backend_result.is_success():
-                print(f"Backend error: {backend_result.error}")
-                self.show_notification(f"Backend error: {backend_result.error}", "error")
-        else:
-            print(f"League API error: {league_result.error}")
+    def start_poll_worker(self):
+        thread = QThread()
+        adaptive = AdaptiveInterval(POLL_MIN_INTERVAL_MS, POLL_MAX_INTERVAL_MS) if ADAPTIVE_POLLING else None
+        worker = PollWorker(
+            self.username, self.secret_token, self.session_id, self.delta_state, self.ingest_encoding,
+            interval_ms=self.poll_interval_ms, adaptive=adaptive, heartbeat_seconds=UPLOAD_HEARTBEAT_SECONDS,
+            buffer=self.offline_buffer, replay_batch_size=REPLAY_BATCH_SIZE, replay_max_per_second=REPLAY_MAX_PER_SECOND
+        )
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.start)
+        self.stop_polling.connect(worker.stop)
+        worker.backend_error.connect(self.on_backend_error)
+        worker.session_changed.connect(self.on_session_changed)
+        worker.league_error.connect(self.on_league_error)
+        worker.game_summary.connect(self.on_game_summary)
+        worker.finished.connect(thread.quit)
+
+        self.poll_thread, self.poll_worker = thread, worker
+        thread.start()
+
+    def stop_poll_worker(self, wait_ms: int = 0):
+        if self.poll_worker is None:
+            return
+
+        thread, worker = self.poll_thread, self.poll_worker
+        self.stop_polling.emit()
+        self.stop_polling.disconnect(worker.stop)
+        self.poll_thread = self.poll_worker = None
+
+        entry = (thread, worker)
+        self.retired_pollers.append(entry)
+        thread.finished.connect(lambda: self.retired_pollers.remove(entry))
+        if wait_ms:
+            thread.wait(wait_ms)
+
+    # Slots for the poll worker, delivered on the GUI thread
+    def on_backend_error(self, error: str):
+        print(f"Backend error: {error}")
+        self.show_notification(f"Backend error: {error}", "error")
+
+    def on_session_changed(self, session_id: str):
+        self.session_id = session_id
+
+    def on_league_error(self, error: str):
+        print(f"League API error: {error}")
+
+    def on_game_summary(self, summary: dict):
+        self.show_notification(
+            f"Game over - {summary['uploads']} uploads, {summary['uploads_saved']} skipped as unchanged ({summary['saved_pct']}%)",
+            "info"
+        )
 
     def update_connect_button_style(self):
         """Update connect button style based on connection state"""
@@ -288,13 +361,14 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Called when the window is closing - cleanup connections"""
+        if self.is_streaming:
+            self.stop_poll_worker(wait_ms=5000)
+
         if self.is_connected:
             print("Disconnecting from backend...")
-            disconnect_session(self.username, self.secret_token)
-
-        if self.is_streaming:
-            self.api_timer.stop()
+            disconnect_session(self.username, self.secret_token, self.session_id)
 
+        close_clients()
         event.accept()
         
 
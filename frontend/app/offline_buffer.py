@@ -0,0 +1,124 @@
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from pathlib import Path
+import gzip
+import json
+import os
+import threading
+import time
+
+
+# Bounded on-disk ring buffer of snapshots that could not be uploaded.
+# One gzipped JSON file per snapshot, named by an increasing index so the directory
+# order is the upload order. When either cap is exceeded the oldest snapshots are
+# dropped, so a long outage costs a fixed amount of disk and no memory beyond the index.
+# The buffer holds one session's snapshots: the window clears it whenever a new session is
+# established, so leftovers from a crashed connector are never replayed into a later game.
+# On startup, files older than max_age_seconds are removed right away.
+class OfflineBuffer:
+    def __init__(
+        self,
+        directory: str,
+        max_snapshots: int = 900,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age_seconds: float = 3600
+    ):
+        self.directory = Path(directory)
+        self.max_snapshots = max_snapshots
+        self.max_bytes = max_bytes
+
+        # (index, size) oldest first
+        self._entries: "deque[Tuple[int, int]]" = deque()
+        self._bytes = 0
+        self._next_index = 0
+
+        self.buffered = 0
+        self.dropped = 0
+        # A stopped poller may still be finishing an upload while the next one starts
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        cutoff = time.time() - max_age_seconds
+        for path in sorted(self.directory.glob("*.json.gz")):
+            try:
+                index = int(path.name.split(".", 1)[0])
+            except ValueError:
+                continue
+            stat = path.stat()
+            if stat.st_mtime < cutoff:
+                # Left over from an earlier game, no use to the backend anymore
+                path.unlink()
+                self.dropped += 1
+                continue
+            size = stat.st_size
+            self._entries.append((index, size))
+            self._bytes += size
+            self._next_index = index + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _path(self, index: int) -> Path:
+        return self.directory / f"{index:012d}.json.gz"
+
+    def append(self, data: Dict[str, Any]):
+        body = gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+        with self._lock:
+            index = self._next_index
+            self._next_index += 1
+
+            # Written under a temporary name, a crash never leaves a half written snapshot
+            path = self._path(index)
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_bytes(body)
+            os.replace(temp_path, path)
+
+            self._entries.append((index, len(body)))
+            self._bytes += len(body)
+            self.buffered += 1
+
+            while len(self._entries) > self.max_snapshots or (self._bytes > self.max_bytes and len(self._entries) > 1):
+                self._remove_oldest()
+                self.dropped += 1
+
+    # Oldest count snapshots, None for an entry that can't be read back
+    def peek(self, count: int) -> List[Optional[Dict[str, Any]]]:
+        with self._lock:
+            indexes = [index for index, _ in list(self._entries)[:count]]
+        snapshots = []
+        for index in indexes:
+            try:
+                snapshots.append(json.loads(gzip.decompress(self._path(index).read_bytes())))
+            except (OSError, ValueError):
+                snapshots.append(None)
+        return snapshots
+
+    def pop(self, count: int):
+        with self._lock:
+            for _ in range(min(count, len(self._entries))):
+                self._remove_oldest()
+
+    def clear(self):
+        with self._lock:
+            while self._entries:
+                self._remove_oldest()
+
+    def _remove_oldest(self):
+        index, size = self._entries.popleft()
+        self._bytes -= size
+        try:
+            self._path(index).unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._entries),
+            "bytes": self._bytes,
+            "buffered": self.buffered,
+            "dropped": self.dropped,
+        }
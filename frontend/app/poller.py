@@ -0,0 +1,294 @@
+from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal, pyqtSlot
+
+from utils import league_live_api, send_to_backend, send_bulk_to_backend, establish_connection
+from delta import DeltaState
+from offline_buffer import OfflineBuffer
+from adaptive import AdaptiveInterval, GameUploadStats, snapshot_fingerprint, game_ended
+
+
+# Runs the fetch -> upload cycle off the GUI thread.
+# The worker lives on its own QThread and fetches a snapshot on every timer tick. Uploads
+# run on a separate single upload thread, so fetching the next snapshot overlaps with
+# uploading the previous one. While an upload is in flight only the newest snapshot is
+# kept, older ones are dropped, and timer ticks missed while a fetch was blocking are
+# skipped, never queued.
+# Snapshots whose fingerprint matches the last uploaded one are not sent (apart from a
+# heartbeat), and with an AdaptiveInterval the timer follows the observed rate of change.
+# With an OfflineBuffer, snapshots that fail to upload for a retryable reason go to disk
+# and are replayed in order through the bulk endpoint, at most replay_max_per_second,
+# before any newer snapshot is sent.
+# When the backend answers 404 for the session (it restarted and forgot it), a new session
+# is established and the upload is sent again, buffered snapshots included.
+class PollWorker(QObject):
+    uploaded = pyqtSignal(dict)
+    session_changed = pyqtSignal(str)
+    backend_error = pyqtSignal(str)
+    league_error = pyqtSignal(str)
+    game_summary = pyqtSignal(dict)
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        username: str,
+        token: str,
+        session_id: str,
+        delta_state: Optional[DeltaState],
+        encoding: Optional[str],
+        interval_ms: int = 2000,
+        adaptive: Optional[AdaptiveInterval] = None,
+        heartbeat_seconds: float = 10.0,
+        buffer: Optional[OfflineBuffer] = None,
+        replay_batch_size: int = 30,
+        replay_max_per_second: float = 15.0
+    ):
+        super().__init__()
+        self.username = username
+        self.token = token
+        self.session_id = session_id
+        self.delta_state = delta_state
+        self.encoding = encoding
+        self.interval_ms = interval_ms
+        self.adaptive = adaptive
+        self.heartbeat_seconds = heartbeat_seconds
+        self.buffer = buffer
+        self.replay_batch_size = replay_batch_size
+        self.replay_max_per_second = replay_max_per_second
+
+        self.timer: Optional[QTimer] = None
+        self._uploader: Optional[ThreadPoolExecutor] = None
+        self._uploading = False
+        self._pending: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        # Interrupts the pause between replay batches on stop
+        self._stopping = threading.Event()
+        self._last_tick: Optional[float] = None
+        self._last_fingerprint = None
+        self._last_upload = 0.0
+        self._game_over = False
+        self.game = GameUploadStats()
+
+        self.ticks = 0
+        self.skipped_ticks = 0
+        self.fetch_failures = 0
+        self.uploads = 0
+        self.dropped_snapshots = 0
+        self.uploads_saved = 0
+        self.replayed = 0
+        self.sessions_reestablished = 0
+
+    @pyqtSlot()
+    def start(self):
+        # Created here so the timer belongs to the worker thread
+        self._uploader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-upload")
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(self.adaptive.max_ms if self.adaptive is not None else self.interval_ms)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start()
+        self.tick()
+
+    @pyqtSlot()
+    def stop(self):
+        self._stopping.set()
+        if self.timer is not None:
+            self.timer.stop()
+        if self._uploader is not None:
+            with self._lock:
+                self._pending = None
+            # Lets an in-flight upload finish, bounded by the backend timeouts
+            self._uploader.shutdown(wait=True)
+        self._finish_game()
+        print(f"Polling stopped: {self.stats()}")
+        self.finished.emit()
+
+    @pyqtSlot()
+    def tick(self):
+        now = time.monotonic()
+        if self._last_tick is not None:
+            # Qt collapses timeouts that fire while the thread is busy, count them as skipped
+            missed = int((now - self._last_tick) * 1000 / self.timer.interval()) - 1
+            if missed > 0:
+                self.skipped_ticks += missed
+        self._last_tick = now
+        self.ticks += 1
+
+        league_result = league_live_api()
+        if league_result.is_failure():
+            self.fetch_failures += 1
+            self.league_error.emit(league_result.error)
+            self._start_replay()
+            self._reschedule(None, changed=False)
+            return
+
+        data = league_result.data
+        if self.game.starts_new_game(data):
+            self._finish_game()
+            self._game_over = False
+
+        fingerprint = snapshot_fingerprint(data)
+        changed = fingerprint != self._last_fingerprint
+
+        # After GameEnd the client keeps serving the final state, nothing left to send
+        if self._game_over and not changed:
+            self._start_replay()
+            self._reschedule(None, changed=False)
+            return
+
+        self.game.polls += 1
+        if changed or now - self._last_upload >= self.heartbeat_seconds:
+            self._last_fingerprint = fingerprint
+            self._last_upload = now
+            self.game.uploads += 1
+            self._submit(data)
+        else:
+            self.game.uploads_saved += 1
+            self.uploads_saved += 1
+            self._start_replay()
+
+        if changed and game_ended(data):
+            self._finish_game()
+            self._game_over = True
+
+        self._reschedule(data, changed)
+
+    def _reschedule(self, data: Optional[Dict[str, Any]], changed: bool):
+        if self.adaptive is None:
+            return
+        interval = self.adaptive.next_interval(data, changed)
+        if interval != self.timer.interval():
+            self.timer.setInterval(interval)
+
+    def _finish_game(self):
+        if self.game.polls:
+            summary = self.game.summary()
+            print(f"Game finished: {summary}")
+            self.game_summary.emit(summary)
+        self.game.reset()
+        if self.adaptive is not None:
+            self.adaptive.reset()
+
+    def _submit(self, data: Dict[str, Any]):
+        with self._lock:
+            if self._uploading:
+                if self._pending is not None:
+                    self.dropped_snapshots += 1
+                self._pending = data
+                return
+            self._uploading = True
+        self._uploader.submit(self._upload_loop, data)
+
+    def _start_replay(self):
+        # Keeps draining the buffer on ticks that have nothing new to upload
+        if self.buffer is None or not len(self.buffer):
+            return
+        with self._lock:
+            if self._uploading:
+                return
+            self._uploading = True
+        self._uploader.submit(self._upload_loop, None)
+
+    def _upload_loop(self, data: Optional[Dict[str, Any]]):
+        # Runs on the upload thread, then picks up the newest snapshot fetched meanwhile.
+        # data is None when only the offline buffer needs replaying
+        while True:
+            if data is None:
+                self._replay()
+            else:
+                self._upload_one(data)
+
+            with self._lock:
+                data, self._pending = self._pending, None
+                if data is None:
+                    self._uploading = False
+                    return
+
+    def _upload_one(self, data: Dict[str, Any]):
+        if self.buffer is not None and len(self.buffer):
+            # Older snapshots are still waiting, this one goes behind them to keep the order
+            self.buffer.append(data)
+            self._replay()
+            return
+
+        result = send_to_backend(data, self.token, self.session_id, self.delta_state, self.encoding)
+        self.uploads += 1
+        if result.session_expired and self._reestablish():
+            result = send_to_backend(data, self.token, self.session_id, self.delta_state, self.encoding)
+            self.uploads += 1
+        if result.is_success():
+            self.uploaded.emit(result.data)
+        elif self.buffer is not None and result.retryable:
+            self.buffer.append(data)
+            self.backend_error.emit(f"{result.error} (buffering offline, {len(self.buffer)} pending)")
+        else:
+            self.backend_error.emit(result.error)
+
+    def _replay(self):
+        # Drains the buffer oldest first, stops at the first retryable failure and
+        # tries again with the next snapshot
+        while len(self.buffer) and not self._stopping.is_set():
+            start = time.monotonic()
+            entries = self.buffer.peek(self.replay_batch_size)
+            snapshots = [data for data in entries if data is not None]
+            if not snapshots:
+                self.buffer.pop(len(entries))
+                continue
+
+            result = send_bulk_to_backend(snapshots, self.token, self.session_id, self.delta_state, self.encoding)
+            self.uploads += 1
+            if result.session_expired and self._reestablish():
+                result = send_bulk_to_backend(snapshots, self.token, self.session_id, self.delta_state, self.encoding)
+                self.uploads += 1
+            if result.is_success():
+                self.buffer.pop(len(entries))
+                self.replayed += len(snapshots)
+                self.uploaded.emit(result.data)
+            elif result.retryable:
+                self.backend_error.emit(f"{result.error} ({len(self.buffer)} pending)")
+                return
+            else:
+                # Rejected, sending the same batch again would fail the same way
+                self.buffer.pop(len(entries))
+                self.backend_error.emit(f"{result.error} (dropped {len(snapshots)} buffered snapshots)")
+
+            # Caps the replay rate so catching up doesn't flood the backend
+            pause = len(entries) / self.replay_max_per_second - (time.monotonic() - start)
+            if pause > 0:
+                self._stopping.wait(pause)
+
+    def _reestablish(self) -> bool:
+        # A 404 after stop is the user's own disconnect, not a backend restart
+        if self._stopping.is_set():
+            return False
+        result = establish_connection(self.username, self.token)
+        if result.is_failure():
+            self.backend_error.emit(result.error)
+            return False
+        self.session_id = result.data.get("session_id", "")
+        # The new session has no delta base yet
+        if self.delta_state is not None:
+            self.delta_state.reset()
+        self.sessions_reestablished += 1
+        print(f"Session expired on the backend, continuing as {self.session_id}")
+        self.session_changed.emit(self.session_id)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        buffer_stats = self.buffer.stats() if self.buffer is not None else {}
+        return {
+            "ticks": self.ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "fetch_failures": self.fetch_failures,
+            "uploads": self.uploads,
+            "dropped_snapshots": self.dropped_snapshots,
+            "uploads_saved": self.uploads_saved,
+            "replayed": self.replayed,
+            "sessions_reestablished": self.sessions_reestablished,
+            "buffered": buffer_stats.get("buffered", 0),
+            "buffer_dropped": buffer_stats.get("dropped", 0),
+            "buffer_pending": buffer_stats.get("pending", 0),
+        }
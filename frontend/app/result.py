@@ -1,18 +1,27 @@
 from typing import Optional, Any
 
 class Result:
-    def __init__(self, success: bool, data: Optional[Any] = None, error: Optional[str] = None):
+    def __init__(
+        self,
+        success: bool,
+        data: Optional[Any] = None,
+        error: Optional[str] = None,
+        retryable: bool = False,
+        session_expired: bool = False
+    ):
         self._success = success
         self._data = data
         self._error = error
+        self._retryable = retryable
+        self._session_expired = session_expired
 
     @classmethod
     def success(cls, data: Optional[Any] = None):
         return cls(success=True, data=data)
 
     @classmethod
-    def failure(cls, error: str):
-        return cls(success=False, error=error)
+    def failure(cls, error: str, retryable: bool = False, session_expired: bool = False):
+        return cls(success=False, error=error, retryable=retryable, session_expired=session_expired)
 
     def is_success(self) -> bool:
         return self._success
@@ -28,6 +37,16 @@ class Result:
     def error(self) -> Optional[str]:
         return self._error
 
+    # True when the call may succeed later unchanged (backend unreachable, timeout, 5xx)
+    @property
+    def retryable(self) -> bool:
+        return self._retryable
+
+    # True when the backend no longer knows the session (e.g. it restarted), a new one fixes it
+    @property
+    def session_expired(self) -> bool:
+        return self._session_expired
+
     def __repr__(self):
         if self._success:
             return f"Result.success(data={self._data})"
@@ -1,13 +1,27 @@
-from config import LEAGUE_LIVE_API, BACKEND_API
+from typing import Any, Dict, List, Optional
+from config import (
+    LEAGUE_LIVE_URL, LEAGUE_LIVE_PATH, BACKEND_URL, ESTABLISH_PATH, DISCONNECT_PATH, INGEST_PATH,
+    INGEST_DELTA_PATH, INGEST_BULK_PATH, LEAGUE_TIMEOUT, BACKEND_TIMEOUT, LEAGUE_POOL_SIZE, BACKEND_POOL_SIZE,
+    LOG_CALL_TIMINGS, COMPRESSION_MIN_BYTES
+)
 import requests
 import urllib3
 from result import Result
+from delta import DeltaState, make_patch
+from compression import encode_json
+from http_client import PooledClient
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# One keep-alive client per endpoint, reused on every tick.
+# The game client serves a self-signed certificate on port 2999.
+league_client = PooledClient("league", LEAGUE_LIVE_URL, pool_maxsize=LEAGUE_POOL_SIZE, timeout=LEAGUE_TIMEOUT, verify=False, log_timings=LOG_CALL_TIMINGS)
+backend_client = PooledClient("backend", BACKEND_URL, pool_maxsize=BACKEND_POOL_SIZE, timeout=BACKEND_TIMEOUT, log_timings=LOG_CALL_TIMINGS)
+
+
 def league_live_api() -> Result:
     try:
-        response = requests.get(LEAGUE_LIVE_API, verify=False)
+        response = league_client.get(LEAGUE_LIVE_PATH)
         response.raise_for_status()
 
         data = response.json()
@@ -26,14 +40,13 @@ def establish_connection(username: str, token: str) -> Result:
             "token": token
         }
 
-        response = requests.post(
-            "http://localhost:8000/api/connection/establish",
+        response = backend_client.post(
+            ESTABLISH_PATH,
             json=payload,
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {token}"
-            },
-            timeout=10
+            }
         )
 
         response.raise_for_status()
@@ -43,48 +56,149 @@ def establish_connection(username: str, token: str) -> Result:
         return Result.failure(error=f"Failed to establish connection: {str(e)}")
 
 
-def send_to_backend(data: dict, token: str) -> Result:
+def _post_json(path: str, payload: dict, headers: dict, encoding: Optional[str]) -> requests.Response:
+    body, encoding_headers = encode_json(payload, encoding, COMPRESSION_MIN_BYTES)
+    return backend_client.post(
+        path,
+        data=body,
+        headers={**headers, **encoding_headers}
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Outages and overload are worth retrying, a rejected request (bad session, bad body) is not
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return False
+
+
+def _is_session_expired(error: Exception) -> bool:
+    return isinstance(error, requests.HTTPError) and error.response is not None and error.response.status_code == 404
+
+
+def _upload_failure(message: str, error: Exception) -> Result:
+    # An expired session is retryable too: the snapshot is kept until a new session takes it
+    expired = _is_session_expired(error)
+    return Result.failure(
+        error=f"{message}: {str(error)}", retryable=expired or _is_retryable(error), session_expired=expired
+    )
+
+
+def send_to_backend(
+    data: dict,
+    token: str,
+    session_id: str,
+    delta_state: Optional[DeltaState] = None,
+    encoding: Optional[str] = None
+) -> Result:
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}",
+        "X-Session-ID": session_id
+    }
+
     try:
+        if delta_state is not None and delta_state.has_base():
+            seq = delta_state.next_seq()
+            payload = {
+                "base_seq": delta_state.acked_seq,
+                "seq": seq,
+                "patch": make_patch(delta_state.acked_snapshot, data)
+            }
+
+            response = _post_json(INGEST_DELTA_PATH, payload, headers, encoding)
+
+            # 409 means the backend lost our base snapshot, fall through to a full resync
+            if response.status_code != 409:
+                response.raise_for_status()
+                delta_state.acknowledge(data, seq)
+                return Result.success(data=response.json())
+
+            delta_state.reset()
+
         payload = {
             "data": data
         }
 
-        response = requests.post(
-            BACKEND_API,
-            json=payload,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {token}"
-            },
-            timeout=10
-        )
+        seq = None
+        if delta_state is not None:
+            seq = delta_state.next_seq()
+            payload["seq"] = seq
+
+        response = _post_json(INGEST_PATH, payload, headers, encoding)
 
         response.raise_for_status()
+        if delta_state is not None:
+            delta_state.acknowledge(data, seq)
         return Result.success(data=response.json())
 
     except Exception as e:
-        return Result.failure(error=f"Failed to send data to backend: {str(e)}")
+        return _upload_failure("Failed to send data to backend", e)
+
+
+# Uploads snapshots buffered during an outage in one request, oldest first
+def send_bulk_to_backend(
+    snapshots: List[Dict[str, Any]],
+    token: str,
+    session_id: str,
+    delta_state: Optional[DeltaState] = None,
+    encoding: Optional[str] = None
+) -> Result:
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}",
+        "X-Session-ID": session_id
+    }
 
+    try:
+        payload = {
+            "snapshots": [{"data": data} for data in snapshots]
+        }
+
+        # The last snapshot becomes the backend's delta base
+        seq = None
+        if delta_state is not None:
+            seq = delta_state.next_seq()
+            payload["snapshots"][-1]["seq"] = seq
 
-def disconnect_session(username: str, token: str) -> Result:
+        response = _post_json(INGEST_BULK_PATH, payload, headers, encoding)
+
+        response.raise_for_status()
+        if delta_state is not None:
+            delta_state.acknowledge(snapshots[-1], seq)
+        return Result.success(data=response.json())
+
+    except Exception as e:
+        return _upload_failure("Failed to replay buffered data", e)
+
+
+def disconnect_session(username: str, token: str, session_id: str) -> Result:
     try:
         payload = {
             "username": username,
             "token": token
         }
 
-        response = requests.post(
-            "http://localhost:8000/api/connection/disconnect",
+        response = backend_client.post(
+            DISCONNECT_PATH,
             json=payload,
             headers={
                 "Content-Type": "application/json",
-                "Authorization": f"Bearer {token}"
-            },
-            timeout=10
+                "Authorization": f"Bearer {token}",
+                "X-Session-ID": session_id
+            }
         )
 
         response.raise_for_status()
         return Result.success(data=response.json())
 
     except Exception as e:
-        return Result.failure(error=f"Failed to disconnect: {str(e)}")
\ No newline at end of file
+        return Result.failure(error=f"Failed to disconnect: {str(e)}")
+
+
+def close_clients():
+    for client in (league_client, backend_client):
+        print(f"[{client.name}] {client.stats()}")
+        client.close()
\ No newline at end of file
@@ -16,6 +16,12 @@ a = Analysis(
         'app.config',
         'app.utils',
         'app.result',
+        'app.delta',
+        'app.compression',
+        'app.http_client',
+        'app.poller',
+        'app.adaptive',
+        'app.offline_buffer',
     ],
     hookspath=[],
     hooksconfig={},